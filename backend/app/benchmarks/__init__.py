@@ -0,0 +1,9 @@
+# backend/app/benchmarks
+#
+# Latency benchmarks for hot paths, run as modules against the configured
+# database, e.g.:
+#
+#     python -m backend.app.benchmarks.dashboard --requests 500 --concurrency 20
+#
+# Each prints one line of percentiles per scenario so before/after runs can be
+# compared directly.
@@ -0,0 +1,46 @@
+# backend/app/benchmarks/_stats.py
+
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of the samples (pct in 0..100)."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarise(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    return {
+        "n": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def format_summary(name: str, summary: Dict[str, float]) -> str:
+    return (f"{name:<28} n={summary['n']:<6} mean={summary['mean_ms']:8.2f}ms "
+            f"p50={summary['p50_ms']:8.2f}ms p95={summary['p95_ms']:8.2f}ms "
+            f"p99={summary['p99_ms']:8.2f}ms max={summary['max_ms']:8.2f}ms")
+
+
+async def measure(fn: Callable[[], Awaitable[object]], requests: int, concurrency: int) -> List[float]:
+    """Runs fn `requests` times from `concurrency` concurrent callers; returns each call's latency in seconds."""
+    samples: List[float] = []
+    remaining = iter(range(requests))
+
+    async def caller():
+        for _ in remaining:
+            started = time.perf_counter()
+            await fn()
+            samples.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return samples
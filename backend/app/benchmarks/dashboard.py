@@ -0,0 +1,73 @@
+# backend/app/benchmarks/dashboard.py
+#
+# Dashboard load latency, before and after /api/dashboard:
+#
+#     python -m backend.app.benchmarks.dashboard [--requests 500] [--concurrency 20]
+#
+# "separate" replays what the page used to do: three sequential counts and
+# three list queries, one after another (the four /api/dashboard/* calls).
+# "combined" is build_dashboard() (one aggregate query plus the lists in
+# parallel) and "combined-cached" is get_dashboard() as served. HTTP and
+# serialisation are left out so only the database work is compared.
+
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from ..core.dashboard import (
+    OPEN_TASK_STATUSES,
+    build_dashboard,
+    fetch_recent_activity,
+    fetch_unread_notifications,
+    fetch_upcoming_deadlines,
+    get_dashboard,
+)
+from ..core.database import database, contracts, notifications, tasks
+from ._stats import format_summary, measure, summarise
+
+
+async def separate_requests():
+    now = datetime.utcnow()
+    await database.fetch_val(select(func.count()).select_from(contracts).where(contracts.c.status == "Active"))
+    await database.fetch_val(select(func.count()).select_from(tasks).where(
+        (tasks.c.due_date >= now) & (tasks.c.status.in_(OPEN_TASK_STATUSES))))
+    await database.fetch_val(select(func.count()).select_from(notifications).where(notifications.c.is_read == False))
+    await fetch_recent_activity()
+    await fetch_upcoming_deadlines()
+    await fetch_unread_notifications()
+
+
+SCENARIOS = {
+    "separate": separate_requests,
+    "combined": build_dashboard,
+    "combined-cached": get_dashboard,
+}
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.benchmarks.dashboard")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append",
+                        help="run only these scenarios (repeatable; default: all)")
+    args = parser.parse_args(argv)
+
+    await database.connect()
+    try:
+        for name in args.scenario or list(SCENARIOS):
+            fn = SCENARIOS[name]
+            await measure(fn, min(20, args.requests), args.concurrency) # Warm up connections and plans
+            samples = await measure(fn, args.requests, args.concurrency)
+            print(format_summary(name, summarise(samples)))
+    finally:
+        await database.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
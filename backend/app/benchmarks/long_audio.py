@@ -0,0 +1,87 @@
+# backend/app/benchmarks/long_audio.py
+#
+# Wall-clock time of single-pass vs chunked transcription (long_audio.py) on
+# recordings of several lengths:
+#
+#     python -m backend.app.benchmarks.long_audio --audio interview.wav [--lengths 5,15,30,60]
+#
+# Each length (in minutes) is made by looping --audio with ffmpeg. Starts its
+# own transcription pool, so size it with TRANSCRIPTION_WORKERS as for the
+# API. Needs ffmpeg and STT_PROVIDER=whisper: the fake provider takes the
+# same time for any file, so it measures nothing here.
+
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ..core import config
+from ..core.long_audio import decode_audio, transcribe_long_audio
+from ..core.transcription_pool import transcription_pool
+
+
+async def _make_recording(source: str, minutes: float, directory: str) -> str:
+    path = os.path.join(directory, f"recording_{minutes:g}min.wav")
+    await asyncio.to_thread(subprocess.run, [
+        "ffmpeg", "-nostdin", "-v", "error", "-y", "-stream_loop", "-1", "-i", source,
+        "-t", str(minutes * 60), "-ac", "1", "-ar", "16000", path,
+    ], check=True)
+    return path
+
+
+async def _timed(fn) -> float:
+    started = time.perf_counter()
+    await fn()
+    return time.perf_counter() - started
+
+
+async def _wait_ready() -> None:
+    while transcription_pool.snapshot()["workers_ready"] < transcription_pool.size:
+        await asyncio.sleep(0.5)
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.benchmarks.long_audio")
+    parser.add_argument("--audio", required=True, help="speech recording to loop into each length")
+    parser.add_argument("--lengths", default="5,15,30,60", help="comma-separated recording lengths in minutes")
+    args = parser.parse_args(argv)
+    lengths = [float(n) for n in args.lengths.split(",") if n.strip()]
+
+    if config.STT_PROVIDER != "whisper":
+        print(f"STT_PROVIDER is {config.STT_PROVIDER}: timings will not reflect transcription cost.")
+    # Long single-pass runs must not hit the job timeout.
+    config.TRANSCRIPTION_TIMEOUT_SECONDS = max(config.TRANSCRIPTION_TIMEOUT_SECONDS, 4 * 3600)
+
+    await transcription_pool.start()
+    directory = tempfile.mkdtemp(prefix="bench_long_audio_")
+    try:
+        await _wait_ready()
+        print(f"Workers: {transcription_pool.size}, chunk length: {config.LONG_AUDIO_CHUNK_SECONDS:g}s\n")
+        print(f"{'minutes':>8}{'single (s)':>14}{'chunked (s)':>14}{'chunks':>8}{'speedup':>10}")
+        for minutes in lengths:
+            path = await _make_recording(args.audio, minutes, directory)
+            samples = await decode_audio(path) # Both paths start from decoded PCM, as /transcribe-audio does
+            single = await _timed(lambda: transcription_pool.transcribe(samples.tobytes()))
+            result = {}
+
+            async def chunked():
+                result.update(await transcribe_long_audio(samples))
+
+            chunked_seconds = await _timed(chunked)
+            print(f"{minutes:>8g}{single:>14.1f}{chunked_seconds:>14.1f}{len(result['chunks']):>8}{single / chunked_seconds:>9.2f}x")
+            os.remove(path)
+    finally:
+        await transcription_pool.stop()
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
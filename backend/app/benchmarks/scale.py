@@ -0,0 +1,172 @@
+# backend/app/benchmarks/scale.py
+#
+# Read-endpoint latency as the database grows:
+#
+#     python -m backend.app.benchmarks.scale --scales 1000,10000,100000 [--requests 50] [--concurrency 4]
+#
+# For each scale the synthetic data set (synthetic_data.py) is topped up to
+# that many cases, then every /api/* read path is measured. The growth of
+# each endpoint's median latency is fitted as a power of the case count
+# (slope of log latency vs log cases): ~0 means flat, ~1 linear. Endpoints
+# growing faster than expected are flagged; super-linear growth makes the
+# run exit with status 1. The service functions behind the endpoints are
+# called directly, so HTTP overhead is not included.
+
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import asyncio
+import math
+import random
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+
+from ..core.case_notes import fetch_case_notes
+from ..core.case_queries import get_case_detail, list_cases
+from ..core.dashboard import (
+    build_dashboard, fetch_overview_counts, fetch_recent_activity, fetch_unread_notifications,
+    fetch_upcoming_deadlines,
+)
+from ..core.database import database, cases, clients, indexed_rag_documents
+from ..core.search import search_cases
+from ._stats import measure, summarise
+from .synthetic_data import SYNTHETIC_PREFIX, generate
+
+SUPER_LINEAR_SLOPE = 1.15
+# Slack over the expected slope before an endpoint is flagged (timer noise, cache effects).
+SLOPE_TOLERANCE = 0.3
+DEEP_PAGE = 20
+
+
+class _Endpoint:
+    def __init__(self, name: str, expected_slope: float, make_call: Callable[["_Fixtures"], Callable[[], Awaitable[Any]]]):
+        self.name = name
+        self.expected_slope = expected_slope # 0 = should not grow with the data, 1 = linear by design
+        self.make_call = make_call
+
+
+class _Fixtures:
+    """Values the endpoint calls need at the current scale (sample ids, a deep cursor)."""
+
+    def __init__(self, case_ids: List[str], deep_cursor: Optional[str]):
+        self.case_ids = case_ids
+        self.deep_cursor = deep_cursor
+        self.rng = random.Random(11)
+
+    def case_id(self) -> str:
+        return self.rng.choice(self.case_ids)
+
+
+async def _all_clients():
+    # What /api/clients runs (main.get_all_clients)
+    return await database.fetch_all(select(clients).order_by(clients.c.name.asc()))
+
+
+async def _rag_documents():
+    # What /api/rag-documents runs (main.get_rag_documents)
+    return await database.fetch_all(select(
+        indexed_rag_documents.c.id, indexed_rag_documents.c.filename,
+        indexed_rag_documents.c.num_chunks, indexed_rag_documents.c.indexed_at,
+    ))
+
+
+ENDPOINTS = [
+    _Endpoint("GET /api/cases", 0, lambda f: lambda: list_cases(limit=50)),
+    _Endpoint("GET /api/cases?type=", 0, lambda f: lambda: list_cases(limit=50, case_type="Contract Dispute")),
+    _Endpoint("GET /api/cases?status=", 0, lambda f: lambda: list_cases(limit=50, status="Open")),
+    _Endpoint("GET /api/cases?assigned_to=", 0, lambda f: lambda: list_cases(limit=50, assigned_to="Alex")),
+    _Endpoint(f"GET /api/cases (page {DEEP_PAGE})", 0, lambda f: lambda: list_cases(limit=50, cursor=f.deep_cursor)),
+    _Endpoint("GET /api/cases/{id}", 0, lambda f: lambda: get_case_detail(f.case_id())),
+    _Endpoint("GET /api/cases/{id}/notes", 0, lambda f: lambda: fetch_case_notes(f.case_id(), 20, None, False)),
+    # Ranking needs every match, so a common term grows with the data by design; a rare one should not.
+    _Endpoint("GET /api/search (common term)", 1, lambda f: lambda: search_cases("deposit", 20)),
+    _Endpoint("GET /api/search (rare term)", 0, lambda f: lambda: search_cases(f.case_id()[len(SYNTHETIC_PREFIX):], 20)),
+    # Counts scan their (index) ranges: linear by design, cached in production.
+    _Endpoint("GET /api/dashboard/overview", 1, lambda f: fetch_overview_counts),
+    _Endpoint("GET /api/dashboard (uncached)", 1, lambda f: build_dashboard),
+    _Endpoint("GET /api/dashboard/recent-activity", 0, lambda f: fetch_recent_activity),
+    _Endpoint("GET /api/dashboard/upcoming-deadlines", 0, lambda f: fetch_upcoming_deadlines),
+    _Endpoint("GET /api/dashboard/notifications", 0, lambda f: fetch_unread_notifications),
+    # Returns every client: linear in its result size.
+    _Endpoint("GET /api/clients", 1, lambda f: _all_clients),
+    # Returns every indexed document; synthetic data adds none, so it should stay flat.
+    _Endpoint("GET /api/rag-documents", 0, lambda f: _rag_documents),
+]
+
+
+async def _fixtures() -> _Fixtures:
+    sample = await database.fetch_all(
+        select(cases.c.case_id).where(cases.c.case_id.like(f"{SYNTHETIC_PREFIX}%")).order_by(cases.c.id.desc()).limit(500)
+    )
+    cursor = None
+    for _ in range(DEEP_PAGE - 1):
+        page = await list_cases(limit=50, cursor=cursor, fields="id")
+        if not page["next_cursor"]:
+            break
+        cursor = page["next_cursor"]
+    return _Fixtures([row["case_id"] for row in sample], cursor)
+
+
+def _slope(points: List[tuple]) -> Optional[float]:
+    """Least-squares slope of log(latency) against log(cases)."""
+    points = [(math.log(n), math.log(t)) for n, t in points if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.benchmarks.scale")
+    parser.add_argument("--scales", default="1000,10000,100000", help="comma-separated synthetic case counts, ascending")
+    parser.add_argument("--requests", type=int, default=50, help="calls per endpoint per scale")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    scales = sorted(int(s) for s in args.scales.split(",") if s.strip())
+
+    results: Dict[str, Dict[int, Dict[str, float]]] = {endpoint.name: {} for endpoint in ENDPOINTS}
+    await database.connect()
+    try:
+        for scale in scales:
+            print(f"--- Scale: {scale} synthetic cases ---")
+            await generate(scale, seed=args.seed)
+            fixtures = await _fixtures()
+            for endpoint in ENDPOINTS:
+                call = endpoint.make_call(fixtures)
+                await measure(call, min(5, args.requests), args.concurrency) # Warm up
+                summary = summarise(await measure(call, args.requests, args.concurrency))
+                results[endpoint.name][scale] = summary
+                print(f"  {endpoint.name:<40} p50={summary['p50_ms']:9.2f}ms p95={summary['p95_ms']:9.2f}ms")
+    finally:
+        await database.disconnect()
+
+    print("\n--- Growth (p95 per scale, slope of median latency vs cases) ---")
+    header = "".join(f"{scale:>12}" for scale in scales)
+    print(f"{'endpoint':<40}{header}   slope  verdict")
+    super_linear = False
+    for endpoint in ENDPOINTS:
+        by_scale = results[endpoint.name]
+        slope = _slope([(scale, by_scale[scale]["p50_ms"]) for scale in scales])
+        if slope is None:
+            verdict = "n/a"
+        elif slope > SUPER_LINEAR_SLOPE:
+            verdict = "SUPER-LINEAR"
+            super_linear = True
+        elif slope > endpoint.expected_slope + SLOPE_TOLERANCE:
+            verdict = "GROWS (expected flat)"
+        else:
+            verdict = "ok"
+        cells = "".join(f"{by_scale[scale]['p95_ms']:10.1f}ms" for scale in scales)
+        print(f"{endpoint.name:<40}{cells}   {slope if slope is not None else float('nan'):5.2f}  {verdict}")
+    return 1 if super_linear else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,133 @@
+# backend/app/benchmarks/stt_engines.py
+#
+# Speech-to-text engines (transcription.py) compared on sample audio:
+#
+#     python -m backend.app.benchmarks.stt_engines --audio a.wav b.mp3 [--reference a.txt b.txt]
+#         [--engines whisper,faster-whisper] [--repeat 3]
+#
+# Each engine runs in a fresh process with TRANSCRIPTION_CORES_PER_WORKER
+# threads, like a transcription pool worker. Reports load time, resident
+# memory after loading and at peak, real-time factor (transcription time /
+# audio length, best of --repeat; below 1 is faster than real time) and word
+# error rate. WER is against the --reference transcripts when given, else
+# against the first engine's output.
+
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import asyncio
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from ..core import config
+from ..core.long_audio import probe_duration
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def _run_engine(provider: str, paths: List[str], repeat: int) -> Dict[str, Any]:
+    # Runs in its own process, so memory figures belong to this engine alone.
+    if provider == "whisper":
+        import torch
+        torch.set_num_threads(config.TRANSCRIPTION_CORES_PER_WORKER)
+    from ..core.transcription import create_stt_engine
+
+    started = time.perf_counter()
+    engine = create_stt_engine(provider)
+    load_seconds = time.perf_counter() - started
+    rss_after_load = _rss_mb()
+
+    files = []
+    for path in paths:
+        best, text = float("inf"), ""
+        for _ in range(repeat):
+            started = time.perf_counter()
+            text = " ".join(s["text"] for s in engine.segments(path) if s["text"])
+            best = min(best, time.perf_counter() - started)
+        files.append({"seconds": best, "text": text})
+    return {
+        "load_seconds": load_seconds,
+        "rss_after_load_mb": rss_after_load,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, # KiB on Linux
+        "files": files,
+    }
+
+
+def _words(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """(substitutions + deletions + insertions) / reference words."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.benchmarks.stt_engines")
+    parser.add_argument("--audio", nargs="+", required=True, help="sample recordings")
+    parser.add_argument("--reference", nargs="*", default=[], help="reference transcript per recording (text files)")
+    parser.add_argument("--engines", default="whisper,faster-whisper", help="comma-separated STT_PROVIDER values")
+    parser.add_argument("--repeat", type=int, default=1, help="transcriptions per file; the fastest counts")
+    args = parser.parse_args(argv)
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    if args.reference and len(args.reference) != len(args.audio):
+        parser.error("--reference needs one transcript per --audio file")
+
+    durations = []
+    for path in args.audio:
+        duration = await probe_duration(path)
+        if not duration:
+            parser.error(f"cannot read the duration of {path} (is ffprobe installed?)")
+        durations.append(duration)
+    references = []
+    for path in args.reference:
+        with open(path, encoding="utf-8") as f:
+            references.append(f.read())
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for engine in engines:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[engine] = await asyncio.get_running_loop().run_in_executor(
+                executor, _run_engine, engine, args.audio, args.repeat,
+            )
+    if not references:
+        references = [f["text"] for f in results[engines[0]]["files"]]
+        print(f"No --reference given: WER is against {engines[0]}.")
+
+    print(f"\n{sum(durations):.0f}s of audio in {len(durations)} file(s), "
+          f"{config.TRANSCRIPTION_CORES_PER_WORKER} thread(s), model {config.WHISPER_MODEL}\n")
+    print(f"{'engine':<16}{'load (s)':>10}{'RSS (MB)':>10}{'peak (MB)':>11}{'RTF':>8}{'WER':>8}")
+    for engine, result in results.items():
+        seconds = sum(f["seconds"] for f in result["files"])
+        reference_words = sum(len(_words(r)) for r in references)
+        errors = sum(
+            word_error_rate(r, f["text"]) * len(_words(r)) for r, f in zip(references, result["files"])
+        )
+        wer = errors / reference_words if reference_words else 0.0
+        print(f"{engine:<16}{result['load_seconds']:>10.1f}{result['rss_after_load_mb']:>10.0f}"
+              f"{result['peak_rss_mb']:>11.0f}{seconds / sum(durations):>8.3f}{wer:>7.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,340 @@
+# backend/app/benchmarks/synthetic_data.py
+#
+# Fills the database with synthetic clients, cases (with transcripts and
+# follow-up notes), contracts, tasks, activities and notifications, so query
+# costs can be measured at realistic sizes:
+#
+#     python -m backend.app.benchmarks.synthetic_data --cases 100000 [--seed 7] [--reset]
+#
+# Generation tops up to the requested number of synthetic cases, so running
+# 1k, then 100k, then 1M only adds the difference each time. Synthetic rows
+# are marked (ids start with SYN-) and --reset removes exactly those.
+# Do not run against a production database.
+
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import func, select
+
+from ..core.case_fields import compute_case_fields
+from ..core.dashboard import invalidate_dashboard
+from ..core.database import database, cases, clients
+from ..core.transcripts import prune_orphan_transcripts, store_transcripts_raw
+
+SYNTHETIC_PREFIX = "SYN-"
+BATCH_CASES = 2000
+
+# Per synthetic case, on average
+CLIENTS_PER_CASE = 0.2
+CONTRACTS_PER_CLIENT = 2
+TASKS_PER_CASE = 0.5
+ACTIVITIES_PER_CASE_WEIGHTS = [25, 50, 25] # 0, 1 or 2
+NOTIFICATIONS_PER_CASE = 0.1
+NOTES_PER_CASE_WEIGHTS = [50, 30, 15, 5] # 0, 1, 2 or 3 follow-up calls
+
+# Transcript length in characters: log-normal around a 5-10 minute call, with a long tail.
+TRANSCRIPT_MEDIAN_CHARS = 6000
+TRANSCRIPT_SIGMA = 0.7
+TRANSCRIPT_MAX_CHARS = 80000
+
+_CASE_TYPES = ["Contract Dispute", "Intellectual Property", "Personal Injury", "Wrongful Termination",
+               "Landlord-Tenant", "Employment", "Family Law", "Debt Collection", "Immigration", "Estate Planning"]
+_STATUSES = ["Pending Review", "Open", "In Progress", "Awaiting Documents", "Closed"]
+_ASSIGNEES = ["Alex", "Sarah Johnson", "Michael Chen", "Priya Patel", "Unassigned", None]
+_FIRST_NAMES = ["Maria", "James", "Aisha", "Chen", "Olga", "David", "Fatima", "Lucas", "Emma", "Kwame", "Sofia", "Noah"]
+_LAST_NAMES = ["Garcia", "Smith", "Okafor", "Wang", "Ivanova", "Brown", "Haddad", "Silva", "Jones", "Mensah", "Rossi", "Kim"]
+_COMPANIES = ["Holdings", "Logistics", "Software", "Builders", "Foods", "Media", "Health", "Partners", "Retail", "Energy"]
+_SUBJECTS = ["the lease", "my employer", "the contractor", "our supplier", "the landlord", "the insurance company",
+             "my former business partner", "the software vendor", "the hospital", "the bank"]
+_EVENTS = ["stopped paying the invoices", "terminated the agreement without notice", "copied our product design",
+           "refused to return the deposit", "fired me after I reported a safety issue", "missed the delivery deadline",
+           "changed the terms after signing", "sent a demand letter", "filed a complaint against us", "denied the claim"]
+_USER_LINES = [
+    "I'm calling because {subject} {event}.",
+    "This started around {month} and it has only gotten worse since then.",
+    "We signed the contract in {month}, and I still have a copy of it.",
+    "I have emails showing that they knew about the problem.",
+    "Honestly I'm not sure what my options are here.",
+    "They are asking for about {amount} dollars, which we don't think we owe.",
+    "My colleague was there as well and can confirm what happened.",
+    "Is there a deadline I need to worry about?",
+]
+_AI_LINES = [
+    "I'm sorry to hear that. Can you tell me when this first happened?",
+    "Thank you. Do you have any written agreement or correspondence about this?",
+    "Understood. Has there been any formal notice or legal filing so far?",
+    "That's helpful. Were there any witnesses or other parties involved?",
+    "I'll note that down. Are there any important dates coming up, such as a hearing or a deadline?",
+    "Let me summarise what I have so far, and please correct me if anything is wrong.",
+    "An attorney will review this and contact you within two business days.",
+]
+_MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+
+
+class _Generator:
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.now = datetime.utcnow()
+
+    def _fill(self, template: str) -> str:
+        rng = self.rng
+        return template.format(subject=rng.choice(_SUBJECTS), event=rng.choice(_EVENTS),
+                               month=rng.choice(_MONTHS), amount=rng.randrange(1, 500) * 1000)
+
+    def transcript(self, scale: float = 1.0) -> str:
+        target = min(TRANSCRIPT_MAX_CHARS, int(self.rng.lognormvariate(math.log(TRANSCRIPT_MEDIAN_CHARS * scale), TRANSCRIPT_SIGMA)))
+        turns, size = [], 0
+        while size < target:
+            turn = "User: " + self._fill(self.rng.choice(_USER_LINES)) if len(turns) % 2 else "AI: " + self.rng.choice(_AI_LINES)
+            turns.append(turn)
+            size += len(turn) + 1
+        return "\n".join(turns)
+
+    def person(self) -> str:
+        return f"{self.rng.choice(_FIRST_NAMES)} {self.rng.choice(_LAST_NAMES)}"
+
+    def client_name(self) -> str:
+        if self.rng.random() < 0.4:
+            return f"{self.rng.choice(_LAST_NAMES)} {self.rng.choice(_COMPANIES)}"
+        return self.person()
+
+    def moment(self, max_days_ago: int = 730) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randrange(max_days_ago * 86400))
+
+    def intake(self, client_name: str) -> Dict[str, Any]:
+        case_type = self.rng.choice(_CASE_TYPES)
+        facts = f"{client_name} reports that {self.rng.choice(_SUBJECTS)} {self.rng.choice(_EVENTS)}. " \
+                f"The matter is classified as {case_type.lower()}."
+        return {
+            "client_name": client_name,
+            "opposing_party": self.client_name() if self.rng.random() < 0.7 else None,
+            "case_type": case_type,
+            "summary_of_facts": facts,
+            "key_dates": [self.moment().strftime("%m/%d/%Y") for _ in range(self.rng.randrange(3))],
+        }
+
+
+async def _reserve_ids(raw, table: str, count: int) -> List[int]:
+    """Reserves `count` consecutive ids from the table's serial sequence."""
+    sequence = await raw.fetchval("SELECT pg_get_serial_sequence($1, 'id')", table)
+    end = await raw.fetchval(
+        f"SELECT setval($1, GREATEST((SELECT coalesce(max(id), 0) FROM {table}), (SELECT last_value FROM {sequence})) + $2)",
+        sequence, count,
+    )
+    return list(range(end - count + 1, end + 1))
+
+
+async def _copy(raw, table: str, rows: Sequence[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    if "id" not in rows[0]:
+        # Explicit ids: the sample data inserts some rows with fixed ids, behind the sequence.
+        for row, row_id in zip(rows, await _reserve_ids(raw, table, len(rows))):
+            row["id"] = row_id
+    columns = list(rows[0])
+    await raw.copy_records_to_table(table, records=[tuple(row[c] for c in columns) for row in rows], columns=columns)
+
+
+async def _counts() -> Dict[str, int]:
+    synthetic = f"{SYNTHETIC_PREFIX}%"
+    return {
+        "cases": await database.fetch_val(select(func.count()).select_from(cases).where(cases.c.case_id.like(synthetic))),
+        "clients": await database.fetch_val(select(func.count()).select_from(clients).where(clients.c.client_id.like(synthetic))),
+    }
+
+
+async def _generate_batch(gen: _Generator, raw, first_case_number: int, case_count: int,
+                          first_client_number: int, client_pool: List[Dict[str, Any]]) -> int:
+    rng = gen.rng
+    new_client_count = max(1, round(case_count * CLIENTS_PER_CASE))
+    client_ids = await _reserve_ids(raw, "clients", new_client_count)
+    new_clients = []
+    for offset, client_pk in enumerate(client_ids):
+        number = first_client_number + offset
+        name = gen.client_name()
+        new_clients.append({
+            "id": client_pk,
+            "client_id": f"{SYNTHETIC_PREFIX}C{number:09d}",
+            "name": name,
+            "contact_email": f"client{number}@synthetic.example",
+            "phone_number": f"+1999{number:07d}",
+            "status": "Active" if rng.random() < 0.85 else "Inactive",
+            "last_activity_at": gen.moment(90),
+            "created_at": gen.moment(),
+        })
+    await _copy(raw, "clients", new_clients)
+    client_pool.extend({"id": c["id"], "name": c["name"], "phone_number": c["phone_number"]} for c in new_clients)
+
+    case_ids = await _reserve_ids(raw, "cases", case_count)
+    new_cases, notes = [], []
+    for offset, case_pk in enumerate(case_ids):
+        client = rng.choice(client_pool)
+        intake = gen.intake(client["name"])
+        created_at = gen.moment()
+        last_updated_at = created_at
+        for _ in range(rng.choices(range(len(NOTES_PER_CASE_WEIGHTS)), NOTES_PER_CASE_WEIGHTS)[0]):
+            last_updated_at = min(gen.now, last_updated_at + timedelta(days=rng.randrange(1, 60)))
+            notes.append({
+                "case_id": case_pk,
+                "vapi_call_id": None,
+                "summary": f"Follow-up call: {gen._fill(rng.choice(_USER_LINES))}",
+                "transcript": gen.transcript(scale=0.4),
+                "created_at": last_updated_at,
+            })
+        new_cases.append({
+            "id": case_pk,
+            "case_id": f"{SYNTHETIC_PREFIX}{first_case_number + offset:09d}",
+            "caller_phone_number": client["phone_number"],
+            "status": rng.choice(_STATUSES),
+            "structured_intake": json.dumps(intake),
+            "call_summary": intake["summary_of_facts"] + " The caller was advised that an attorney will follow up.",
+            "transcript": gen.transcript(), # Replaced by transcript_id before the COPY
+            "created_at": created_at,
+            "vapi_call_id": None,
+            "assigned_to": rng.choice(_ASSIGNEES),
+            "last_updated_at": last_updated_at,
+            "client_id": client["id"],
+            **compute_case_fields(intake, client["name"]),
+        })
+    with_transcripts = new_cases + notes
+    transcript_ids = await store_transcripts_raw(raw, [row.pop("transcript") for row in with_transcripts])
+    for row, transcript_id in zip(with_transcripts, transcript_ids):
+        row["transcript_id"] = transcript_id
+    await _copy(raw, "cases", new_cases)
+    await _copy(raw, "case_notes", notes)
+
+    await _copy(raw, "contracts", [
+        {
+            "contract_id": f"{SYNTHETIC_PREFIX}K{client['client_id'][len(SYNTHETIC_PREFIX) + 1:]}-{n}",
+            "client_id": client["id"],
+            "name": f"{rng.choice(['Services', 'License', 'Lease', 'Supply', 'Employment'])} Agreement - {client['name']}",
+            "status": rng.choice(["Active", "Active", "Review", "Expired"]),
+            "signed_date": gen.moment(),
+            "expiration_date": gen.now + timedelta(days=rng.randrange(-365, 1095)),
+            "created_at": gen.moment(),
+        }
+        for client in new_clients for n in range(CONTRACTS_PER_CLIENT)
+    ])
+    await _copy(raw, "tasks", [
+        {
+            "task_id": f"{SYNTHETIC_PREFIX}T{case['case_id'][len(SYNTHETIC_PREFIX):]}",
+            "title": f"{rng.choice(['Review documents for', 'Call back', 'Draft response for', 'File motion for'])} {case['client_name']}",
+            "due_date": gen.now + timedelta(days=rng.randrange(-30, 90)),
+            "status": rng.choice(["Pending", "In Progress", "Completed"]),
+            "task_type": rng.choice(["Review", "Communication", "Litigation", "Compliance", "Intake"]),
+            "assigned_to": rng.choice(_ASSIGNEES),
+            "related_case_id": case["id"],
+            "created_at": case["created_at"],
+        }
+        for case in new_cases if rng.random() < TASKS_PER_CASE
+    ])
+    await _copy(raw, "activities", [
+        {
+            "description": f"Updated case {case['case_id']} for {case['client_name']}",
+            "activity_type": rng.choice(["Case Management", "Contract Review", "Legal Research", "Client Onboarding"]),
+            "related_id": case["id"],
+            "related_type": "case",
+            "performed_at": case["last_updated_at"],
+        }
+        for case in new_cases for _ in range(rng.choices(range(len(ACTIVITIES_PER_CASE_WEIGHTS)), ACTIVITIES_PER_CASE_WEIGHTS)[0])
+    ])
+    await _copy(raw, "notifications", [
+        {
+            "message": f"Case {case['case_id']} needs attention",
+            "notification_type": "Case Status",
+            "is_read": rng.random() < 0.7,
+            "related_url": f"/cases#{case['case_id']}",
+            "created_at": case["last_updated_at"],
+        }
+        for case in new_cases if rng.random() < NOTIFICATIONS_PER_CASE
+    ])
+    return len(new_cases)
+
+
+async def generate(target_cases: int, seed: int = 7, progress: bool = True) -> int:
+    """
+    Tops the synthetic data set up to target_cases cases (plus proportional
+    clients, notes, contracts, tasks, activities and notifications) with COPY,
+    BATCH_CASES cases per transaction. Returns the number of cases added.
+    Per-row UI events are suppressed inside each batch transaction
+    (app.suppress_row_events, migrations 0014 and 0015) so seeding does not
+    flood the event stream; other sessions are unaffected.
+    """
+    existing = await _counts()
+    missing = target_cases - existing["cases"]
+    if missing <= 0:
+        return 0
+    # Seeded per starting point so topping up does not regenerate the same rows.
+    gen = _Generator(seed * 1_000_003 + existing["cases"])
+    client_pool = [
+        dict(row) for row in await database.fetch_all(
+            select(clients.c.id, clients.c.name, clients.c.phone_number).where(clients.c.client_id.like(f"{SYNTHETIC_PREFIX}%"))
+        )
+    ]
+    started = time.perf_counter()
+    added, clients_added = 0, existing["clients"]
+    async with database.connection() as connection:
+        raw = connection.raw_connection
+        while added < missing:
+            count = min(BATCH_CASES, missing - added)
+            async with connection.transaction():
+                await raw.execute("SET LOCAL app.suppress_row_events = 'on'")
+                before = len(client_pool)
+                added += await _generate_batch(gen, raw, existing["cases"] + added, count, clients_added, client_pool)
+                clients_added += len(client_pool) - before
+            if progress:
+                rate = added / (time.perf_counter() - started)
+                print(f"  {existing['cases'] + added}/{target_cases} synthetic cases ({rate:.0f} cases/s)")
+        await raw.execute("ANALYZE")
+    invalidate_dashboard()
+    return added
+
+
+async def reset() -> None:
+    """Removes every synthetic row (and nothing else)."""
+    synthetic = f"{SYNTHETIC_PREFIX}%"
+    async with database.transaction():
+        await database.execute(
+            "DELETE FROM activities WHERE related_type = 'case' AND related_id IN (SELECT id FROM cases WHERE case_id LIKE :p)",
+            {"p": synthetic},
+        )
+        await database.execute("DELETE FROM notifications WHERE related_url LIKE :p", {"p": f"/cases#{synthetic}"})
+        await database.execute("DELETE FROM tasks WHERE task_id LIKE :p", {"p": synthetic})
+        await database.execute("DELETE FROM contracts WHERE contract_id LIKE :p", {"p": synthetic})
+        await database.execute("DELETE FROM cases WHERE case_id LIKE :p", {"p": synthetic})
+        await database.execute("DELETE FROM clients WHERE client_id LIKE :p", {"p": synthetic})
+        await prune_orphan_transcripts()
+    invalidate_dashboard()
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.benchmarks.synthetic_data")
+    parser.add_argument("--cases", type=int, required=True, help="target number of synthetic cases, e.g. 1000, 100000, 1000000")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--reset", action="store_true", help="remove existing synthetic data first")
+    args = parser.parse_args(argv)
+
+    await database.connect()
+    try:
+        if args.reset:
+            await reset()
+            print("Removed existing synthetic data")
+        started = time.perf_counter()
+        added = await generate(args.cases, seed=args.seed)
+        print(f"Added {added} synthetic cases in {time.perf_counter() - started:.1f}s")
+    finally:
+        await database.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
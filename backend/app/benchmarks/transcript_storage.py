@@ -0,0 +1,79 @@
+# backend/app/benchmarks/transcript_storage.py
+#
+# Storage and scan cost of the transcript store (migration 0010):
+#
+#     python -m backend.app.benchmarks.transcript_storage [--requests 20]
+#
+# Prints the storage report (table sizes, compression and de-duplication
+# savings), then rebuilds the old layout, with each case's transcript inline,
+# as a scratch table and compares a full scan of the case list columns on
+# both. Seed data first (synthetic_data.py) for meaningful numbers.
+
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import asyncio
+import sys
+
+from ..core.database import database
+from ..core.transcripts import transcript_storage_report
+from ._stats import format_summary, measure, summarise
+
+_INLINE_TABLE = "bench_cases_inline_transcripts"
+
+# A list-style aggregate has to read every heap page: what a case list scan,
+# a count or an unindexed filter costs.
+_SCAN_SQL = "SELECT status, count(*), max(last_updated_at) FROM {table} GROUP BY status"
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1024 / 1024:10.1f} MB"
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.benchmarks.transcript_storage")
+    parser.add_argument("--requests", type=int, default=20, help="scans per layout")
+    args = parser.parse_args(argv)
+
+    await database.connect()
+    try:
+        report = await transcript_storage_report()
+        print("--- Storage ---")
+        print(f"{'table':<14}{'rows':>12}{'heap':>14}{'toast':>14}{'indexes':>14}")
+        for t in report["tables"]:
+            print(f"{t['table']:<14}{t['estimated_rows']:>12}{_mb(t['heap_bytes'])}{_mb(t['toast_bytes'])}{_mb(t['index_bytes'])}")
+        store = report["transcripts"]
+        print(f"\nTranscripts: {store['count']}")
+        print(f"  referenced by cases and notes {_mb(store['referenced_bytes'])}")
+        print(f"  after de-duplication          {_mb(store['unique_bytes'])} (saved {_mb(store['dedupe_saved_bytes']).strip()})")
+        print(f"  after compression             {_mb(store['stored_bytes'])} (ratio {store['compression_ratio']})")
+
+        print("\n--- Full scan of the case list columns ---")
+        await database.execute(f"DROP TABLE IF EXISTS {_INLINE_TABLE}")
+        await database.execute(
+            f"CREATE UNLOGGED TABLE {_INLINE_TABLE} AS "
+            "SELECT c.*, t.body AS full_transcript FROM cases c LEFT JOIN transcripts t ON t.id = c.transcript_id"
+        )
+        try:
+            await database.execute(f"VACUUM ANALYZE {_INLINE_TABLE}")
+            await database.execute("VACUUM ANALYZE cases")
+            for label, table in (("inline (old layout)", _INLINE_TABLE), ("transcript store", "cases")):
+                pages = await database.fetch_val(
+                    "SELECT pg_relation_size(CAST(:table AS regclass)) / current_setting('block_size')::int",
+                    values={"table": table},
+                )
+                sql = _SCAN_SQL.format(table=table)
+                await measure(lambda: database.fetch_all(sql), 3, 1) # Warm the cache
+                summary = summarise(await measure(lambda: database.fetch_all(sql), args.requests, 1))
+                print(f"{format_summary(label, summary)}  heap pages={pages}")
+        finally:
+            await database.execute(f"DROP TABLE IF EXISTS {_INLINE_TABLE}")
+    finally:
+        await database.disconnect()
+    print("\nUntil VACUUM FULL cases, case_notes has run after migration 0010, the dropped")
+    print("transcript columns still take up their space and the second scan understates the gain.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -6,6 +6,7 @@ from langchain.agents import create_tool_calling_agent, AgentExecutor
 from langchain.tools.render import render_text_description # Keep this for rendering tools into prompt
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder # New import for explicit prompt components
 from .llm_factory import get_llm
+from . import config
 from .tools import (
     LegalDocumentRetrieverTool,
     WebSearchTool,
@@ -14,6 +15,18 @@ from .tools import (
     AsyncDatabaseCaseReaderTool # <-- NEW: Import the async version
 )
 
+def _local_tool_calling_prompt() -> ChatPromptTemplate:
+    """
+    Local copy of the "hwchase17/openai-tools-agent" hub prompt, used when the
+    hub cannot (or should not) be reached, e.g. with the fake offline providers.
+    """
+    return ChatPromptTemplate.from_messages([
+        ("system", "You are a helpful assistant"),
+        MessagesPlaceholder("chat_history", optional=True),
+        ("human", "{input}"),
+        MessagesPlaceholder("agent_scratchpad"),
+    ])
+
 def create_agent_executor():
     print("🚀 --- Starting Agent Initialization ---")
 
@@ -44,10 +57,14 @@ def create_agent_executor():
 
     # --- RE-ADD PROMPT PULLING, BUT USE A DIFFERENT ONE ---
     try:
-        print("📝 Pulling tool-calling agent prompt template...")
-        # This prompt is designed for native tool-calling LLMs (like Gemini/OpenAI models)
-        # It handles the structure for tool calls and conversation history.
-        prompt = hub.pull("hwchase17/openai-tools-agent") # This is the key change here!
+        if config.LLM_PROVIDER == "fake":
+            print("📝 Using local tool-calling agent prompt template (offline mode)")
+            prompt = _local_tool_calling_prompt()
+        else:
+            print("📝 Pulling tool-calling agent prompt template...")
+            # This prompt is designed for native tool-calling LLMs (like Gemini/OpenAI models)
+            # It handles the structure for tool calls and conversation history.
+            prompt = hub.pull("hwchase17/openai-tools-agent") # This is the key change here!
         print("✅ Prompt template loaded successfully")
 
         # The prompt will internally use render_text_description, no need to pass it explicitly here.
@@ -0,0 +1,90 @@
+# backend/app/core/audio_upload.py
+
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+
+from fastapi import UploadFile
+
+from .long_audio import SAMPLE_RATE, decode_audio
+
+# Uploaded recordings stay in the upload's spooled buffer (in memory, spilling
+# to an unnamed temporary file only past Starlette's spool size). They are
+# hashed from there for the transcription cache and streamed into ffmpeg's
+# stdin; the decoded PCM goes to the transcription pool as bytes.
+
+_READ_BYTES = 1024 * 1024
+
+# What ffmpeg reports when an MP4-family file cannot be demuxed from a pipe
+# (its index is at the end, and a pipe cannot seek back to it).
+_NEEDS_SEEK_MARKERS = ("mov,mp4", "moov atom not found", "partial file")
+
+
+async def hash_upload(upload: UploadFile) -> bytes:
+    """SHA-256 of the uploaded bytes, read in chunks from the spooled buffer."""
+    digest = hashlib.sha256()
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(_READ_BYTES)
+        if not chunk:
+            break
+        digest.update(chunk)
+    return digest.digest()
+
+
+async def _decode_piped(upload: UploadFile) -> bytes:
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-v", "error", "-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def feed():
+        # Written concurrently with reading stdout, so neither pipe fills up and blocks ffmpeg.
+        try:
+            await upload.seek(0)
+            while True:
+                chunk = await upload.read(_READ_BYTES)
+                if not chunk:
+                    break
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass # ffmpeg stopped reading (bad input); its exit code and stderr say why
+
+    try:
+        _, pcm, stderr = await asyncio.gather(feed(), process.stdout.read(), process.stderr.read())
+        await process.wait()
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+        raise
+    if process.returncode != 0:
+        raise ValueError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()[-500:]}")
+    return pcm
+
+
+async def decode_upload(upload: UploadFile):
+    """The uploaded recording as 16 kHz mono int16 samples."""
+    import numpy as np
+
+    try:
+        return np.frombuffer(await _decode_piped(upload), dtype=np.int16)
+    except ValueError as e:
+        if not any(marker in str(e).lower() for marker in _NEEDS_SEEK_MARKERS):
+            raise # Corrupt or unsupported input: decoding it again from a file would fail the same way
+        pipe_error = e
+    # MP4/M4A/MOV files with their index at the end cannot be demuxed from a
+    # pipe, since ffmpeg has to seek to it. Those go through a temporary file
+    # in the system temp directory (not the working directory), deleted on close.
+    suffix = os.path.splitext(upload.filename or "")[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as f:
+        await upload.seek(0)
+        await asyncio.to_thread(shutil.copyfileobj, upload.file, f)
+        f.flush()
+        try:
+            return await decode_audio(f.name)
+        except ValueError:
+            raise pipe_error from None
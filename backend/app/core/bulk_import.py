@@ -0,0 +1,383 @@
+# backend/app/core/bulk_import.py
+
+import asyncio
+import csv
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+from asyncpg.exceptions import DataError, IntegrityConstraintViolationError
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import or_, select
+
+from . import config
+from .case_fields import compute_case_fields
+from .dashboard import invalidate_dashboard
+from .database import database, cases, clients, contracts
+from .schemas import CaseImportRow, ClientImportRow, ContractImportRow
+from .transcripts import store_transcripts_raw
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Errors that one bad row causes for its whole COPY batch (a value too long,
+# a NOT NULL or foreign key violation), as opposed to the database being unavailable.
+_ROW_ERRORS = (DataError, IntegrityConstraintViolationError)
+
+
+class RowImportError(ValueError):
+    """A row that validated but cannot be imported (e.g. an unknown client)."""
+
+
+def detect_format(filename: Optional[str], explicit: Optional[str] = None) -> str:
+    fmt = (explicit or "").lower() or ("csv" if (filename or "").lower().endswith(".csv") else "ndjson")
+    if fmt == "jsonl":
+        fmt = "ndjson"
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format '{fmt}', expected one of {', '.join(IMPORT_FORMATS)}")
+    return fmt
+
+
+def _from_csv(record: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    # Empty cells mean "not given"; nested values (structured_intake) are JSON in their cell.
+    values = {key.strip(): value for key, value in record.items() if key and value not in (None, "")}
+    if isinstance(values.get("structured_intake"), str):
+        try:
+            values["structured_intake"] = json.loads(values["structured_intake"])
+        except ValueError:
+            pass # Left as text; validation reports it
+    return values
+
+
+def iter_source_rows(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Streams (line number, record dict) from CSV (with a header row) or
+    NDJSON text. Records that cannot be parsed come through as
+    (line number, exception) so they are reported, not fatal.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield reader.line_num, e
+                continue
+            yield reader.line_num, _from_csv(record)
+    else:
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, e
+                continue
+            if not isinstance(record, dict):
+                yield number, ValueError("expected a JSON object")
+                continue
+            yield number, record
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors())
+
+
+def _read_batch(rows: Iterator[Tuple[int, Any]], row_model: Type[BaseModel]):
+    """
+    Parses and validates source rows until a batch is full or the file ends.
+    Blocking (file reads, CSV/JSON parsing, validation): import_rows() runs it
+    in a worker thread. Returns (rows read, [(line, error)], [(line, row)], at end of file).
+    """
+    read = 0
+    failures: List[Tuple[int, str]] = []
+    batch: List[Tuple[int, BaseModel]] = []
+    for line, record in rows:
+        read += 1
+        if isinstance(record, Exception):
+            failures.append((line, f"Unparseable row: {record}"))
+            continue
+        try:
+            batch.append((line, row_model(**record)))
+        except ValidationError as e:
+            failures.append((line, _validation_message(e)))
+            continue
+        if len(batch) >= config.BULK_IMPORT_BATCH_SIZE:
+            return read, failures, batch, False
+    return read, failures, batch, True
+
+
+def _utc_naive(value: Optional[datetime], default: Optional[datetime]) -> Optional[datetime]:
+    # Columns are TIMESTAMP WITHOUT TIME ZONE holding UTC.
+    if value is None:
+        return default
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _new_public_id(prefix: str = "") -> str:
+    # 12 hex digits: with tens of thousands of rows per import, 8 would collide.
+    return f"{prefix}{uuid.uuid4().hex[:12].upper()}"
+
+
+async def _find_clients(phones: Set[str], emails: Set[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Existing clients by phone number and by contact email, in one query."""
+    if not phones and not emails:
+        return {}, {}
+    rows = await database.fetch_all(
+        select(clients.c.id, clients.c.name, clients.c.phone_number, clients.c.contact_email)
+        .where(or_(clients.c.phone_number.in_(sorted(phones)), clients.c.contact_email.in_(sorted(emails))))
+    )
+    by_phone = {row["phone_number"]: row for row in rows if row["phone_number"] in phones}
+    by_email = {row["contact_email"]: row for row in rows if row["contact_email"] in emails}
+    return by_phone, by_email
+
+
+# --- Per-entity row preparation: validated rows -> column values for COPY ---
+
+async def _prepare_clients(rows: List[ClientImportRow], now: datetime) -> List[Any]:
+    return [
+        {
+            "client_id": row.client_id or _new_public_id(),
+            "name": row.name,
+            "contact_email": row.contact_email,
+            "phone_number": row.phone_number,
+            "status": row.status,
+            "last_activity_at": _utc_naive(row.last_activity_at, now),
+            "created_at": _utc_naive(row.created_at, now),
+            "notes": row.notes,
+        }
+        for row in rows
+    ]
+
+
+async def _prepare_cases(rows: List[CaseImportRow], now: datetime) -> List[Any]:
+    by_phone, by_email = await _find_clients(
+        {row.caller_phone_number for row in rows if row.caller_phone_number},
+        {row.client_email for row in rows if row.client_email},
+    )
+    prepared = []
+    for row in rows:
+        client = by_phone.get(row.caller_phone_number) or by_email.get(row.client_email)
+        if client is None and row.client_email:
+            prepared.append(RowImportError(f"No client with contact_email {row.client_email}"))
+            continue
+        intake = row.structured_intake.dict() if row.structured_intake else {}
+        created_at = _utc_naive(row.created_at, now)
+        prepared.append({
+            "case_id": row.case_id or _new_public_id("CASE-"),
+            "caller_phone_number": row.caller_phone_number,
+            "status": row.status,
+            "structured_intake": json.dumps(intake),
+            "call_summary": row.call_summary,
+            "full_transcript": row.full_transcript,
+            "assigned_to": row.assigned_to,
+            "created_at": created_at,
+            "last_updated_at": _utc_naive(row.last_updated_at, created_at),
+            "client_id": client["id"] if client else None,
+            **compute_case_fields(intake, client["name"] if client else None),
+        })
+    return prepared
+
+
+async def _prepare_contracts(rows: List[ContractImportRow], now: datetime) -> List[Any]:
+    by_phone, by_email = await _find_clients(
+        {row.client_phone_number for row in rows if row.client_phone_number},
+        {row.client_email for row in rows if row.client_email},
+    )
+    prepared = []
+    for row in rows:
+        client = by_phone.get(row.client_phone_number) or by_email.get(row.client_email)
+        if client is None and (row.client_phone_number or row.client_email):
+            prepared.append(RowImportError(
+                f"No client with phone_number {row.client_phone_number} or contact_email {row.client_email}"
+            ))
+            continue
+        prepared.append({
+            "contract_id": row.contract_id or _new_public_id(),
+            "client_id": client["id"] if client else None,
+            "name": row.name,
+            "status": row.status,
+            "signed_date": _utc_naive(row.signed_date, None),
+            "expiration_date": _utc_naive(row.expiration_date, None),
+            "last_reviewed_at": _utc_naive(row.last_reviewed_at, None),
+            "created_at": _utc_naive(row.created_at, now),
+        })
+    return prepared
+
+
+async def _store_case_transcripts(raw, records: List[Dict[str, Any]]) -> None:
+    # Transcripts go to the transcript store; the case row keeps the id.
+    transcript_ids = await store_transcripts_raw(raw, [record.pop("full_transcript") for record in records])
+    for record, transcript_id in zip(records, transcript_ids):
+        record["transcript_id"] = transcript_id
+
+
+class _Entity:
+    def __init__(self, table, row_model: Type[BaseModel], key: str, columns: List[str],
+                 prepare: Callable, after_batch: Optional[Callable[[], None]] = None,
+                 before_copy: Optional[Callable] = None, event_kind: Optional[str] = None):
+        self.table = table
+        self.row_model = row_model
+        self.key = key
+        self.columns = columns
+        self.prepare = prepare
+        self.after_batch = after_batch
+        self.before_copy = before_copy # async (asyncpg connection, records), inside the batch transaction
+        self.event_kind = event_kind # One app event per batch in place of the per-row ones (migration 0014)
+
+
+IMPORT_ENTITIES: Dict[str, _Entity] = {
+    "clients": _Entity(
+        clients, ClientImportRow, "client_id",
+        ["client_id", "name", "contact_email", "phone_number", "status", "last_activity_at", "created_at", "notes"],
+        _prepare_clients,
+    ),
+    "cases": _Entity(
+        cases, CaseImportRow, "case_id",
+        ["case_id", "caller_phone_number", "status", "structured_intake", "call_summary", "transcript_id",
+         "assigned_to", "created_at", "last_updated_at", "client_id", "case_name", "client_name", "case_type"],
+        _prepare_cases,
+        before_copy=_store_case_transcripts,
+        event_kind="cases_imported",
+    ),
+    "contracts": _Entity(
+        contracts, ContractImportRow, "contract_id",
+        ["contract_id", "client_id", "name", "status", "signed_date", "expiration_date", "last_reviewed_at", "created_at"],
+        _prepare_contracts,
+        after_batch=invalidate_dashboard,
+    ),
+}
+
+
+async def _copy_batch(entity: _Entity, records: List[Dict[str, Any]]) -> Set[str]:
+    """
+    Loads one batch with COPY into a temporary staging table, then moves it
+    into the real table with ON CONFLICT DO NOTHING, so rows that already
+    exist (any unique column) are skipped instead of failing the batch.
+    Row triggers (case counts, search vectors) fire as for any insert, except
+    per-row UI events: an entity with an event_kind publishes one event for
+    the batch instead. Returns the keys of the rows actually inserted.
+    """
+    table = entity.table.name
+    column_list = ", ".join(entity.columns)
+    records = [dict(record) for record in records] # before_copy edits them; a failed batch is retried row by row
+    async with database.connection() as connection:
+        async with connection.transaction():
+            raw = connection.raw_connection # asyncpg connection: COPY is not exposed by the databases API
+            if entity.event_kind:
+                await raw.execute("SET LOCAL app.suppress_row_events = 'on'")
+            if entity.before_copy:
+                await entity.before_copy(raw, records)
+            await raw.execute(
+                f"CREATE TEMP TABLE import_stage ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA"
+            )
+            await raw.copy_records_to_table(
+                "import_stage",
+                records=[tuple(record[column] for column in entity.columns) for record in records],
+                columns=entity.columns,
+            )
+            inserted = await raw.fetch(
+                f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM import_stage "
+                f"ON CONFLICT DO NOTHING RETURNING {entity.key}"
+            )
+            if entity.event_kind and inserted:
+                await raw.execute(
+                    "SELECT app_events_publish($1, CAST($2 AS JSONB))",
+                    entity.event_kind, json.dumps({"count": len(inserted)}),
+                )
+    return {row[entity.key] for row in inserted}
+
+
+async def _copy_rows(entity: _Entity, to_copy: List[Tuple[int, Dict[str, Any]]]) -> Tuple[Set[str], Dict[int, str]]:
+    """
+    _copy_batch for (line, record) pairs. If one row makes the database
+    reject the batch, the batch is loaded again row by row so only that row
+    is lost. Returns the inserted keys and the rejected lines with their errors.
+    """
+    try:
+        return await _copy_batch(entity, [record for _, record in to_copy]), {}
+    except _ROW_ERRORS as e:
+        print(f"--- Import batch rejected ({e}); loading its {len(to_copy)} rows one by one ---")
+    inserted: Set[str] = set()
+    rejected: Dict[int, str] = {}
+    for line, record in to_copy:
+        try:
+            inserted |= await _copy_batch(entity, [record])
+        except _ROW_ERRORS as e:
+            rejected[line] = f"Rejected by the database: {e}"
+    return inserted, rejected
+
+
+async def import_rows(entity_name: str, lines: Iterable[str], fmt: str,
+                      on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Imports clients, cases or contracts from CSV / NDJSON lines, streaming:
+    rows are parsed and validated against the schemas.py import models (in a
+    worker thread, a batch at a time), then loaded BULK_IMPORT_BATCH_SIZE at
+    a time. Invalid, duplicate and database-rejected rows are reported by
+    line number and skipped; the rest of the file still loads.
+    Import clients first: cases and contracts link to existing clients by
+    phone number or contact email.
+    """
+    entity = IMPORT_ENTITIES[entity_name]
+    started = time.perf_counter()
+    report = {
+        "entity": entity_name, "rows_read": 0, "inserted": 0, "duplicates": 0, "failed": 0,
+        "errors": [], "errors_truncated": False,
+    }
+    seen_keys: Set[str] = set()
+
+    def fail(line: int, message: str, duplicate: bool = False) -> None:
+        report["duplicates" if duplicate else "failed"] += 1
+        if len(report["errors"]) < config.BULK_IMPORT_MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line, "error": message})
+        else:
+            report["errors_truncated"] = True
+
+    def finish() -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["rows_read"] / elapsed, 1) if elapsed > 0 else 0.0
+        return report
+
+    async def flush(batch: List[Tuple[int, BaseModel]]) -> None:
+        prepared = await entity.prepare([row for _, row in batch], datetime.utcnow())
+        to_copy: List[Tuple[int, Dict[str, Any]]] = []
+        for (line, _), record in zip(batch, prepared):
+            if isinstance(record, Exception):
+                fail(line, str(record))
+            elif record[entity.key] in seen_keys:
+                fail(line, f"Duplicate {entity.key} {record[entity.key]} earlier in the file", duplicate=True)
+            else:
+                seen_keys.add(record[entity.key])
+                to_copy.append((line, record))
+        if not to_copy:
+            return
+        inserted, rejected = await _copy_rows(entity, to_copy)
+        for line, record in to_copy:
+            if line in rejected:
+                fail(line, rejected[line])
+            elif record[entity.key] in inserted:
+                report["inserted"] += 1
+            else:
+                fail(line, f"Already exists (a unique column such as {entity.key} matches an existing row)", duplicate=True)
+        if entity.after_batch:
+            entity.after_batch()
+        if on_progress:
+            on_progress(finish())
+
+    rows = iter_source_rows(lines, fmt)
+    while True:
+        read, failures, batch, at_end = await asyncio.to_thread(_read_batch, rows, entity.row_model)
+        report["rows_read"] += read
+        for line, message in failures:
+            fail(line, message)
+        if batch:
+            await flush(batch)
+        if at_end:
+            return finish()
@@ -0,0 +1,96 @@
+# backend/app/core/case_fields.py
+
+import json
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+
+from .database import database, cases, clients
+
+CASE_NAME_MAX_LENGTH = 50
+# Widths of the cases.case_type and cases.client_name columns; intake values come from an LLM.
+CASE_TYPE_MAX_LENGTH = 100
+CLIENT_NAME_MAX_LENGTH = 255
+
+
+def parse_intake(value: Any) -> Dict[str, Any]:
+    """structured_intake as a dict, whatever form it was stored in."""
+    # Up to two decodes: older rows hold a JSON-encoded string inside the JSON column.
+    for _ in range(2):
+        if not isinstance(value, str):
+            break
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+def compute_case_fields(structured_intake: Any, client_record_name: Optional[str] = None) -> Dict[str, str]:
+    """
+    The case list columns (case_name, client_name, case_type), derived from
+    the intake and the matching client record. Stored on the case when it is
+    written so that listing cases needs no JSON parsing or join; a renamed
+    client's cases are updated by a trigger (migration 0012).
+    """
+    intake = parse_intake(structured_intake)
+    case_name = str(intake.get("summary_of_facts") or "N/A")
+    if len(case_name) > CASE_NAME_MAX_LENGTH:
+        case_name = case_name[:CASE_NAME_MAX_LENGTH] + "..."
+    client_name = client_record_name or intake.get("client_name") or "Unknown Client"
+    case_type = intake.get("case_type") or "N/A"
+    return {
+        "case_name": case_name,
+        "client_name": str(client_name)[:CLIENT_NAME_MAX_LENGTH],
+        "case_type": str(case_type)[:CASE_TYPE_MAX_LENGTH],
+    }
+
+
+async def resolve_client(phone_number: Optional[str]) -> Dict[str, Any]:
+    """
+    The client a new case belongs to, matched by caller phone number.
+    Returns the client's id (stored as cases.client_id) and name.
+    """
+    record = None
+    if phone_number:
+        record = await database.fetch_one(
+            select(clients.c.id, clients.c.name).where(clients.c.phone_number == phone_number)
+        )
+    return {"client_id": record["id"] if record else None, "client_record_name": record["name"] if record else None}
+
+
+async def case_link_fields(structured_intake: Any, phone_number: Optional[str]) -> Dict[str, Any]:
+    """client_id and list columns for a case about to be inserted."""
+    client = await resolve_client(phone_number)
+    return {"client_id": client["client_id"], **compute_case_fields(structured_intake, client["client_record_name"])}
+
+
+async def backfill_case_fields(only_missing: bool = True, batch_size: int = 500) -> int:
+    """
+    Recomputes the stored list columns for existing cases, in id order and in
+    batches. With only_missing=False every case is recomputed (e.g. after the
+    derivation changed). Returns the number of cases updated.
+    Used by `manage backfill-case-fields` only; migrations keep their own copy.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        query = (
+            select(cases.c.id, cases.c.structured_intake, clients.c.name.label("client_record_name"))
+            .select_from(cases.outerjoin(clients, cases.c.client_id == clients.c.id))
+            .where(cases.c.id > last_id)
+            .order_by(cases.c.id)
+            .limit(batch_size)
+        )
+        if only_missing:
+            query = query.where(cases.c.case_type.is_(None))
+        rows = await database.fetch_all(query)
+        if not rows:
+            break
+        await database.execute_many(
+            "UPDATE cases SET case_name = :case_name, client_name = :client_name, case_type = :case_type WHERE id = :id",
+            [{"id": row["id"], **compute_case_fields(row["structured_intake"], row["client_record_name"])} for row in rows],
+        )
+        updated += len(rows)
+        last_id = rows[-1]["id"]
+    return updated
@@ -0,0 +1,71 @@
+# backend/app/core/case_notes.py
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, tuple_
+
+from .database import database, cases, case_notes, transcripts
+from .pagination import decode_cursor, encode_cursor
+from .transcripts import store_transcript
+
+# Appends a note and bumps the case's last_updated_at in one statement.
+# Nothing is read back, so the cost is constant however long the call history
+# is, and concurrent calls for the same case cannot overwrite each other.
+_ADD_NOTE_SQL = """
+WITH note AS (
+    INSERT INTO case_notes (case_id, vapi_call_id, summary, transcript_id, created_at)
+    VALUES (:case_id, :vapi_call_id, :summary, :transcript_id, now())
+    RETURNING id, case_id
+)
+UPDATE cases SET last_updated_at = now()
+FROM note
+WHERE cases.id = note.case_id
+RETURNING note.id
+"""
+
+
+async def add_case_note(case_db_id: int, vapi_call_id: Optional[str], summary: str, transcript: str) -> int:
+    """Adds one follow-up call note to a case and returns the note id."""
+    # Stored first: a retried job finds the same transcript instead of adding a copy.
+    transcript_id = await store_transcript(transcript)
+    return await database.fetch_val(_ADD_NOTE_SQL, values={
+        "case_id": case_db_id,
+        "vapi_call_id": vapi_call_id,
+        "summary": summary,
+        "transcript_id": transcript_id,
+    })
+
+
+async def fetch_case_notes(case_id: str, limit: int = 20, cursor: Optional[str] = None,
+                           include_transcripts: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Returns one page of notes for a case (by its public case_id), newest first.
+    Returns None if the case does not exist.
+    """
+    case_db_id = await database.fetch_val(select(cases.c.id).where(cases.c.case_id == case_id))
+    if case_db_id is None:
+        return None
+
+    columns = [case_notes.c.id, case_notes.c.vapi_call_id, case_notes.c.summary, case_notes.c.created_at]
+    source = case_notes
+    if include_transcripts:
+        columns.append(transcripts.c.body.label("transcript"))
+        source = case_notes.outerjoin(transcripts, transcripts.c.id == case_notes.c.transcript_id)
+
+    query = (
+        select(*columns)
+        .select_from(source)
+        .where(case_notes.c.case_id == case_db_id)
+        .order_by(case_notes.c.created_at.desc(), case_notes.c.id.desc())
+        .limit(limit + 1)
+    )
+    after = decode_cursor(cursor, 2)
+    if after:
+        query = query.where(tuple_(case_notes.c.created_at, case_notes.c.id) < tuple_(*after))
+
+    rows = [dict(row) for row in await database.fetch_all(query)]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return {"items": rows, "next_cursor": next_cursor}
@@ -0,0 +1,116 @@
+# backend/app/core/case_queries.py
+
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func, or_, select, tuple_
+
+from .case_fields import compute_case_fields, parse_intake
+from .database import database, cases, transcripts
+from .pagination import decode_cursor, encode_cursor
+
+# Fields the case list can return (?fields=). Transcripts are detail-only,
+# see get_case_detail().
+LIST_FIELDS = {
+    "id": cases.c.id,
+    "case_id": cases.c.case_id,
+    # Stored at write time by case_fields.compute_case_fields()
+    "case_name": func.coalesce(cases.c.case_name, "N/A"),
+    "client_name": func.coalesce(cases.c.client_name, "Unknown Client"),
+    "type": func.coalesce(cases.c.case_type, "N/A"),
+    "status": cases.c.status,
+    "assigned_to": cases.c.assigned_to,
+    "last_updated": cases.c.last_updated_at,
+    "created_at": cases.c.created_at,
+    "caller_phone_number": cases.c.caller_phone_number,
+    "vapi_call_id": cases.c.vapi_call_id,
+    "call_summary": cases.c.call_summary,
+    "structured_intake": cases.c.structured_intake,
+}
+
+DEFAULT_LIST_FIELDS = [
+    "id", "case_id", "case_name", "client_name", "type", "status",
+    "assigned_to", "last_updated", "created_at",
+]
+
+MAX_PAGE_SIZE = 200
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return DEFAULT_LIST_FIELDS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in LIST_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+    return requested
+
+
+async def list_cases(limit: int = 50, cursor: Optional[str] = None, fields: Optional[str] = None,
+                     status: Optional[str] = None, assigned_to: Optional[str] = None,
+                     unassigned: bool = False, case_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One page of cases, most recently updated first, keyset-paginated on
+    (last_updated_at, id). Only the requested columns are selected; there is
+    no join and no JSON parsing unless structured_intake itself is requested.
+    """
+    requested = parse_fields(fields)
+
+    columns = [cases.c.id, cases.c.last_updated_at] # Always needed for the cursor
+    columns += [LIST_FIELDS[f].label(f) for f in requested if f not in ("id", "last_updated")]
+
+    query = (
+        select(*columns)
+        .order_by(cases.c.last_updated_at.desc(), cases.c.id.desc())
+        .limit(limit + 1)
+    )
+    after = decode_cursor(cursor, 2)
+    if after:
+        query = query.where(tuple_(cases.c.last_updated_at, cases.c.id) < tuple_(*after))
+    if status:
+        query = query.where(cases.c.status == status)
+    if assigned_to:
+        query = query.where(cases.c.assigned_to == assigned_to)
+    if unassigned:
+        query = query.where(or_(cases.c.assigned_to.is_(None), cases.c.assigned_to == "Unassigned"))
+    if case_type:
+        query = query.where(cases.c.case_type == case_type)
+
+    rows = await database.fetch_all(query)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = []
+    for row in rows:
+        record = dict(row)
+        if "structured_intake" in requested:
+            record["structured_intake"] = parse_intake(record["structured_intake"])
+        record["last_updated"] = record["last_updated_at"]
+        items.append({f: record.get(f) for f in requested})
+
+    next_cursor = encode_cursor(rows[-1]["last_updated_at"], rows[-1]["id"]) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def get_case_detail(case_id: str) -> Optional[Dict[str, Any]]:
+    """Everything about one case (by its public case_id), including the first call's transcript."""
+    query = (
+        select(
+            cases.c.id, cases.c.case_id, cases.c.caller_phone_number, cases.c.status,
+            cases.c.structured_intake, cases.c.call_summary, transcripts.c.body.label("full_transcript"),
+            cases.c.created_at, cases.c.vapi_call_id, cases.c.assigned_to, cases.c.last_updated_at,
+            cases.c.case_name, cases.c.client_name, cases.c.case_type,
+        )
+        .select_from(cases.outerjoin(transcripts, transcripts.c.id == cases.c.transcript_id))
+        .where(cases.c.case_id == case_id)
+    )
+    row = await database.fetch_one(query)
+    if row is None:
+        return None
+    record = dict(row)
+    intake = parse_intake(record.pop("structured_intake"))
+    if record["case_type"] is None: # Not backfilled yet
+        record.update(compute_case_fields(intake))
+    record["type"] = record.pop("case_type")
+    record["structured_intake"] = intake
+    return record
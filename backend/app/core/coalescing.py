@@ -0,0 +1,82 @@
+# backend/app/core/coalescing.py
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .metrics import register_metrics_source
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls into one in-flight execution.
+
+    The first caller for a key starts the work as a task; every caller that
+    arrives with the same key while it is still running awaits that same task.
+    Once it finishes the key is forgotten, so later calls run fresh (this is
+    request coalescing, not a cache).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+        self.failures = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.collapsed += 1
+            print(f"--- [{self.name}] Joining in-flight call for key {str(key)[:40]} ---")
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        # shield() so that one caller giving up (e.g. a client disconnect)
+        # does not cancel the shared work for everyone else waiting on it.
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every waiter went away.
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "failures": self.failures,
+            "in_flight": len(self._inflight),
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Returns the named coalescing group, creating it on first use."""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def text_key(text: str) -> str:
+    """
+    Builds a compact coalescing key for free text. Whitespace and case are
+    normalised so trivially different spellings of the same question collapse.
+    """
+    normalised = " ".join(text.split()).casefold()
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+
+register_metrics_source(
+    "coalescing",
+    lambda: {name: group.snapshot() for name, group in _groups.items()},
+)
@@ -0,0 +1,71 @@
+# backend/app/core/conditional_get.py
+
+import hashlib
+import time
+from typing import Optional, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import select
+
+from .database import database, table_versions
+from .metrics import register_metrics_source
+
+# Browsers may keep the response but must revalidate it on every use; it is
+# per-user data, so shared caches must not store it.
+CACHE_CONTROL = "private, no-cache"
+
+_stats = {"checked": 0, "not_modified": 0}
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match.
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+async def conditional_get(request: Request, response: Response, tables: Sequence[str],
+                          clock_seconds: Optional[int] = None) -> Optional[Response]:
+    """
+    Validators for a read endpoint whose result depends only on `tables`
+    (plus the path and query string). Sets ETag and Cache-Control on
+    `response` and returns a 304 response when the client's copy is still
+    current, so the endpoint skips its queries entirely:
+
+        not_modified = await conditional_get(request, response, ["cases"])
+        if not_modified:
+            return not_modified
+
+    clock_seconds: for results that also depend on the current time (e.g.
+    "upcoming" deadlines), the ETag changes at least this often.
+
+    There is no Last-Modified: table_versions.changed_at is the writer's
+    transaction start time, which can be earlier than a change that became
+    visible after the client's last fetch, so If-Modified-Since could answer
+    304 for stale data. Browsers revalidate with If-None-Match instead.
+    """
+    # Read the versions before the endpoint reads its data: a write landing in
+    # between pairs newer data with the older ETag, which only costs the next
+    # request a full response. The other order could pin stale data.
+    rows = await database.fetch_all(
+        select(table_versions.c.table_name, table_versions.c.version)
+        .where(table_versions.c.table_name.in_(sorted(tables)))
+    )
+    by_table = {row["table_name"]: row for row in rows}
+    parts = [request.url.path, str(request.query_params)]
+    parts += [f"{table}:{by_table[table]['version'] if table in by_table else 0}" for table in sorted(tables)]
+    if clock_seconds:
+        parts.append(f"clock:{int(time.time() // clock_seconds)}")
+    etag = f'W/"{hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]}"'
+
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    response.headers.update(headers)
+    _stats["checked"] += 1
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        _stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+register_metrics_source("conditional_get", lambda: dict(_stats))
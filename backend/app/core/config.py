@@ -2,9 +2,12 @@
 import os
 
 # --- PROVIDER CONFIGURATION ---
-# Choose your providers: "ollama" or "google"
-LLM_PROVIDER = "google"
-EMBEDDING_PROVIDER = "google" # <-- NEW: Set this to "google"
+# Choose your providers: "ollama", "google" or "fake"
+# ("fake" = deterministic offline stand-ins for load testing, see fakes.py)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "google")
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "google")
+WEB_SEARCH_PROVIDER = os.getenv("WEB_SEARCH_PROVIDER", "tavily") # "tavily" or "fake"
+STT_PROVIDER = os.getenv("STT_PROVIDER", "whisper") # "whisper", "faster-whisper" or "fake"
 
 # --- MODEL CONFIGURATION (Provider-specific) ---
 # Models for Google
@@ -15,14 +18,116 @@ GOOGLE_EMBEDDING_MODEL = "models/embedding-001" # The standard Google embedding
 OLLAMA_LLM_MODEL = "llama3:8b"
 OLLAMA_EMBEDDING_MODEL = "nomic-embed-text"
 
+# Models for speech-to-text
+WHISPER_MODEL = "small.en"
+# faster-whisper (CTranslate2) only: weight precision ("int8", "int8_float32", "float32")
+# and beam size (1 = greedy, as openai-whisper decodes by default)
+FASTER_WHISPER_COMPUTE_TYPE = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "int8")
+FASTER_WHISPER_BEAM_SIZE = int(os.getenv("FASTER_WHISPER_BEAM_SIZE", "1"))
+
+# Fake providers (no network, no model downloads)
+FAKE_LLM_LATENCY_SECONDS = float(os.getenv("FAKE_LLM_LATENCY_SECONDS", "0.0"))
+FAKE_LLM_SCRIPT_PATH = os.getenv("FAKE_LLM_SCRIPT_PATH") # Optional JSON file of scripted responses, see fakes.py
+FAKE_EMBEDDING_SIZE = int(os.getenv("FAKE_EMBEDDING_SIZE", "768"))
+FAKE_WEB_SEARCH_LATENCY_SECONDS = float(os.getenv("FAKE_WEB_SEARCH_LATENCY_SECONDS", "0.0"))
+FAKE_STT_LATENCY_SECONDS = float(os.getenv("FAKE_STT_LATENCY_SECONDS", "0.0"))
+
 # --- ACTIVE EMBEDDING MODEL ---
 # This section sets the active embedding model based on the provider chosen above.
 # The rest of our application will only use this generic variable.
 if EMBEDDING_PROVIDER == "google":
     EMBEDDING_MODEL = GOOGLE_EMBEDDING_MODEL
+elif EMBEDDING_PROVIDER == "fake":
+    EMBEDDING_MODEL = "fake-hash-embedding"
 else:
     EMBEDDING_MODEL = OLLAMA_EMBEDDING_MODEL
 
 # --- VECTOR STORE & DATA CONFIGURATION ---
-CHROMA_PERSIST_DIR = "chroma_db"
-SOURCE_DATA_DIR = "data"
\ No newline at end of file
+# Fake embeddings get their own store so they never mix with real vectors.
+CHROMA_PERSIST_DIR = "chroma_db_fake" if EMBEDDING_PROVIDER == "fake" else "chroma_db"
+SOURCE_DATA_DIR = "data"
+
+# --- LLM SCHEDULER ---
+# Every LLM call goes through a central scheduler (see llm_scheduler.py).
+# Priority classes, highest first: live voice turns, interactive UI, background work.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8")) # Total in-flight LLM calls per process
+LLM_CLASS_CONCURRENCY = {
+    "realtime": int(os.getenv("LLM_REALTIME_CONCURRENCY", "8")),
+    "interactive": int(os.getenv("LLM_INTERACTIVE_CONCURRENCY", "4")),
+    "background": int(os.getenv("LLM_BACKGROUND_CONCURRENCY", "2")),
+}
+LLM_MAX_QUEUE_DEPTH = {
+    "realtime": int(os.getenv("LLM_REALTIME_MAX_QUEUE", "50")),
+    "interactive": int(os.getenv("LLM_INTERACTIVE_MAX_QUEUE", "50")),
+    "background": int(os.getenv("LLM_BACKGROUND_MAX_QUEUE", "200")),
+}
+# Background calls are rejected outright once this many realtime calls are waiting.
+LLM_SHED_BACKGROUND_AT_REALTIME_QUEUE = int(os.getenv("LLM_SHED_BACKGROUND_AT_REALTIME_QUEUE", "4"))
+
+# --- VOICE TURN DEADLINES ---
+# Vapi expects a reply within a few seconds, so each conversation-update turn gets a time budget.
+VOICE_TURN_DEADLINE_SECONDS = float(os.getenv("VOICE_TURN_DEADLINE_SECONDS", "4.0"))
+VOICE_TURN_REPLY_RESERVE_SECONDS = float(os.getenv("VOICE_TURN_REPLY_RESERVE_SECONDS", "0.3")) # Kept back for serialising the reply
+VOICE_TOOL_ESTIMATE_SECONDS = float(os.getenv("VOICE_TOOL_ESTIMATE_SECONDS", "2.0")) # Assumed tool duration until we have measurements
+VOICE_HOLDING_RESPONSE = os.getenv("VOICE_HOLDING_RESPONSE", "Let me look into that for you. Give me just a moment.")
+VOICE_PENDING_TURN_TTL_SECONDS = float(os.getenv("VOICE_PENDING_TURN_TTL_SECONDS", "300"))
+
+# --- BACKGROUND JOB QUEUE ---
+# End-of-call processing runs from a Postgres-backed queue (see job_queue.py).
+RUN_JOB_WORKERS_IN_PROCESS = os.getenv("RUN_JOB_WORKERS_IN_PROCESS", "true").lower() == "true" # Set to false when running `python -m backend.app.worker` separately
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "2.0"))
+JOB_VISIBILITY_TIMEOUT_SECONDS = int(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "120"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "300"))
+
+# --- LONG TRANSCRIPT SUMMARISATION ---
+# Transcripts above the threshold are summarised / extracted map-reduce style:
+# split into chunks of whole turns, processed in parallel, then merged.
+SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS = int(os.getenv("SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS", "6000"))
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+SUMMARY_MAX_PARALLEL_CHUNKS = int(os.getenv("SUMMARY_MAX_PARALLEL_CHUNKS", "4"))
+
+# --- DATABASE CONNECTION POOL ---
+# Per process. Total connections = processes x DB_POOL_MAX_SIZE, keep it below Postgres max_connections.
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000")) # 0 disables; migrations always run without it
+DB_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("DB_ACQUIRE_TIMEOUT_SECONDS", "5.0")) # Wait for a free connection before failing with 503
+
+# --- DASHBOARD ---
+# /api/dashboard is cached in-process for this long; writes through the API invalidate it early.
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "5")) # 0 disables the cache
+
+# --- UI PUSH EVENTS (SSE, see events.py) ---
+EVENTS_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENTS_SUBSCRIBER_QUEUE_SIZE", "256")) # A client further behind is disconnected and resumes from Last-Event-ID
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_CLIENT_RETRY_MS = int(os.getenv("EVENTS_CLIENT_RETRY_MS", "3000")) # Browser reconnect delay
+EVENTS_REPLAY_LIMIT = int(os.getenv("EVENTS_REPLAY_LIMIT", "1000")) # More missed events than this: the client reloads instead
+EVENTS_RETENTION_HOURS = int(os.getenv("EVENTS_RETENTION_HOURS", "24"))
+EVENTS_GAP_TIMEOUT_SECONDS = float(os.getenv("EVENTS_GAP_TIMEOUT_SECONDS", "300")) # An event id still missing after this long is taken as rolled back
+
+# --- BULK IMPORT (see bulk_import.py) ---
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000")) # Rows per COPY
+BULK_IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("BULK_IMPORT_MAX_REPORTED_ERRORS", "1000")) # Per import; further errors are only counted
+
+# --- SPEECH-TO-TEXT WORKER POOL (see transcription_pool.py) ---
+# Transcription runs in dedicated worker processes, each holding its own model.
+# Per API process: with several uvicorn workers, each gets its own pool.
+TRANSCRIPTION_CORES_PER_WORKER = int(os.getenv("TRANSCRIPTION_CORES_PER_WORKER", "4")) # Threads each worker's model may use
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "0")) or max(1, (os.cpu_count() or 1) // TRANSCRIPTION_CORES_PER_WORKER)
+TRANSCRIPTION_MAX_QUEUE = int(os.getenv("TRANSCRIPTION_MAX_QUEUE", "8")) # Jobs waiting for a worker; more are rejected with 503
+TRANSCRIPTION_TIMEOUT_SECONDS = float(os.getenv("TRANSCRIPTION_TIMEOUT_SECONDS", "300")) # Per job, once running; the worker is restarted
+
+# --- LONG RECORDINGS (see long_audio.py) ---
+# Recordings at least this long are cut at silences and transcribed in parallel chunks.
+LONG_AUDIO_THRESHOLD_SECONDS = float(os.getenv("LONG_AUDIO_THRESHOLD_SECONDS", "600"))
+LONG_AUDIO_CHUNK_SECONDS = float(os.getenv("LONG_AUDIO_CHUNK_SECONDS", "180")) # Target chunk length; cuts move to the nearest silence
+
+# --- TRANSCRIPTION CACHE (see transcription_cache.py) ---
+TRANSCRIPTION_CACHE_TTL_DAYS = int(os.getenv("TRANSCRIPTION_CACHE_TTL_DAYS", "30")) # Unread entries are deleted after this; 0 disables the cache
+
+# --- TRANSCRIPTION JOBS (see transcription_jobs.py) ---
+TRANSCRIPTION_JOB_CHUNK_SECONDS = float(os.getenv("TRANSCRIPTION_JOB_CHUNK_SECONDS", "30")) # Short chunks: the first partial transcript arrives sooner
+TRANSCRIPTION_JOB_RETENTION_SECONDS = float(os.getenv("TRANSCRIPTION_JOB_RETENTION_SECONDS", "600")) # Finished jobs can be streamed again for this long
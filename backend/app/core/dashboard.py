@@ -0,0 +1,189 @@
+# backend/app/core/dashboard.py
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from . import config
+from .coalescing import get_single_flight
+from .database import database, activities, contracts, notifications, tasks
+from .metrics import register_metrics_source
+
+# Tables each dashboard endpoint reads, for conditional GETs (conditional_get.py).
+# The deadline queries compare against the current time, so those results
+# also change with the clock: DASHBOARD_CLOCK_SECONDS bounds how long a
+# validator stays valid without a write.
+OVERVIEW_TABLES = ["contracts", "tasks", "notifications"]
+RECENT_ACTIVITY_TABLES = ["activities"]
+UPCOMING_DEADLINES_TABLES = ["tasks"]
+NOTIFICATIONS_TABLES = ["notifications"]
+DASHBOARD_TABLES = ["contracts", "tasks", "notifications", "activities"]
+DASHBOARD_CLOCK_SECONDS = 60
+
+OPEN_TASK_STATUSES = ["Pending", "In Progress"]
+DASHBOARD_LIST_LIMIT = 5
+
+
+def _counts_query(now: datetime):
+    # One statement, one round trip. Each count is a scalar subquery with its
+    # own WHERE so it can still use its index (ix_contracts_status,
+    # ix_tasks_status_due_date, ix_notifications_is_read_created_at).
+    active_contracts = (
+        select(func.count()).select_from(contracts)
+        .where(contracts.c.status == "Active")
+        .scalar_subquery()
+    )
+    upcoming_deadlines = (
+        select(func.count()).select_from(tasks)
+        .where((tasks.c.due_date >= now) & (tasks.c.status.in_(OPEN_TASK_STATUSES)))
+        .scalar_subquery()
+    )
+    new_notifications = (
+        select(func.count()).select_from(notifications)
+        .where(notifications.c.is_read == False)
+        .scalar_subquery()
+    )
+    return select(
+        active_contracts.label("active_contracts"),
+        upcoming_deadlines.label("upcoming_deadlines"),
+        new_notifications.label("new_notifications"),
+    )
+
+
+async def fetch_overview_counts() -> Dict[str, int]:
+    row = await database.fetch_one(_counts_query(datetime.utcnow()))
+    return {key: row[key] or 0 for key in ("active_contracts", "upcoming_deadlines", "new_notifications")}
+
+
+async def fetch_recent_activity(limit: int = DASHBOARD_LIST_LIMIT) -> List[Dict[str, Any]]:
+    query = select(activities).order_by(activities.c.performed_at.desc()).limit(limit)
+    return [dict(record) for record in await database.fetch_all(query)]
+
+
+async def fetch_upcoming_deadlines(limit: int = DASHBOARD_LIST_LIMIT) -> List[Dict[str, Any]]:
+    query = (
+        select(tasks)
+        .where((tasks.c.due_date >= datetime.utcnow()) & (tasks.c.status.in_(OPEN_TASK_STATUSES)))
+        .order_by(tasks.c.due_date.asc())
+        .limit(limit)
+    )
+    return [dict(record) for record in await database.fetch_all(query)]
+
+
+async def fetch_unread_notifications(limit: int = DASHBOARD_LIST_LIMIT) -> List[Dict[str, Any]]:
+    query = (
+        select(notifications)
+        .where(notifications.c.is_read == False)
+        .order_by(notifications.c.created_at.desc())
+        .limit(limit)
+    )
+    return [dict(record) for record in await database.fetch_all(query)]
+
+
+async def build_dashboard() -> Dict[str, Any]:
+    """
+    Everything the dashboard page shows. The four queries run concurrently,
+    each on its own pooled connection.
+    """
+    overview, recent_activity, upcoming_deadlines, unread_notifications = await asyncio.gather(
+        fetch_overview_counts(),
+        fetch_recent_activity(),
+        fetch_upcoming_deadlines(),
+        fetch_unread_notifications(),
+    )
+    return {
+        "overview": overview,
+        "recent_activity": recent_activity,
+        "upcoming_deadlines": upcoming_deadlines,
+        "notifications": unread_notifications,
+    }
+
+
+class _DashboardCache:
+    """
+    The last dashboard payload, kept for DASHBOARD_CACHE_TTL_SECONDS.
+
+    Writers to the tables the dashboard reads call invalidate_dashboard().
+    Each invalidation bumps a generation counter; a rebuild that started
+    before an invalidation is returned to its callers but not stored, so a
+    stale payload can never outlive the write that made it stale.
+    Callers may also pass a version (the table-version ETag): a payload
+    stored under another version is a miss, which also catches writes made
+    by other processes.
+    """
+
+    def __init__(self):
+        self.value: Optional[Dict[str, Any]] = None
+        self.version: Optional[str] = None
+        self.expires_at = 0.0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        if self.value is not None and time.monotonic() < self.expires_at and (version is None or version == self.version):
+            self.hits += 1
+            return self.value
+        self.misses += 1
+        return None
+
+    def store(self, value: Dict[str, Any], generation: int, version: Optional[str]) -> None:
+        if generation == self.generation and config.DASHBOARD_CACHE_TTL_SECONDS > 0:
+            self.value = value
+            self.version = version
+            self.expires_at = time.monotonic() + config.DASHBOARD_CACHE_TTL_SECONDS
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self.invalidations += 1
+        self.value = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "ttl_seconds": config.DASHBOARD_CACHE_TTL_SECONDS,
+            "cached": self.value is not None and time.monotonic() < self.expires_at,
+        }
+
+
+_cache = _DashboardCache()
+
+
+async def get_dashboard(version: Optional[str] = None,
+                        events_cursor: Optional[Callable[[], str]] = None) -> Dict[str, Any]:
+    """
+    The dashboard payload, from cache when fresh (and built under `version`,
+    if given); concurrent misses share one rebuild.
+    events_cursor: returns the push event position (events.EventHub.cursor());
+    it is read before the data, so the page can subscribe from there without
+    missing anything committed in between (it may see some of it twice).
+    """
+    cached = _cache.get(version)
+    if cached is not None:
+        return cached
+
+    generation = _cache.generation
+
+    async def rebuild() -> Dict[str, Any]:
+        cursor = events_cursor() if events_cursor else None
+        value = {**await build_dashboard(), "events_cursor": cursor}
+        _cache.store(value, generation, version)
+        return value
+
+    # Keyed by generation: callers arriving after an invalidation start a new
+    # rebuild instead of joining one that may have read pre-write data.
+    return await get_single_flight("dashboard").do((generation, version), rebuild)
+
+
+def invalidate_dashboard() -> None:
+    """Call after writing to contracts, tasks, notifications or activities."""
+    _cache.invalidate()
+
+
+register_metrics_source("dashboard_cache", _cache.snapshot)
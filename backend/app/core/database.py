@@ -1,27 +1,31 @@
 # backend/app/core/database.py
 import os
 from sqlalchemy import (
-    create_engine,
     MetaData,
     Table,
     Column,
     Integer,
+    Float,
+    BigInteger,
     String,
     Text,
     DateTime,
     JSON,
     Boolean,
-    ForeignKey # No change here, correct
+    LargeBinary,
+    ForeignKey, # No change here, correct
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.sql import func
 from databases import Database
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from . import config
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Ensure the engine uses the correct driver for databases library (asyncpg)
-# databases library handles the connection string parsing for the driver.
-engine = create_engine(DATABASE_URL)
+# Table definitions are used to build queries. The schema itself is created and
+# changed by migrations (backend/app/migrations), applied at startup.
 metadata = MetaData()
 
 
@@ -35,12 +39,60 @@ cases = Table(
     Column("status", String(50), default="Pending Review"),
     Column("structured_intake", JSON),
     Column("call_summary", Text),
-    Column("full_transcript", Text),
-    Column("follow_up_notes", JSONB),
+    Column("transcript_id", BigInteger, ForeignKey("transcripts.id"), nullable=True), # First call's transcript, see transcripts.py
+    Column("follow_up_notes", JSONB), # Legacy: notes now live in case_notes, see case_notes.py
     Column("created_at", DateTime, default=func.now(), nullable=False),
     Column("vapi_call_id", String(100), nullable=True),
     Column("assigned_to", String(255), nullable=True), # NEW: Added assigned_to
     Column("last_updated_at", DateTime, default=func.now(), onupdate=func.now(), nullable=False), # NEW: Added last_updated_at
+    # List columns, computed at write time from structured_intake (see case_fields.py)
+    Column("case_name", String(100), nullable=True),
+    Column("client_name", String(255), nullable=True),
+    Column("case_type", String(100), nullable=True),
+    Column("client_id", Integer, ForeignKey("clients.id", ondelete="SET NULL"), nullable=True), # Resolved at creation; drives clients.num_cases
+    Column("search_vector", TSVECTOR, nullable=True), # Maintained by a trigger (migration 0008), see search.py
+    # Indexes are created by migrations (see backend/app/migrations); declared here to keep the model complete.
+    Index("ix_cases_caller_phone_number_created_at", "caller_phone_number", "created_at"),
+    Index("uq_cases_vapi_call_id", "vapi_call_id", unique=True),
+    Index("ix_cases_last_updated_at_id", "last_updated_at", "id"), # DESC, DESC in the migration
+    Index("ix_cases_case_type_last_updated_at_id", "case_type", "last_updated_at", "id"),
+    Index("ix_cases_status_last_updated_at_id", "status", "last_updated_at", "id"),
+    Index("ix_cases_client_name", "client_name"),
+    Index("ix_cases_client_id", "client_id"),
+    Index("ix_cases_transcript_id", "transcript_id"),
+    Index("ix_cases_search_vector", "search_vector", postgresql_using="gin"),
+)
+
+# --- NEW TABLE: case_notes (one row per follow-up call; replaces the cases.follow_up_notes array) ---
+case_notes = Table(
+    "case_notes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("case_id", Integer, ForeignKey("cases.id", ondelete="CASCADE"), nullable=False), # Link to cases
+    Column("vapi_call_id", String(100), nullable=True),
+    Column("summary", Text, nullable=True),
+    Column("transcript_id", BigInteger, ForeignKey("transcripts.id"), nullable=True), # See transcripts.py
+    Column("created_at", DateTime, default=func.now(), nullable=False),
+    Column("search_vector", TSVECTOR, nullable=True), # Maintained by a trigger (migration 0008), see search.py
+    Index("ix_case_notes_case_id_created_at", "case_id", "created_at"),
+    Index("ix_case_notes_created_at", "created_at"),
+    Index("ix_case_notes_vapi_call_id", "vapi_call_id"),
+    Index("ix_case_notes_search_vector", "search_vector", postgresql_using="gin"),
+    Index("ix_case_notes_transcript_id", "transcript_id"),
+)
+
+# --- NEW TABLE: transcripts (content-addressed call transcripts, see transcripts.py) ---
+# Referenced by cases.transcript_id and case_notes.transcript_id (migration 0010).
+# body is lz4-compressed by Postgres; identical transcripts are stored once.
+transcripts = Table(
+    "transcripts",
+    metadata,
+    Column("id", BigInteger, primary_key=True),
+    Column("sha256", LargeBinary, nullable=False), # Of the UTF-8 body
+    Column("body", Text, nullable=False),
+    Column("raw_bytes", Integer, nullable=False), # Uncompressed size
+    Column("created_at", DateTime, default=func.now(), nullable=False),
+    Index("uq_transcripts_sha256", "sha256", unique=True),
 )
 
 # --- NEW TABLE: indexed_rag_documents (existing) ---
@@ -68,7 +120,8 @@ clients = Table(
     Column("status", String(50), default="Active"), # Active, Inactive, etc.
     Column("last_activity_at", DateTime, default=func.now(), nullable=False),
     Column("created_at", DateTime, default=func.now(), nullable=False),
-    Column("notes", Text, nullable=True)
+    Column("notes", Text, nullable=True),
+    Column("num_cases", Integer, default=0, nullable=False), # Maintained by a trigger on cases (migration 0006)
 )
 
 # --- NEW TABLE: contracts ---
@@ -85,7 +138,8 @@ contracts = Table(
     Column("signed_date", DateTime, nullable=True),
     Column("expiration_date", DateTime, nullable=True),
     Column("last_reviewed_at", DateTime, nullable=True),
-    Column("created_at", DateTime, default=func.now(), nullable=False)
+    Column("created_at", DateTime, default=func.now(), nullable=False),
+    Index("ix_contracts_status", "status"),
 )
 
 # --- NEW TABLE: activities ---
@@ -97,7 +151,8 @@ activities = Table(
     Column("activity_type", String(50), nullable=False), # e.g., "Contract Review", "Legal Research", "Case Management"
     Column("related_id", Integer, nullable=True), # Optional: ID of related contract/case/document
     Column("related_type", String(50), nullable=True), # Optional: "contract", "case", "document"
-    Column("performed_at", DateTime, default=func.now(), nullable=False)
+    Column("performed_at", DateTime, default=func.now(), nullable=False),
+    Index("ix_activities_performed_at", "performed_at"),
 )
 
 # --- NEW TABLE: tasks (for deadlines and general tasks) ---
@@ -116,7 +171,8 @@ tasks = Table(
     Column("assigned_to", String(255), nullable=True), # e.g., "Alex", "Sarah Johnson"
     Column("related_case_id", Integer, ForeignKey("cases.id"), nullable=True), # Link to cases
     Column("created_at", DateTime, default=func.now(), nullable=False),
-    Column("completed_at", DateTime, nullable=True)
+    Column("completed_at", DateTime, nullable=True),
+    Index("ix_tasks_status_due_date", "status", "due_date"),
 )
 
 # --- NEW TABLE: notifications ---
@@ -128,22 +184,76 @@ notifications = Table(
     Column("notification_type", String(50), nullable=False), # e.g., "Contract Review", "Legal Research", "Case Status"
     Column("is_read", Boolean, default=False, nullable=False),
     Column("related_url", String(512), nullable=True), # URL to link to relevant item (e.g., case page)
-    Column("created_at", DateTime, default=func.now(), nullable=False)
+    Column("created_at", DateTime, default=func.now(), nullable=False),
+    Index("ix_notifications_is_read_created_at", "is_read", "created_at"),
 )
 
+# --- NEW TABLE: jobs (durable background work queue, see job_queue.py) ---
+jobs = Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("job_type", String(50), nullable=False), # e.g., "post_call"
+    Column("dedupe_key", String(255), nullable=True), # e.g., the vapi_call_id; NULL = no dedupe
+    Column("payload", JSONB, nullable=False),
+    Column("status", String(20), default="queued", nullable=False), # queued, running, succeeded, dead
+    Column("attempts", Integer, default=0, nullable=False),
+    Column("max_attempts", Integer, default=5, nullable=False),
+    Column("available_at", DateTime, default=func.now(), nullable=False), # Not claimable before this (retry backoff)
+    Column("locked_until", DateTime, nullable=True), # Visibility timeout of the current claim
+    Column("locked_by", String(100), nullable=True),
+    Column("last_error", Text, nullable=True),
+    Column("created_at", DateTime, default=func.now(), nullable=False),
+    Column("finished_at", DateTime, nullable=True),
+    UniqueConstraint("job_type", "dedupe_key", name="uq_jobs_job_type_dedupe_key"),
+    Index("ix_jobs_status_available_at", "status", "available_at"),
+)
+
+# --- NEW TABLE: app_events (change feed for the UI push channel, see events.py) ---
+# Rows are appended by triggers on notifications, activities and cases (migration 0007).
+app_events = Table(
+    "app_events",
+    metadata,
+    Column("id", BigInteger, primary_key=True),
+    Column("kind", String(50), nullable=False), # notification, activity, case_created, case_updated, cases_imported
+    Column("payload", JSONB, nullable=False),
+    Column("created_at", DateTime, default=func.now(), nullable=False),
+    Index("ix_app_events_created_at", "created_at"),
+)
+
+# --- NEW TABLE: table_versions (change counters for conditional GETs, see conditional_get.py) ---
+# Bumped by a statement-level trigger on each tracked table (migration 0009).
+table_versions = Table(
+    "table_versions",
+    metadata,
+    Column("table_name", String(63), primary_key=True),
+    Column("version", BigInteger, nullable=False),
+    Column("changed_at", DateTime, nullable=False), # UTC
+)
 
-database = Database(DATABASE_URL)
-
-def create_db_and_tables():
-    print("--- Creating database tables if they don't exist ---")
-    try:
-        # We need to drop existing tables and recreate them if you've changed
-        # `nullable` or `default` constraints on columns that already exist.
-        # This is a DESTRUCTIVE operation and will wipe your existing data.
-        # Use with CAUTION in development, and NEVER in production without a migration strategy.
-        # metadata.drop_all(engine) # Uncomment this if you want to wipe and recreate
-        metadata.create_all(engine)
-        print("--- Database tables created/checked successfully ---")
-    except Exception as e:
-        print(f"Error creating database tables: {e}")
-        # In a real app, you might want to log this more verbosely or exit
\ No newline at end of file
+# --- NEW TABLE: transcription_cache (earlier /transcribe-audio results, see transcription_cache.py) ---
+# Keyed by the uploaded audio's SHA-256, the engine and the mode (migration 0011).
+transcription_cache = Table(
+    "transcription_cache",
+    metadata,
+    Column("audio_sha256", LargeBinary, primary_key=True),
+    Column("engine", Text, primary_key=True), # e.g. "faster-whisper:small.en:int8"
+    Column("mode", Text, primary_key=True), # single, or chunked:<chunk seconds> (e.g. chunked:180)
+    Column("audio_seconds", Float, nullable=False),
+    Column("result", JSONB, nullable=False), # The response body
+    Column("hits", Integer, nullable=False, default=0),
+    Column("created_at", DateTime, default=func.now(), nullable=False),
+    Column("last_used_at", DateTime, default=func.now(), nullable=False),
+    Index("ix_transcription_cache_last_used_at", "last_used_at"),
+)
+
+
+# The databases library (asyncpg backend) passes these options to asyncpg.create_pool.
+# Size the pool per process: uvicorn workers x DB_POOL_MAX_SIZE (+ job workers)
+# must stay below Postgres' max_connections. See db_pool.py for the acquire timeout.
+database = Database(
+    DATABASE_URL,
+    min_size=config.DB_POOL_MIN_SIZE,
+    max_size=config.DB_POOL_MAX_SIZE,
+    server_settings={"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)},
+)
@@ -0,0 +1,106 @@
+# backend/app/core/db_pool.py
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from . import config
+from .database import database
+from .metrics import register_metrics_source
+
+
+class DatabasePoolTimeoutError(RuntimeError):
+    """No pooled connection became free within DB_ACQUIRE_TIMEOUT_SECONDS."""
+
+
+_stats = {
+    "acquired": 0,
+    "waiting": 0,
+    "max_waiting": 0,
+    "timeouts": 0,
+    "total_wait_seconds": 0.0,
+    "max_wait_seconds": 0.0,
+}
+
+
+def _pool():
+    # The asyncpg pool behind the databases library; None until connected.
+    return getattr(getattr(database, "_backend", None), "_pool", None)
+
+
+class _InstrumentedPool:
+    """
+    Stands in for the asyncpg pool inside the databases backend. The databases
+    library calls pool.acquire() without a timeout; this applies
+    DB_ACQUIRE_TIMEOUT_SECONDS and records how long requests wait for a
+    connection. Everything else is delegated to the real pool.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+    async def acquire(self, *, timeout: Optional[float] = None):
+        _stats["waiting"] += 1
+        _stats["max_waiting"] = max(_stats["max_waiting"], _stats["waiting"])
+        started = time.perf_counter()
+        try:
+            connection = await self._pool.acquire(timeout=timeout or config.DB_ACQUIRE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            _stats["timeouts"] += 1
+            raise DatabasePoolTimeoutError(
+                f"No database connection available within {config.DB_ACQUIRE_TIMEOUT_SECONDS}s "
+                f"(pool max size {config.DB_POOL_MAX_SIZE})"
+            )
+        finally:
+            _stats["waiting"] -= 1
+            waited = time.perf_counter() - started
+            _stats["total_wait_seconds"] += waited
+            _stats["max_wait_seconds"] = max(_stats["max_wait_seconds"], waited)
+        _stats["acquired"] += 1
+        return connection
+
+
+def instrument_pool() -> None:
+    """
+    Call once after database.connect(); see _InstrumentedPool. This swaps a
+    private attribute of the databases library (pinned in requirements.txt),
+    so anything other than the asyncpg pool it is written against stops
+    startup instead of silently running without the timeout.
+    """
+    pool = _pool()
+    if isinstance(pool, _InstrumentedPool):
+        return
+    if not isinstance(pool, asyncpg.pool.Pool):
+        raise RuntimeError(
+            f"Expected an asyncpg pool at database._backend._pool, found {type(pool).__name__}; "
+            f"check the installed databases version against requirements.txt"
+        )
+    database._backend._pool = _InstrumentedPool(pool)
+
+
+def pool_snapshot() -> Dict[str, Any]:
+    snapshot: Dict[str, Any] = {
+        **_stats,
+        "total_wait_seconds": round(_stats["total_wait_seconds"], 3),
+        "max_wait_seconds": round(_stats["max_wait_seconds"], 3),
+        "avg_wait_seconds": round(_stats["total_wait_seconds"] / _stats["acquired"], 4) if _stats["acquired"] else 0.0,
+        "min_size": config.DB_POOL_MIN_SIZE,
+        "max_size": config.DB_POOL_MAX_SIZE,
+    }
+    pool = _pool()
+    if pool is not None:
+        size, idle = pool.get_size(), pool.get_idle_size()
+        snapshot.update({
+            "open_connections": size,
+            "in_use": size - idle,
+            "utilisation": round((size - idle) / config.DB_POOL_MAX_SIZE, 3),
+        })
+    return snapshot
+
+
+register_metrics_source("db_pool", pool_snapshot)
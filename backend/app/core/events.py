@@ -0,0 +1,362 @@
+# backend/app/core/events.py
+
+import asyncio
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+import asyncpg
+from fastapi import HTTPException, Request
+from sqlalchemy import func, or_, select
+
+from . import config
+from .dashboard import invalidate_dashboard
+from .database import DATABASE_URL, database, app_events
+from .metrics import register_metrics_source
+
+# Triggers from migration 0007 NOTIFY this channel with the new app_events id.
+EVENTS_CHANNEL = "app_events"
+_MAINTENANCE_INTERVAL_SECONDS = 30
+_DRAIN_RETRY_SECONDS = 1.0
+_DASHBOARD_EVENT_KINDS = {"notification", "activity"}
+
+
+def _listener_dsn() -> str:
+    # asyncpg wants a plain postgresql:// URL, without the SQLAlchemy driver suffix.
+    return re.sub(r"^postgres(ql)?\+\w+://", "postgresql://", DATABASE_URL)
+
+
+def _event_from_row(row) -> Dict[str, Any]:
+    payload = row["payload"]
+    if isinstance(payload, str): # asyncpg returns jsonb as text
+        payload = json.loads(payload)
+    return {"id": row["id"], "kind": row["kind"], "payload": payload, "created_at": row["created_at"]}
+
+
+# app_events ids come from a sequence, so a transaction can commit a lower id
+# after a higher one has already been sent. The SSE id a client resumes from is
+# therefore a cursor, not an event id: "<highest id sent>" or
+# "<highest id sent>:<lower ids still missing>", e.g. "1042:1039,1040".
+_CURSOR_RE = re.compile(r"^(\d+)(?::(\d+(?:,\d+)*))?$")
+
+
+def format_cursor(last_id: int, missing: Iterable[int]) -> str:
+    missing = sorted(missing)
+    return f"{last_id}:{','.join(map(str, missing))}" if missing else str(last_id)
+
+
+def parse_cursor(value: Optional[str]) -> Optional[Tuple[int, Set[int]]]:
+    """(highest id sent, ids below it still missing), or None if value is not a cursor."""
+    match = _CURSOR_RE.match(value.strip()) if value else None
+    if not match:
+        return None
+    missing = {int(i) for i in match.group(2).split(",")} if match.group(2) else set()
+    return int(match.group(1)), missing
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    data = json.dumps({"kind": event["kind"], **event["payload"]}, default=str)
+    return f"id: {event.get('cursor', event['id'])}\nevent: {event['kind']}\ndata: {data}\n\n"
+
+
+class EventSubscriber:
+    """
+    One connected client. Live events are queued up to
+    EVENTS_SUBSCRIBER_QUEUE_SIZE; a client that falls further behind is cut
+    off rather than buffered without bound, and catches up from app_events
+    when it reconnects with its Last-Event-ID.
+    """
+
+    def __init__(self, kinds: Optional[Set[str]]):
+        self.kinds = kinds
+        # One slot more than the limit, reserved for the end-of-stream marker.
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=config.EVENTS_SUBSCRIBER_QUEUE_SIZE + 1)
+        self.closed = False
+
+    def offer(self, event: Dict[str, Any]) -> bool:
+        if self.closed or (self.kinds and event["kind"] not in self.kinds):
+            return True
+        if self.queue.qsize() >= config.EVENTS_SUBSCRIBER_QUEUE_SIZE:
+            self.close()
+            return False
+        self.queue.put_nowait(event)
+        return True
+
+    def close(self) -> None:
+        """Ends the stream once the client has read what is already queued."""
+        if not self.closed:
+            self.closed = True
+            self.queue.put_nowait(None)
+
+
+class EventHub:
+    """
+    Fans database change events out to connected clients.
+
+    One dedicated connection per process LISTENs on the app_events channel
+    (pooled connections cannot hold a LISTEN). Each notification carries an
+    event id; the hub reads those rows and offers them to every subscriber.
+    The hub keeps no event history of its own: clients resuming after a
+    disconnect replay from the app_events table.
+
+    Ids below the highest one published that have not been seen yet are
+    tracked as gaps (a transaction still in flight, or rolled back once
+    EVENTS_GAP_TIMEOUT_SECONDS pass). They are published when they commit,
+    and carried in each event's cursor so a resuming client replays them too.
+    """
+
+    def __init__(self):
+        self._connection: Optional[asyncpg.Connection] = None
+        self._subscribers: Set[EventSubscriber] = set()
+        self._pending_ids: Set[int] = set()
+        self._gaps: Dict[int, float] = {} # id -> time.monotonic() when it was found missing
+        self._drain_task: Optional[asyncio.Task] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self.last_event_id = 0
+        self.stats = {
+            "notifications": 0,
+            "published": 0,
+            "delivered": 0,
+            "overflowed_subscribers": 0,
+            "replayed": 0,
+            "resets": 0,
+            "listener_reconnects": 0,
+            "drain_errors": 0,
+            "late_events": 0,
+            "expired_gaps": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._maintenance_task is not None
+
+    async def start(self) -> None:
+        self.last_event_id = await database.fetch_val(select(func.coalesce(func.max(app_events.c.id), 0)))
+        await self._listen()
+        self._maintenance_task = asyncio.ensure_future(self._maintain())
+        print(f"--- Event hub listening on '{EVENTS_CHANNEL}' from event {self.last_event_id} ---")
+
+    async def stop(self) -> None:
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            self._drain_task = None
+        for subscriber in list(self._subscribers):
+            subscriber.close()
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+    async def _listen(self) -> None:
+        self._connection = await asyncpg.connect(_listener_dsn())
+        await self._connection.add_listener(EVENTS_CHANNEL, self._on_notify)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self.stats["notifications"] += 1
+        try:
+            self._pending_ids.add(int(payload))
+        except ValueError:
+            return
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.ensure_future(self._drain())
+
+    async def _drain(self) -> None:
+        # Notifications that arrive while a batch is being read are picked up by the next loop.
+        while self._pending_ids:
+            ids = sorted(self._pending_ids)
+            self._pending_ids.clear()
+            try:
+                rows = await database.fetch_all(
+                    select(app_events).where(app_events.c.id.in_(ids)).order_by(app_events.c.id)
+                )
+            except Exception as e:
+                # Kept for the next attempt; later ids published meanwhile leave
+                # these as gaps, so cursors sent in between still cover them.
+                self.stats["drain_errors"] += 1
+                print(f"⚠️ Event hub could not read events {ids[0]}..{ids[-1]}, retrying: {e}")
+                self._pending_ids.update(ids)
+                await asyncio.sleep(_DRAIN_RETRY_SECONDS)
+                continue
+            self._publish([_event_from_row(row) for row in rows])
+
+    async def _catch_up(self) -> None:
+        # After the listener reconnects: everything committed while it was away,
+        # including ids that were still in flight when it dropped.
+        condition = app_events.c.id > self.last_event_id
+        if self._gaps:
+            condition = or_(condition, app_events.c.id.in_(sorted(self._gaps)))
+        rows = await database.fetch_all(
+            select(app_events).where(condition).order_by(app_events.c.id).limit(config.EVENTS_REPLAY_LIMIT)
+        )
+        self._publish([_event_from_row(row) for row in rows])
+
+    def cursor(self) -> str:
+        """Where a client that has received everything published so far resumes from."""
+        return format_cursor(self.last_event_id, self._gaps)
+
+    def _advance(self, event_id: int) -> bool:
+        """Records event_id as published; False if it already was."""
+        if event_id in self._gaps:
+            del self._gaps[event_id]
+            self.stats["late_events"] += 1
+            return True
+        if event_id <= self.last_event_id:
+            return False
+        if event_id - self.last_event_id <= config.EVENTS_REPLAY_LIMIT:
+            now = time.monotonic()
+            for missing in range(self.last_event_id + 1, event_id):
+                self._gaps[missing] = now
+        self.last_event_id = event_id
+        return True
+
+    def _expire_gaps(self) -> None:
+        cutoff = time.monotonic() - config.EVENTS_GAP_TIMEOUT_SECONDS
+        for event_id in [i for i, found in self._gaps.items() if found < cutoff]:
+            del self._gaps[event_id]
+            self.stats["expired_gaps"] += 1
+
+    def _publish(self, events: List[Dict[str, Any]]) -> None:
+        fresh = []
+        for event in events:
+            if self._advance(event["id"]): # Skips ids already published (catch-up overlapping a drain)
+                event["cursor"] = self.cursor()
+                fresh.append(event)
+        events = fresh
+        if any(event["kind"] in _DASHBOARD_EVENT_KINDS for event in events):
+            invalidate_dashboard()
+        for event in events:
+            self.stats["published"] += 1
+            for subscriber in list(self._subscribers):
+                if subscriber.offer(event):
+                    self.stats["delivered"] += 1
+                else:
+                    self.stats["overflowed_subscribers"] += 1
+                    self._subscribers.discard(subscriber)
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(_MAINTENANCE_INTERVAL_SECONDS)
+            self._expire_gaps()
+            try:
+                if self._connection is None or self._connection.is_closed():
+                    self.stats["listener_reconnects"] += 1
+                    await self._listen()
+                    await self._catch_up()
+                await database.execute(
+                    "DELETE FROM app_events WHERE created_at < now() - make_interval(hours => :hours)",
+                    {"hours": config.EVENTS_RETENTION_HOURS},
+                )
+            except Exception as e:
+                print(f"⚠️ Event hub maintenance failed: {e}")
+
+    def subscribe(self, kinds: Optional[Set[str]] = None) -> EventSubscriber:
+        subscriber = EventSubscriber(kinds)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: EventSubscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    async def replay(self, cursor: Tuple[int, Set[int]], kinds: Optional[Set[str]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Events a client resuming from cursor (parse_cursor()) has not seen,
+        up to what the hub has published (anything later reaches the client
+        live), oldest first, each with its own cursor. None if the client is
+        too far behind to catch up (events already pruned, or more than
+        EVENTS_REPLAY_LIMIT of them) and should reload its state instead.
+        """
+        after_id, missing = cursor
+        upto, in_flight = self.last_event_id, set(self._gaps)
+        oldest = await database.fetch_val(select(func.min(app_events.c.id)))
+        if oldest is not None and after_id + 1 < oldest:
+            return None
+        condition = app_events.c.id > after_id
+        if missing:
+            condition = or_(condition, app_events.c.id.in_(sorted(missing)))
+        # Every kind is read (and filtered below) so that an id absent here is
+        # known to be in flight or rolled back, never merely filtered out.
+        rows = await database.fetch_all(
+            select(app_events)
+            .where(condition)
+            .where(app_events.c.id <= upto)
+            .order_by(app_events.c.id)
+            .limit(config.EVENTS_REPLAY_LIMIT + 1)
+        )
+        if len(rows) > config.EVENTS_REPLAY_LIMIT:
+            return None
+        events = []
+        for i, row in enumerate(rows):
+            event = _event_from_row(row)
+            position = max(after_id, event["id"])
+            still_missing = in_flight.union(r["id"] for r in rows[i + 1:])
+            event["cursor"] = format_cursor(position, (m for m in still_missing if m < position))
+            if not kinds or event["kind"] in kinds:
+                events.append(event)
+        return events
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "listening": self._connection is not None and not self._connection.is_closed(),
+            "subscribers": len(self._subscribers),
+            "last_event_id": self.last_event_id,
+            "gaps": len(self._gaps),
+        }
+
+
+event_hub = EventHub()
+
+
+async def sse_event_stream(request: Request, last_event_id: Optional[str],
+                           kinds: Optional[Set[str]] = None) -> AsyncIterator[str]:
+    """
+    Server-sent events for one client: first anything it missed since
+    last_event_id (a cursor sent as an earlier event's id, or a plain event
+    id), then live events, with a comment line every
+    EVENTS_HEARTBEAT_SECONDS so proxies keep the connection open.
+    A "reset" event tells the client to reload instead of catching up.
+    """
+    if not event_hub.running:
+        raise HTTPException(status_code=503, detail="Event stream is not available")
+
+    # Subscribe before replaying so nothing committed in between is lost;
+    # live events already sent as part of the replay are skipped below.
+    subscriber = event_hub.subscribe(kinds)
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            yield f"retry: {config.EVENTS_CLIENT_RETRY_MS}\n\n"
+            replayed_ids: Set[int] = set()
+            cursor = parse_cursor(last_event_id)
+            if cursor is not None:
+                missed = await event_hub.replay(cursor, kinds)
+                if missed is None:
+                    event_hub.stats["resets"] += 1
+                    yield f"id: {event_hub.cursor()}\nevent: reset\ndata: {{}}\n\n"
+                else:
+                    event_hub.stats["replayed"] += len(missed)
+                    for event in missed:
+                        yield format_sse(event)
+                    replayed_ids = {event["id"] for event in missed}
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=config.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None: # Fell behind or shutting down; the client reconnects and replays
+                    break
+                if event["id"] not in replayed_ids:
+                    yield format_sse(event)
+        finally:
+            event_hub.unsubscribe(subscriber)
+
+    return stream()
+
+
+register_metrics_source("events", event_hub.snapshot)
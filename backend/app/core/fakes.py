@@ -0,0 +1,236 @@
+# backend/app/core/fakes.py
+
+# Deterministic offline stand-ins for the external providers (LLM, embeddings,
+# web search, speech-to-text). Selected through config ("fake" providers) so that
+# every endpoint can be load-tested on a laptop without network or model downloads.
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain.tools import Tool
+
+from . import config
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Default script: enough to exercise the agent's tool-calling loop.
+# A script is a list of rules, checked in order against the latest user message:
+#   {"match": "<regex>", "tool_calls": [{"name": "<tool>", "args": {...}}]}
+#   {"match": "<regex>", "content": "<reply>"}
+# "{input}" inside string values is replaced with the user's message.
+DEFAULT_FAKE_SCRIPT: List[Dict[str, Any]] = [
+    {"match": r"\b(latest|recent|news|ruling|today)\b",
+     "tool_calls": [{"name": "Live_Web_Search", "args": {"query": "{input}"}}]},
+    {"match": r"\b(contract|agreement|retainer|clause|policy|termination)\b",
+     "tool_calls": [{"name": "Internal_Legal_Document_Retriever", "args": {"__arg1": "{input}"}}]},
+]
+
+
+def load_fake_script() -> List[Dict[str, Any]]:
+    if config.FAKE_LLM_SCRIPT_PATH:
+        with open(config.FAKE_LLM_SCRIPT_PATH) as f:
+            return json.load(f)
+    return DEFAULT_FAKE_SCRIPT
+
+
+def _fill(value: Any, text: str) -> Any:
+    if isinstance(value, str):
+        return value.replace("{input}", text)
+    if isinstance(value, dict):
+        return {k: _fill(v, text) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, text) for v in value]
+    return value
+
+
+def _input_text(input: Any) -> str:
+    """Extracts the prompt text from whatever a runnable was invoked with."""
+    if isinstance(input, str):
+        return input
+    if hasattr(input, "to_string"):  # PromptValue
+        return input.to_string()
+    if isinstance(input, list) and input:
+        last = input[-1]
+        return last.content if isinstance(last, BaseMessage) else str(last)
+    return str(input)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic chat model with scripted tool calls and configurable latency.
+    The same conversation always produces the same reply.
+    """
+
+    latency_seconds: float = 0.0
+    script: List[Dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _respond(self, messages: List[BaseMessage], tools: List[Dict[str, Any]]) -> AIMessage:
+        last = messages[-1] if messages else None
+
+        # After a tool ran, answer from its output so the agent loop terminates.
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=f"Based on {last.name or 'the tool result'}: {str(last.content)[:300]}")
+
+        humans = [m for m in messages if isinstance(m, HumanMessage)]
+        text = _input_text(humans or messages)
+        available = {t["function"]["name"] for t in tools}
+        for rule in self.script:
+            if not re.search(rule["match"], text, re.IGNORECASE):
+                continue
+            if "tool_calls" in rule:
+                calls = [
+                    {"name": call["name"], "args": _fill(call.get("args", {}), text),
+                     "id": f"call_{_digest(text + call['name'])[:16]}"}
+                    for call in rule["tool_calls"] if call["name"] in available
+                ]
+                if calls:
+                    return AIMessage(content="", tool_calls=calls)
+            elif "content" in rule:
+                return AIMessage(content=_fill(rule["content"], text))
+
+        return AIMessage(content=f"[fake-llm {_digest(text)[:8]}] {text[:200]}")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        message = self._respond(messages, kwargs.get("tools", []))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        message = self._respond(messages, kwargs.get("tools", []))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def bind_tools(self, tools: List[Any], tool_choice: Optional[str] = None, **kwargs: Any) -> Runnable:
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        latency = self.latency_seconds
+
+        def _invoke(input: Any) -> Any:
+            if latency:
+                time.sleep(latency)
+            return fake_structured_output(schema, _input_text(input))
+
+        async def _ainvoke(input: Any) -> Any:
+            if latency:
+                await asyncio.sleep(latency)
+            return fake_structured_output(schema, _input_text(input))
+
+        return RunnableLambda(_invoke, afunc=_ainvoke, name="FakeStructuredOutput")
+
+
+_FAKE_CASE_TYPES = ["Contract Dispute", "Personal Injury", "Employment Litigation", "Intellectual Property", "Real Estate Law"]
+_DATE_PATTERN = re.compile(r"\b\d{1,2}/\d{1,2}/\d{2,4}\b")
+
+
+def _fake_value(field_name: str, annotation: Any, text: str, digest: str) -> Any:
+    origin = get_origin(annotation)
+    if origin is Union:  # Optional[X]
+        inner = [a for a in get_args(annotation) if a is not type(None)]
+        return _fake_value(field_name, inner[0], text, digest) if inner else None
+    if origin in (list, List):
+        return _DATE_PATTERN.findall(text) if "date" in field_name else []
+    if annotation is str:
+        if "type" in field_name:
+            return _FAKE_CASE_TYPES[int(digest[:8], 16) % len(_FAKE_CASE_TYPES)]
+        if "name" in field_name or "party" in field_name:
+            return f"{field_name.replace('_', ' ').title()} {digest[:6].upper()}"
+        return " ".join(text.split())[:300]
+    if annotation is int:
+        return int(digest[:4], 16)
+    if annotation is bool:
+        return int(digest[0], 16) % 2 == 0
+    return None
+
+
+def fake_structured_output(schema: Any, text: str) -> Any:
+    """Builds a deterministic instance of a Pydantic schema from the prompt text."""
+    digest = _digest(text)
+    values = {
+        name: _fake_value(name, field.annotation, text, digest)
+        for name, field in schema.model_fields.items()
+    }
+    return schema(**values)
+
+
+def get_fake_llm() -> FakeChatModel:
+    return FakeChatModel(latency_seconds=config.FAKE_LLM_LATENCY_SECONDS, script=load_fake_script())
+
+
+def get_fake_embedding_model() -> DeterministicFakeEmbedding:
+    """Hash-seeded vectors: identical text always maps to the identical vector."""
+    return DeterministicFakeEmbedding(size=config.FAKE_EMBEDDING_SIZE)
+
+
+# --- Web search ---
+def _fake_search_results(query: str) -> str:
+    digest = _digest(query)
+    results = [
+        {
+            "title": f"Result {i + 1} for: {query[:60]}",
+            "url": f"https://example.com/{digest[i * 8:(i + 1) * 8]}",
+            "content": f"Deterministic placeholder content about '{query[:80]}' (#{digest[i * 4:(i + 1) * 4]}).",
+        }
+        for i in range(3)
+    ]
+    return json.dumps({"query": query, "results": results})
+
+
+def fake_web_search(query: str) -> str:
+    if config.FAKE_WEB_SEARCH_LATENCY_SECONDS:
+        time.sleep(config.FAKE_WEB_SEARCH_LATENCY_SECONDS)
+    return _fake_search_results(query)
+
+
+async def fake_web_search_async(query: str) -> str:
+    if config.FAKE_WEB_SEARCH_LATENCY_SECONDS:
+        await asyncio.sleep(config.FAKE_WEB_SEARCH_LATENCY_SECONDS)
+    return _fake_search_results(query)
+
+
+FakeWebSearchTool = Tool(
+    name="Live_Web_Search",
+    func=fake_web_search,
+    coroutine=fake_web_search_async,
+    description="""Use this tool to search the live internet for recent information,
+    current events, breaking news, or information about new case law or regulations
+    that may not be in the internal knowledge base. (Offline fake.)"""
+)
+
+
+# --- Speech-to-text ---
+def fake_transcribe_audio_file(file_path: str) -> str:
+    """Returns a transcript derived from the file's bytes, after the configured latency."""
+    with open(file_path, "rb") as f:
+        return fake_transcribe_audio(f.read())
+
+
+def fake_transcribe_audio(data: bytes) -> str:
+    """fake_transcribe_audio_file() for audio already in memory."""
+    digest = hashlib.sha256(data).hexdigest()
+    if config.FAKE_STT_LATENCY_SECONDS:
+        time.sleep(config.FAKE_STT_LATENCY_SECONDS)
+    return (
+        f"Hello, my name is Caller {digest[:6].upper()}. I need help with a contract dispute "
+        f"with my former landlord. The lease was signed on 01/15/2024 and they kept my deposit. "
+        f"Reference {digest[6:14]}."
+    )
@@ -0,0 +1,262 @@
+# backend/app/core/job_queue.py
+
+import asyncio
+import contextvars
+import json
+import os
+import socket
+import traceback
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from . import config
+from .database import database, jobs
+from .metrics import register_metrics_source
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str):
+    """Decorator registering the coroutine that processes jobs of this type."""
+    def register(fn: JobHandler) -> JobHandler:
+        _handlers[job_type] = fn
+        return fn
+    return register
+
+
+_stats = {"enqueued": 0, "duplicates": 0, "claimed": 0, "succeeded": 0, "retried": 0, "dead": 0,
+          "worker_errors": 0, "heartbeat_errors": 0}
+
+# Lets in-process workers pick up a freshly enqueued job without waiting for the next poll.
+_wakeup = asyncio.Event()
+
+# (attempt, max_attempts) of the job whose handler is running in this task.
+_current_attempt: contextvars.ContextVar[Optional[Tuple[int, int]]] = contextvars.ContextVar(
+    "job_attempt", default=None
+)
+
+
+def is_final_attempt() -> bool:
+    """
+    True when a failure of the running handler will not be retried: its job
+    is on its last attempt, or the code is not running as a job at all.
+    Handlers use it to keep a degraded result instead of failing for good.
+    """
+    attempt = _current_attempt.get()
+    return attempt is None or attempt[0] >= attempt[1]
+
+
+async def enqueue(job_type: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None,
+                  max_attempts: Optional[int] = None) -> Optional[int]:
+    """
+    Adds a job to the queue and returns its id.
+    Returns None if a job with the same (job_type, dedupe_key) already exists,
+    which makes enqueueing idempotent for retried webhooks.
+    """
+    query = (
+        pg_insert(jobs)
+        .values(
+            job_type=job_type,
+            dedupe_key=dedupe_key,
+            payload=payload,
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts or config.JOB_MAX_ATTEMPTS,
+        )
+        .on_conflict_do_nothing(index_elements=["job_type", "dedupe_key"])
+        .returning(jobs.c.id)
+    )
+    job_id = await database.fetch_val(query)
+    if job_id is None:
+        _stats["duplicates"] += 1
+        print(f"--- Job {job_type}/{dedupe_key} already queued. Skipping. ---")
+        return None
+    _stats["enqueued"] += 1
+    _wakeup.set()
+    print(f"--- Enqueued job {job_id} ({job_type}) ---")
+    return job_id
+
+
+# Claims one job: either a queued job that is due, or a running job whose
+# visibility timeout expired (its worker died). SKIP LOCKED lets many workers
+# claim concurrently without blocking each other.
+_CLAIM_SQL = """
+UPDATE jobs
+SET status = 'running',
+    attempts = attempts + 1,
+    locked_by = :worker_id,
+    locked_until = now() + make_interval(secs => :visibility_timeout)
+WHERE id = (
+    SELECT id FROM jobs
+    WHERE (status = 'queued' AND available_at <= now())
+       OR (status = 'running' AND locked_until < now())
+    ORDER BY available_at
+    FOR UPDATE SKIP LOCKED
+    LIMIT 1
+)
+RETURNING id, job_type, payload, attempts, max_attempts
+"""
+
+_EXTEND_SQL = """
+UPDATE jobs SET locked_until = now() + make_interval(secs => :visibility_timeout)
+WHERE id = :job_id AND locked_by = :worker_id AND status = 'running'
+"""
+
+_SUCCEED_SQL = """
+UPDATE jobs SET status = 'succeeded', finished_at = now(), locked_until = NULL, last_error = NULL
+WHERE id = :job_id AND locked_by = :worker_id
+"""
+
+_RETRY_SQL = """
+UPDATE jobs SET status = 'queued', locked_until = NULL, locked_by = NULL, last_error = :error,
+    available_at = now() + make_interval(secs => :delay)
+WHERE id = :job_id AND locked_by = :worker_id
+"""
+
+_DEAD_SQL = """
+UPDATE jobs SET status = 'dead', finished_at = now(), locked_until = NULL, last_error = :error
+WHERE id = :job_id AND locked_by = :worker_id
+"""
+
+# Used on shutdown: hand the job back without counting the interrupted attempt.
+_RELEASE_SQL = """
+UPDATE jobs SET status = 'queued', locked_until = NULL, locked_by = NULL, attempts = greatest(attempts - 1, 0)
+WHERE id = :job_id AND locked_by = :worker_id AND status = 'running'
+"""
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(config.JOB_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), config.JOB_RETRY_MAX_SECONDS)
+
+
+class JobWorkerPool:
+    """A set of worker coroutines that claim and run jobs until stopped."""
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self, concurrency: int) -> None:
+        if self._tasks:
+            return
+        print(f"--- Starting {concurrency} job worker(s) ---")
+        self._tasks = [
+            asyncio.create_task(self._run(f"{self._worker_prefix}:{i}"))
+            for i in range(concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        print("--- Job workers stopped ---")
+
+    async def _run(self, worker_id: str) -> None:
+        while True:
+            try:
+                job = await database.fetch_one(_CLAIM_SQL, values={
+                    "worker_id": worker_id,
+                    "visibility_timeout": float(config.JOB_VISIBILITY_TIMEOUT_SECONDS),
+                })
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"--- Job worker {worker_id} failed to claim a job: {e} ---")
+                job = None
+
+            if job is None:
+                _wakeup.clear()
+                try:
+                    await asyncio.wait_for(_wakeup.wait(), timeout=config.JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._process(worker_id, dict(job))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Recording the outcome failed (pool or statement timeout, lost
+                # connection). The job stays claimed and is picked up again once
+                # its visibility timeout lapses; this worker carries on.
+                _stats["worker_errors"] += 1
+                print(f"--- Job worker {worker_id} failed to record the outcome of job {job['id']}: {e} ---")
+                traceback.print_exc()
+
+    async def _process(self, worker_id: str, job: Dict[str, Any]) -> None:
+        _stats["claimed"] += 1
+        ids = {"job_id": job["id"], "worker_id": worker_id}
+        handler = _handlers.get(job["job_type"])
+
+        if job["attempts"] > job["max_attempts"]:
+            # Reclaimed after a crash more often than allowed.
+            await database.execute(_DEAD_SQL, values={**ids, "error": "Exceeded max attempts (visibility timeout)"})
+            _stats["dead"] += 1
+            return
+        if handler is None:
+            await database.execute(_DEAD_SQL, values={**ids, "error": f"No handler for job type {job['job_type']}"})
+            _stats["dead"] += 1
+            return
+
+        payload = job["payload"]
+        if isinstance(payload, str): # asyncpg returns JSONB as text
+            payload = json.loads(payload)
+
+        heartbeat = asyncio.create_task(self._heartbeat(ids))
+        attempt = _current_attempt.set((job["attempts"], job["max_attempts"]))
+        try:
+            print(f"--- Worker {worker_id} running job {job['id']} ({job['job_type']}), attempt {job['attempts']} ---")
+            await handler(payload)
+        except asyncio.CancelledError:
+            await asyncio.shield(database.execute(_RELEASE_SQL, values=ids))
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"--- Job {job['id']} failed: {error} ---")
+            traceback.print_exc()
+            if job["attempts"] >= job["max_attempts"]:
+                await database.execute(_DEAD_SQL, values={**ids, "error": error})
+                _stats["dead"] += 1
+            else:
+                await database.execute(_RETRY_SQL, values={**ids, "error": error, "delay": _retry_delay(job["attempts"])})
+                _stats["retried"] += 1
+        else:
+            await database.execute(_SUCCEED_SQL, values=ids)
+            _stats["succeeded"] += 1
+        finally:
+            _current_attempt.reset(attempt)
+            heartbeat.cancel()
+
+    async def _heartbeat(self, ids: Dict[str, Any]) -> None:
+        """
+        Keeps extending the visibility timeout while a long job is still running.
+        Extending every third of the timeout leaves room for a failed attempt to
+        be retried before another worker could reclaim the job.
+        """
+        while True:
+            await asyncio.sleep(config.JOB_VISIBILITY_TIMEOUT_SECONDS / 3)
+            try:
+                await database.execute(_EXTEND_SQL, values={**ids, "visibility_timeout": float(config.JOB_VISIBILITY_TIMEOUT_SECONDS)})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _stats["heartbeat_errors"] += 1
+                print(f"--- Failed to extend job {ids['job_id']}, retrying: {e} ---")
+
+
+job_workers = JobWorkerPool()
+
+
+async def job_counts() -> Dict[str, int]:
+    """Number of jobs per status (for /debug/jobs)."""
+    rows = await database.fetch_all(select(jobs.c.status, func.count().label("n")).group_by(jobs.c.status))
+    return {row["status"]: row["n"] for row in rows}
+
+
+register_metrics_source("job_queue", lambda: {**_stats, "workers": len(job_workers._tasks)})
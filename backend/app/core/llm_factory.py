@@ -7,23 +7,30 @@ from langchain_core.embeddings import Embeddings
 from langchain_ollama import OllamaEmbeddings
 
 from . import config
+from .llm_scheduler import ScheduledChatModel
+from .fakes import get_fake_llm, get_fake_embedding_model
 
 def get_llm(temperature: float = 0.7) -> BaseChatModel:
     """
     Factory function to get the appropriate Chat LLM based on the config.
+    The model is wrapped so that all of its calls go through the LLM scheduler.
     """
     if config.LLM_PROVIDER == "google":
         print("--- Using Google Gemini LLM ---")
-        return ChatGoogleGenerativeAI(
+        llm = ChatGoogleGenerativeAI(
             model=config.GEMINI_MODEL,
             temperature=temperature,
             # convert_system_message_to_human=True
         )
     elif config.LLM_PROVIDER == "ollama":
         print("--- Using Ollama LLM ---")
-        return ChatOllama(model=config.OLLAMA_LLM_MODEL, temperature=temperature)
+        llm = ChatOllama(model=config.OLLAMA_LLM_MODEL, temperature=temperature)
+    elif config.LLM_PROVIDER == "fake":
+        print("--- Using fake offline LLM ---")
+        llm = get_fake_llm()
     else:
         raise ValueError(f"Unsupported LLM provider: {config.LLM_PROVIDER}")
+    return ScheduledChatModel(inner=llm)
 
 def get_embedding_model() -> Embeddings:
     """
@@ -35,5 +42,8 @@ def get_embedding_model() -> Embeddings:
     elif config.EMBEDDING_PROVIDER == "ollama":
         print("--- Using local Ollama Embeddings ---")
         return OllamaEmbeddings(model=config.EMBEDDING_MODEL)
+    elif config.EMBEDDING_PROVIDER == "fake":
+        print("--- Using fake hash-based Embeddings ---")
+        return get_fake_embedding_model()
     else:
         raise ValueError(f"Unsupported Embedding provider: {config.EMBEDDING_PROVIDER}")
\ No newline at end of file
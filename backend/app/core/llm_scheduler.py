@@ -0,0 +1,264 @@
+# backend/app/core/llm_scheduler.py
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from . import config
+from .metrics import register_metrics_source
+
+
+class Priority(IntEnum):
+    """Priority classes for LLM work. Lower value = served first."""
+    REALTIME = 0     # Live Vapi voice turns
+    INTERACTIVE = 1  # Web UI requests (/agent-query, /case-intake)
+    BACKGROUND = 2   # End-of-call processing, bulk jobs
+
+
+class LLMOverloadedError(RuntimeError):
+    """Raised when a call is shed instead of queued."""
+
+
+# The priority of the current request. Endpoints set it with `llm_priority(...)`;
+# it follows the request into tasks and executor threads like any contextvar.
+# A callable is asked on every call, for work whose priority changes while it
+# runs (a voice turn that overran its deadline, see voice_turns.py).
+_current_priority: contextvars.ContextVar[Union[Priority, Callable[[], Priority]]] = contextvars.ContextVar(
+    "llm_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def llm_priority(priority: Union[Priority, Callable[[], Priority]]):
+    """Runs the enclosed block (and every LLM call it makes) at the given priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    priority = _current_priority.get()
+    return priority() if callable(priority) else priority
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls.
+
+    Each priority class has its own FIFO queue and concurrency cap, and all
+    classes share a global cap. Free slots always go to the highest-priority
+    waiter first. Background work is additionally deferred while any realtime
+    call is waiting, and shed outright when the realtime queue backs up.
+    """
+
+    def __init__(self, max_concurrency: int, class_caps: Dict[str, int],
+                 max_queue_depth: Dict[str, int], shed_background_at: int):
+        self.max_concurrency = max_concurrency
+        self.class_caps = {p: class_caps[p.name.lower()] for p in Priority}
+        self.max_queue_depth = {p: max_queue_depth[p.name.lower()] for p in Priority}
+        self.shed_background_at = shed_background_at
+        self._queues: Dict[Priority, Deque[asyncio.Future]] = {p: deque() for p in Priority}
+        self._running: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._warned_unscheduled: Set[Priority] = set()
+        self._stats: Dict[Priority, Dict[str, Any]] = {
+            p: {
+                "submitted": 0,
+                "completed": 0,
+                "failed": 0,
+                "shed": 0,
+                "unscheduled": 0,
+                "wait_seconds_total": 0.0,
+                "max_wait_seconds": 0.0,
+                "max_queue_depth": 0,
+            }
+            for p in Priority
+        }
+
+    # --- Public API ---
+
+    async def run(self, fn: Callable[[], Awaitable[Any]], priority: Optional[Priority] = None) -> Any:
+        """Waits for a slot in the given (or current) priority class, then awaits fn()."""
+        priority = current_priority() if priority is None else priority
+        await self._acquire(priority)
+        try:
+            result = await fn()
+        except BaseException:
+            self._stats[priority]["failed"] += 1
+            raise
+        finally:
+            self._release(priority)
+        self._stats[priority]["completed"] += 1
+        return result
+
+    def run_sync(self, fn: Callable[[], Any], priority: Optional[Priority] = None) -> Any:
+        """
+        Blocking counterpart of run() for sync LLM calls made from worker threads.
+        The slot is acquired on the event loop; fn() itself runs in the calling thread.
+        """
+        priority = current_priority() if priority is None else priority
+        loop = self._loop
+        if loop is None or not loop.is_running() or self._on_loop_thread(loop):
+            # Import-time warm-up calls, or a sync call made directly on the loop
+            # thread: waiting for a slot here would deadlock, so run it unscheduled.
+            self._stats[priority]["unscheduled"] += 1
+            if priority not in self._warned_unscheduled:
+                self._warned_unscheduled.add(priority)
+                print(f"⚠️ {priority.name} sync LLM call ran outside the scheduler (no running event loop to "
+                      f"schedule on, or called on the loop thread); further ones are only counted as 'unscheduled'")
+            return fn()
+
+        asyncio.run_coroutine_threadsafe(self._acquire(priority), loop).result()
+        try:
+            result = fn()
+        except BaseException:
+            self._stats[priority]["failed"] += 1
+            raise
+        finally:
+            loop.call_soon_threadsafe(self._release, priority)
+        self._stats[priority]["completed"] += 1
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = {
+            "max_concurrency": self.max_concurrency,
+            "running_total": sum(self._running.values()),
+        }
+        for p in Priority:
+            stats = dict(self._stats[p])
+            started = stats["submitted"] - stats["shed"] - len(self._queues[p])
+            stats["avg_wait_seconds"] = round(stats["wait_seconds_total"] / started, 4) if started else 0.0
+            stats["queue_depth"] = len(self._queues[p])
+            stats["running"] = self._running[p]
+            stats["concurrency_cap"] = self.class_caps[p]
+            snapshot[p.name.lower()] = stats
+        return snapshot
+
+    # --- Internals ---
+
+    @staticmethod
+    def _on_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError: # No loop running in this thread
+            return False
+
+    async def _acquire(self, priority: Priority) -> None:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        stats = self._stats[priority]
+        stats["submitted"] += 1
+
+        if priority == Priority.BACKGROUND and len(self._queues[Priority.REALTIME]) >= self.shed_background_at:
+            stats["shed"] += 1
+            raise LLMOverloadedError("Background LLM work shed: realtime queue is backed up.")
+        if len(self._queues[priority]) >= self.max_queue_depth[priority]:
+            stats["shed"] += 1
+            raise LLMOverloadedError(f"LLM queue for {priority.name.lower()} work is full.")
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiter.enqueued_at = time.monotonic()
+        queue = self._queues[priority]
+        queue.append(waiter)
+        stats["max_queue_depth"] = max(stats["max_queue_depth"], len(queue))
+        self._dispatch()
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in queue:
+                queue.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # The slot was granted just as we were cancelled; hand it back.
+                self._release(priority)
+            raise
+
+    def _release(self, priority: Priority) -> None:
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def _can_start(self, priority: Priority) -> bool:
+        if sum(self._running.values()) >= self.max_concurrency:
+            return False
+        if self._running[priority] >= self.class_caps[priority]:
+            return False
+        if priority == Priority.BACKGROUND and self._queues[Priority.REALTIME]:
+            return False
+        return True
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        for priority in Priority:
+            queue = self._queues[priority]
+            while queue and self._can_start(priority):
+                waiter = queue.popleft()
+                if waiter.done():  # Cancelled while queued
+                    continue
+                self._running[priority] += 1
+                waited = now - waiter.enqueued_at
+                stats = self._stats[priority]
+                stats["wait_seconds_total"] += waited
+                stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+                waiter.set_result(None)
+
+
+llm_scheduler = LLMScheduler(
+    max_concurrency=config.LLM_MAX_CONCURRENCY,
+    class_caps=config.LLM_CLASS_CONCURRENCY,
+    max_queue_depth=config.LLM_MAX_QUEUE_DEPTH,
+    shed_background_at=config.LLM_SHED_BACKGROUND_AT_REALTIME_QUEUE,
+)
+
+register_metrics_source("llm_scheduler", llm_scheduler.snapshot)
+
+
+class ScheduledChatModel(BaseChatModel):
+    """
+    Wraps a provider chat model so that every generation goes through
+    `llm_scheduler`. llm_factory hands these out, so the agent, the RAG chain,
+    the intake extractor and post-call processing are all scheduled.
+    """
+
+    inner: BaseChatModel
+
+    @property
+    def _llm_type(self) -> str:
+        return f"scheduled-{self.inner._llm_type}"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return llm_scheduler.run_sync(
+            lambda: self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return await llm_scheduler.run(
+            lambda: self.inner._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        )
+
+    def bind_tools(self, tools: List[Any], **kwargs: Any) -> Runnable:
+        # Let the provider convert the tools into its own format, then bind the
+        # resulting kwargs to ourselves so the calls still pass through _agenerate.
+        bound = self.inner.bind_tools(tools, **kwargs)
+        return self.bind(**bound.kwargs)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        # Structured output is provider-specific, so build it on the inner model
+        # and gate the whole runnable instead.
+        structured = self.inner.with_structured_output(schema, **kwargs)
+
+        def _invoke(input: Any, config: Optional[dict] = None) -> Any:
+            return llm_scheduler.run_sync(lambda: structured.invoke(input, config))
+
+        async def _ainvoke(input: Any, config: Optional[dict] = None) -> Any:
+            return await llm_scheduler.run(lambda: structured.ainvoke(input, config))
+
+        return RunnableLambda(_invoke, afunc=_ainvoke, name=f"Scheduled{type(self.inner).__name__}StructuredOutput")
@@ -0,0 +1,134 @@
+# backend/app/core/long_audio.py
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from . import config
+from .transcription_pool import transcription_pool
+
+# Long recordings (a 60-minute interview) are decoded once, cut at silences
+# into chunks of about LONG_AUDIO_CHUNK_SECONDS, transcribed in parallel on
+# the transcription pool's workers and stitched back in order, with every
+# segment's timestamps shifted to its position in the whole recording.
+# Chunks go to the workers as PCM; nothing is written to disk.
+
+SAMPLE_RATE = 16000 # What Whisper resamples to anyway (transcription.PCM_SAMPLE_RATE)
+_FRAME_SECONDS = 0.03 # Energy is measured per 30 ms frame
+_QUIET_RUN_SECONDS = 0.3 # A cut goes in the middle of the quietest 300 ms ...
+_SEARCH_SECONDS = 15.0 # ... within this distance of the ideal cut point
+
+
+async def _run(*args: str) -> bytes:
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise ValueError(f"{args[0]} failed: {stderr.decode(errors='replace').strip()[-500:]}")
+    return stdout
+
+
+async def probe_duration(path: str) -> Optional[float]:
+    """Duration of an audio file in seconds (ffprobe), or None if unknown."""
+    try:
+        out = await _run("ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path)
+        return float(out.strip())
+    except ValueError:
+        return None
+
+
+async def decode_audio(path: str):
+    """The whole recording as 16 kHz mono int16 samples (ffmpeg runs as a subprocess)."""
+    import numpy as np
+
+    pcm = await _run("ffmpeg", "-nostdin", "-v", "error", "-i", path, "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-")
+    return np.frombuffer(pcm, dtype=np.int16)
+
+
+def find_cut_points(samples, chunk_seconds: float) -> List[int]:
+    """
+    Sample offsets at which to cut the recording: one near every
+    chunk_seconds, each moved to the middle of the quietest stretch within
+    _SEARCH_SECONDS of it, so cuts fall between words. A short tail is left
+    on the last chunk instead of becoming a chunk of its own.
+    """
+    import numpy as np
+
+    frame = int(SAMPLE_RATE * _FRAME_SECONDS)
+    frame_count = len(samples) // frame
+    chunk_frames = int(chunk_seconds / _FRAME_SECONDS)
+    if frame_count < chunk_frames * 1.5:
+        return []
+    energy = np.sqrt(np.mean(samples[:frame_count * frame].astype(np.float32).reshape(frame_count, frame) ** 2, axis=1))
+    run = max(1, int(_QUIET_RUN_SECONDS / _FRAME_SECONDS))
+    smoothed = np.convolve(energy, np.ones(run) / run, mode="same") # Mean energy of the run centred on each frame
+    search = min(int(_SEARCH_SECONDS / _FRAME_SECONDS), chunk_frames // 2)
+
+    cuts: List[int] = []
+    previous = 0
+    while frame_count - previous > chunk_frames * 1.5:
+        target = previous + chunk_frames
+        low, high = max(previous + run, target - search), min(frame_count - run, target + search)
+        quietest = low + int(np.argmin(smoothed[low:high]))
+        cuts.append(quietest * frame)
+        previous = quietest
+    return cuts
+
+
+async def transcribe_long_audio(
+    samples,
+    chunk_seconds: Optional[float] = None,
+    on_chunk: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Transcribes a long recording, given as 16 kHz mono int16 samples
+    (decode_audio(), audio_upload.decode_upload()), in parallel chunks.
+    Returns the stitched text, the timed segments ({"start", "end", "text"},
+    in seconds from the start of the recording) and how it was split.
+    on_chunk(index, segments) is called as each chunk finishes, in
+    completion order, with that chunk's segments (transcription_jobs.py).
+
+    Admission is checked once for the whole recording; its chunks then
+    queue on the transcription pool at most one per worker at a time, so
+    one long recording uses every idle worker without locking out
+    other requests.
+    """
+    transcription_pool.check_capacity()
+    chunk_seconds = chunk_seconds or config.LONG_AUDIO_CHUNK_SECONDS
+    # Energy analysis is numpy work over the whole recording: off the event loop.
+    cuts = await asyncio.to_thread(find_cut_points, samples, chunk_seconds)
+    bounds = [0] + cuts + [len(samples)]
+    in_flight = asyncio.Semaphore(max(1, transcription_pool.size))
+
+    async def transcribe_chunk(index: int, start: int, end: int) -> List[Dict[str, Any]]:
+        async with in_flight:
+            # Sliced here rather than up front, so only in-flight chunks are copied.
+            chunk_segments = await transcription_pool.transcribe(samples[start:end].tobytes(), timestamps=True, admitted=True)
+        offset = start / SAMPLE_RATE
+        segments = [
+            {"start": round(s["start"] + offset, 2), "end": round(s["end"] + offset, 2), "text": s["text"]}
+            for s in chunk_segments
+        ]
+        if on_chunk is not None:
+            on_chunk(index, segments)
+        return segments
+
+    tasks = [
+        asyncio.create_task(transcribe_chunk(index, start, end))
+        for index, (start, end) in enumerate(zip(bounds, bounds[1:]))
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # One chunk failed (or the request went away): the rest are not needed.
+        for task in tasks:
+            task.cancel()
+        raise
+
+    segments = [segment for chunk_segments in results for segment in chunk_segments]
+    return {
+        "text": " ".join(segment["text"] for segment in segments if segment["text"]),
+        "segments": segments,
+        "chunks": [{"start": round(start / SAMPLE_RATE, 2)} for start in bounds[:-1]],
+        "audio_seconds": round(len(samples) / SAMPLE_RATE, 2),
+    }
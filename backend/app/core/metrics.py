@@ -0,0 +1,30 @@
+# backend/app/core/metrics.py
+
+from typing import Any, Callable, Dict
+
+# Each subsystem (coalescing, scheduler, job queue, ...) registers a callable
+# here that returns a JSON-serialisable snapshot of its counters.
+# /debug/metrics simply walks this registry.
+_metrics_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics_source(name: str, snapshot: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Registers a snapshot function under the given name.
+    Registering the same name twice replaces the previous source.
+    """
+    _metrics_sources[name] = snapshot
+
+
+def collect_metrics() -> Dict[str, Any]:
+    """
+    Returns the current snapshot of every registered metrics source.
+    A failing source is reported in place instead of breaking the whole response.
+    """
+    collected = {}
+    for name, snapshot in _metrics_sources.items():
+        try:
+            collected[name] = snapshot()
+        except Exception as e:
+            collected[name] = {"error": str(e)}
+    return collected
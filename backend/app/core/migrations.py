@@ -0,0 +1,97 @@
+# backend/app/core/migrations.py
+
+import importlib
+import inspect
+import os
+import re
+from dataclasses import dataclass
+from types import ModuleType
+from typing import List, Optional, Set
+
+from .database import database
+
+MIGRATIONS_PACKAGE = __package__.rsplit(".", 1)[0] + ".migrations" # backend.app.migrations
+_MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations")
+_FILENAME = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# Serialises migration runs across API workers and the standalone job worker.
+_ADVISORY_LOCK_ID = 7_262_001
+
+_CREATE_SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(4) PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+)
+"""
+
+
+@dataclass
+class Migration:
+    version: str
+    name: str
+    module: ModuleType
+
+
+def discover_migrations() -> List[Migration]:
+    """All migrations in backend/app/migrations, ordered by version."""
+    migrations = []
+    for filename in sorted(os.listdir(_MIGRATIONS_DIR)):
+        match = _FILENAME.match(filename)
+        if match:
+            module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{filename[:-3]}")
+            migrations.append(Migration(version=match.group(1), name=match.group(2), module=module))
+    return migrations
+
+
+async def applied_versions() -> Set[str]:
+    async with database.transaction():
+        await database.execute("SELECT pg_advisory_xact_lock(:lock_id)", values={"lock_id": _ADVISORY_LOCK_ID})
+        await database.execute(_CREATE_SCHEMA_MIGRATIONS_SQL)
+    rows = await database.fetch_all("SELECT version FROM schema_migrations")
+    return {row["version"] for row in rows}
+
+
+async def pending_migrations() -> List[Migration]:
+    applied = await applied_versions()
+    return [m for m in discover_migrations() if m.version not in applied]
+
+
+async def _apply(migration: Migration) -> bool:
+    """Applies one migration in its own transaction. Returns False if another process got there first."""
+    async with database.transaction():
+        await database.execute("SELECT pg_advisory_xact_lock(:lock_id)", values={"lock_id": _ADVISORY_LOCK_ID})
+        already = await database.fetch_val(
+            "SELECT 1 FROM schema_migrations WHERE version = :version", values={"version": migration.version}
+        )
+        if already:
+            return False
+        # Index builds on large tables may legitimately exceed DB_STATEMENT_TIMEOUT_MS.
+        await database.execute("SET LOCAL statement_timeout = 0")
+        for statement in getattr(migration.module, "UPGRADE", []):
+            await database.execute(statement)
+        upgrade = getattr(migration.module, "upgrade", None)
+        if upgrade is not None and inspect.iscoroutinefunction(upgrade):
+            await upgrade(database)
+        await database.execute(
+            "INSERT INTO schema_migrations (version, name) VALUES (:version, :name)",
+            values={"version": migration.version, "name": migration.name},
+        )
+    return True
+
+
+async def migrate(target: Optional[str] = None) -> List[str]:
+    """
+    Applies all pending migrations up to and including target (default: all).
+    Safe to call from several processes at once. Returns the applied versions.
+    """
+    applied = []
+    for migration in await pending_migrations():
+        if target is not None and migration.version > target:
+            break
+        print(f"--- Applying migration {migration.version}_{migration.name} ---")
+        if await _apply(migration):
+            applied.append(migration.version)
+    if applied:
+        print(f"--- Applied {len(applied)} migration(s) ---")
+    return applied
@@ -0,0 +1,30 @@
+# backend/app/core/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encodes the sort key of the last row on a page into an opaque cursor.
+    Datetimes are stored as ISO strings and restored by decode_cursor().
+    """
+    serialisable = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(serialisable).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str], expected_length: int) -> Optional[List[Any]]:
+    """Inverse of encode_cursor(). Raises a 400 for malformed cursors."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != expected_length:
+            raise ValueError("wrong cursor length")
+        return [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) and "dt" in v else v for v in values]
+    except (ValueError, TypeError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
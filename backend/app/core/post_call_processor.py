@@ -1,15 +1,24 @@
 # backend/app/core/post_call_processor.py
 
+import asyncio
+import time
 import uuid
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
 from .schemas import VapiMessageOpenAI 
-from .llm_factory import get_llm
-from .tools import case_intake_extractor # We'll reuse our powerful extractor
+# Summary and intake extraction switch to map-reduce for long transcripts
+from .summarization import generate_summary_and_notes, extract_case_intake
 # Import our database and cases table object
-from .database import database, cases
+from .database import database, cases, case_notes
+from .case_notes import add_case_note
+from .transcripts import store_transcript
+from .case_fields import case_link_fields
+from .job_queue import enqueue, is_final_attempt, job_handler
+from .llm_scheduler import Priority, llm_priority
+from .metrics import register_metrics_source
+from .tools import INTAKE_UNAVAILABLE_ERROR
 import json # For handling JSON data correctly
-from sqlalchemy import select, update
-from datetime import datetime
+from sqlalchemy import select, union_all
 def format_transcript_for_llm(transcript_messages: List[VapiMessageOpenAI]) -> str:
     """
     Takes the list of message objects from Vapi and formats it into a single
@@ -24,138 +33,175 @@ def format_transcript_for_llm(transcript_messages: List[VapiMessageOpenAI]) -> s
             formatted_string += f"{role}: {content}\n"
     return formatted_string
 
-def generate_summary_and_notes(full_transcript_string: str) -> str:
-    """
-    Uses an LLM to generate a concise summary of the call.
-    """
-    print("--- Generating call summary ---")
-    llm = get_llm(temperature=0.2)
-    
-    prompt = f"""
-    You are a highly skilled paralegal. Based on the following call transcript, please provide a concise, neutral summary of the conversation.
-    Focus on the key issues discussed and the main purpose of the call.
-
-    Transcript:
-    ---
-    {full_transcript_string}
-    ---
-
-    Summary:
-    """
-    
-    response = llm.invoke(prompt)
-    return response.content
+# --- Pipeline stage timing ---
+# Aggregated per-stage timings across calls, exposed under /debug/metrics.
+_stage_stats: Dict[str, Dict[str, float]] = {}
+
+@asynccontextmanager
+async def _stage(name: str, timings: Dict[str, float]):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        timings[name] = round(elapsed, 3)
+        stats = _stage_stats.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        stats["count"] += 1
+        stats["total_seconds"] += elapsed
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+async def _timed(name: str, timings: Dict[str, float], coro):
+    async with _stage(name, timings):
+        return await coro
+
+register_metrics_source("post_call_pipeline", lambda: {
+    name: {**stats, "avg_seconds": round(stats["total_seconds"] / stats["count"], 3)}
+    for name, stats in _stage_stats.items()
+})
+
+async def _find_processed_call(vapi_call_id: Optional[str]):
+    # A call is processed once it opened a case or was appended as a note.
+    if not vapi_call_id:
+        return None
+    query = union_all(
+        select(cases.c.id).where(cases.c.vapi_call_id == vapi_call_id),
+        select(case_notes.c.id).where(case_notes.c.vapi_call_id == vapi_call_id),
+    ).limit(1)
+    return await database.fetch_one(query)
+
+async def _find_existing_case(caller_phone_number: str):
+    # Find the most recent case for this phone number
+    query = (
+        select(cases.c.id, cases.c.case_id)
+        .where(cases.c.caller_phone_number == caller_phone_number)
+        .order_by(cases.c.created_at.desc())
+        .limit(1)
+    )
+    return await database.fetch_one(query)
 
 async def process_call_transcript(final_transcript: List[VapiMessageOpenAI], caller_phone_number: str, vapi_call_id: Optional[str]):
     """
     Main function to process the final transcript after a call ends.
-    1. Generates a new Case ID.
-    2. Formats the transcript into a single string.
-    3. Extracts structured data using the Case Intake tool.
-    4. Generates a narrative summary.
-    5. Compiles everything into a final "Case File" object.
-    6. Saves the case file to the database."""
-    # --- 1. Prevent duplicate processing of the SAME call ---
-    if vapi_call_id:
-        query = select(cases).where(cases.c.vapi_call_id == vapi_call_id)
-        if await database.fetch_one(query):
-            print(f"--- Duplicate webhook for call {vapi_call_id}. Skipping. ---")
-            return
+    Runs as a staged pipeline in which every artifact is computed exactly once:
+    1. lookup: duplicate-call check and existing-case lookup, concurrently.
+    2. format: the transcript is formatted into a single string.
+    3. llm: the summary and (for a first-time caller) the structured intake
+       are generated concurrently.
+    4. persist: a follow-up note is inserted into case_notes or a new case
+       is inserted.
+    Per-stage timings are logged and aggregated under /debug/metrics."""
     if not final_transcript:
         print("--- No transcript data to process. ---")
         return
-    
-# --- 2. Check for EXISTING cases from this caller ---
-    # Find the most recent case for this phone number
-    query = select(cases).where(cases.c.caller_phone_number == caller_phone_number).order_by(cases.c.created_at.desc())
-    existing_case = await database.fetch_one(query)
+    timings: Dict[str, float] = {}
 
-    transcript_text = format_transcript_for_llm(final_transcript)
-    summary = generate_summary_and_notes(transcript_text)
-
-    # --- 3. DECIDE: Update existing case or Insert new one ---
-    if existing_case:
-        # --- UPDATE LOGIC ---
-        print(f"--- Found existing case {existing_case.case_id} for caller. Appending note. ---")
-        
-        # Create a new note object
-        new_note = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "vapi_call_id": vapi_call_id,
-            "summary": summary,
-            "transcript": transcript_text
-        }
-        
-        # Get existing notes, or initialize an empty list
-        existing_notes = existing_case.follow_up_notes or []
-        if isinstance(existing_notes, str): # Handle case where DB returns JSON as string
-            existing_notes = json.loads(existing_notes)
-            
-        existing_notes.append(new_note)
-        
-        # Create and execute the UPDATE query
-        update_query = (
-            update(cases)
-            .where(cases.c.id == existing_case.id)
-            .values(follow_up_notes=existing_notes)
+    # --- 1. Lookups: prevent duplicate processing of the SAME call, find EXISTING cases ---
+    async with _stage("lookup", timings):
+        processed_call, existing_case = await asyncio.gather(
+            _find_processed_call(vapi_call_id),
+            _find_existing_case(caller_phone_number),
         )
-        
-        try:
-            await database.execute(update_query)
-            print(f"--- Successfully appended note to case {existing_case.case_id}. ---")
-        except Exception as e:
-            print(f"--- DATABASE UPDATE ERROR: {e} ---")
-
-    else:
-        # --- INSERT LOGIC (for the first time a caller calls) ---
-        # 1. Generate a unique Case ID
-        case_id = f"CASE-{uuid.uuid4().hex[:8].upper()}"
-        print(f"--- Processing new case: {case_id} ---")
-
-        # 2. Format the raw transcript messages into a single block of text
+    if processed_call:
+        print(f"--- Duplicate webhook for call {vapi_call_id}. Skipping. ---")
+        return
+
+    # --- 2. Format the raw transcript messages into a single block of text ---
+    async with _stage("format", timings):
         transcript_text = format_transcript_for_llm(final_transcript)
-        
-        # 3. Use our existing tool to extract structured data
-        # This is a great example of code reuse!
-        structured_data = case_intake_extractor(transcript_text)
 
-        # 4. Generate a narrative summary of the call
-        summary = generate_summary_and_notes(transcript_text)
-        
-        # 5. Compile the final "Case File"
-        case_file = {
-            "caseId": case_id,
-            "status": "Pending Review",
-            "structuredIntake": structured_data,
-            "callSummary": summary,
-            "fullTranscript": transcript_text
-        }
-        
-        # --- SIMULATE SAVING TO DATABASE ---
-        # In a real application, you would now save the 'case_file' object
-        # to your PostgreSQL, MongoDB, or other database.
-        # For now, we will just print it to the console.
-        print("\n--- COMPILED CASE FILE ---")
-        import json
-        print(json.dumps(case_file, indent=2))
-        print("--------------------------\n")
-        try:
-            print(f"--- Attempting to save case {case_id} to the database. ---")
-            insert_query = cases.insert().values(
-                case_id=case_id,
-                caller_phone_number=caller_phone_number, # <-- Save the number
-                status="Pending Review",
-                # SQLAlchemy expects a JSON string, not a dict, for a JSON column
-                structured_intake=json.dumps(structured_data),
-                call_summary=summary,
-                full_transcript=transcript_text,
-                # The transcript of the FIRST call
-                follow_up_notes=[] # Initialize with an empty list
+    # --- 3. LLM stages (independent, so they run concurrently) ---
+    structured_data = None
+    async with _stage("llm", timings):
+        if existing_case:
+            summary = await _timed("summary", timings, generate_summary_and_notes(transcript_text))
+        else:
+            summary, structured_data = await asyncio.gather(
+                _timed("summary", timings, generate_summary_and_notes(transcript_text)),
+                _timed("intake", timings, extract_case_intake(transcript_text)),
             )
-            # Execute the query asynchronously
-            last_record_id = await database.execute(insert_query)
-            print(f"--- Successfully saved case {case_id} with DB record id {last_record_id}. ---")
+    case_status = "Pending Review"
+    if structured_data is not None and "error" in structured_data:
+        # The extractor answers failures (including BACKGROUND load shedding)
+        # with a placeholder intake. Transient ones are retried; without an
+        # extractor, or on the last attempt, the call is kept as a placeholder
+        # case flagged for a person to fill in.
+        if structured_data["error"] != INTAKE_UNAVAILABLE_ERROR and not is_final_attempt():
+            raise RuntimeError(f"Intake extraction failed: {structured_data['error']}") # Let the job queue retry
+        print(f"--- Intake extraction failed ({structured_data['error']}); saving the case for manual review ---")
+        case_status = "Needs Review"
+
+    # --- 4. DECIDE: Update existing case or Insert new one ---
+    case_file = None
+    async with _stage("persist", timings):
+        if existing_case:
+            # --- APPEND LOGIC: one INSERT into case_notes, whatever the call history ---
+            print(f"--- Found existing case {existing_case.case_id} for caller. Appending note. ---")
+            try:
+                note_id = await add_case_note(existing_case.id, vapi_call_id, summary, transcript_text)
+                print(f"--- Successfully appended note {note_id} to case {existing_case.case_id}. ---")
+            except Exception as e:
+                print(f"--- DATABASE INSERT ERROR: {e} ---")
+                raise # Let the job queue retry
+
+        else:
+            # --- INSERT LOGIC (for the first time a caller calls) ---
+            case_id = f"CASE-{uuid.uuid4().hex[:8].upper()}"
+            print(f"--- Processing new case: {case_id} ---")
+
+            # Compile the final "Case File"
+            case_file = {
+                "caseId": case_id,
+                "status": case_status,
+                "structuredIntake": structured_data,
+                "callSummary": summary,
+                "fullTranscript": transcript_text
+            }
+            try:
+                print(f"--- Attempting to save case {case_id} to the database. ---")
+                # Client link and list columns are resolved once here rather than on every request
+                link_fields = await case_link_fields(structured_data, caller_phone_number)
+                transcript_id = await store_transcript(transcript_text)
+                insert_query = cases.insert().values(
+                    case_id=case_id,
+                    caller_phone_number=caller_phone_number, # <-- Save the number
+                    status=case_status,
+                    # SQLAlchemy expects a JSON string, not a dict, for a JSON column
+                    structured_intake=json.dumps(structured_data),
+                    call_summary=summary,
+                    transcript_id=transcript_id,
+                    vapi_call_id=vapi_call_id,
+                    **link_fields,
+                    # The transcript of the FIRST call
+                    follow_up_notes=[] # Initialize with an empty list
+                )
+                # Execute the query asynchronously
+                last_record_id = await database.execute(insert_query)
+                print(f"--- Successfully saved case {case_id} with DB record id {last_record_id}. ---")
+
+            except Exception as e:
+                print(f"--- DATABASE ERROR: Failed to save case file. Error: {e} ---")
+                raise # Let the job queue retry
+
+    print(f"--- Post-call pipeline timings (s): {timings} ---")
+    return case_file
+
+# --- Background job entry points ---
+POST_CALL_JOB = "post_call"
+
+async def enqueue_call_transcript(final_transcript: List[VapiMessageOpenAI], caller_phone_number: str, vapi_call_id: Optional[str]) -> Optional[int]:
+    """
+    Queues end-of-call processing and returns immediately.
+    Idempotent per vapi_call_id: a retried webhook does not create a second job.
+    """
+    payload = {
+        "transcript": [message.model_dump() for message in final_transcript],
+        "caller_phone_number": caller_phone_number,
+        "vapi_call_id": vapi_call_id,
+    }
+    return await enqueue(POST_CALL_JOB, payload, dedupe_key=vapi_call_id)
 
-        except Exception as e:
-            print(f"--- DATABASE ERROR: Failed to save case file. Error: {e} ---")
-        return case_file
\ No newline at end of file
+@job_handler(POST_CALL_JOB)
+async def run_post_call_job(payload: Dict[str, Any]) -> None:
+    transcript = [VapiMessageOpenAI(**message) for message in payload["transcript"]]
+    with llm_priority(Priority.BACKGROUND):
+        await process_call_transcript(transcript, payload["caller_phone_number"], payload.get("vapi_call_id"))
\ No newline at end of file
@@ -0,0 +1,113 @@
+# backend/app/core/query_plans.py
+
+import json
+from typing import Any, Dict, List, Set
+
+from .database import database
+
+# The hot-path queries (as issued by main.py, post_call_processor.py,
+# case_notes.py and tools.py) and the index each one must be able to use.
+# Literal values stand in for bind parameters; only the plan shape matters.
+HOT_QUERIES: List[Dict[str, str]] = [
+    {
+        "name": "existing_case_by_phone",
+        "sql": "SELECT id, case_id FROM cases WHERE caller_phone_number = '+15550000000' ORDER BY created_at DESC LIMIT 1",
+        "index": "ix_cases_caller_phone_number_created_at",
+    },
+    {
+        "name": "caller_context_cases",
+        "sql": "SELECT case_id, status, call_summary FROM cases WHERE caller_phone_number = '+15550000000'",
+        "index": "ix_cases_caller_phone_number_created_at",
+    },
+    {
+        "name": "case_list_page",
+        "sql": ("SELECT id, case_id, status, last_updated_at FROM cases "
+                "WHERE (last_updated_at, id) < ('2100-01-01', 1000000) ORDER BY last_updated_at DESC, id DESC LIMIT 51"),
+        "index": "ix_cases_last_updated_at_id",
+    },
+    {
+        "name": "case_list_by_type",
+        "sql": ("SELECT id, case_id, case_name, client_name, case_type, status, last_updated_at FROM cases "
+                "WHERE case_type = 'Contract Dispute' ORDER BY last_updated_at DESC, id DESC LIMIT 51"),
+        "index": "ix_cases_case_type_last_updated_at_id",
+    },
+    {
+        "name": "cases_by_client",
+        "sql": "SELECT id, case_id, status FROM cases WHERE client_id = 1",
+        "index": "ix_cases_client_id",
+    },
+    {
+        "name": "search_cases",
+        "sql": "SELECT id FROM cases WHERE search_vector @@ websearch_to_tsquery('english', 'contract dispute')",
+        "index": "ix_cases_search_vector",
+    },
+    {
+        "name": "search_case_notes",
+        "sql": "SELECT case_id FROM case_notes WHERE search_vector @@ websearch_to_tsquery('english', 'contract dispute')",
+        "index": "ix_case_notes_search_vector",
+    },
+    {
+        "name": "duplicate_call_check",
+        "sql": "SELECT id FROM cases WHERE vapi_call_id = 'call-0000'",
+        "index": "uq_cases_vapi_call_id",
+    },
+    {
+        "name": "case_notes_page",
+        "sql": "SELECT id, summary, created_at FROM case_notes WHERE case_id = 1 ORDER BY created_at DESC, id DESC LIMIT 21",
+        "index": "ix_case_notes_case_id_created_at",
+    },
+    {
+        "name": "dashboard_active_contracts",
+        "sql": "SELECT count(*) FROM contracts WHERE status = 'Active'",
+        "index": "ix_contracts_status",
+    },
+    {
+        "name": "dashboard_upcoming_deadlines",
+        "sql": ("SELECT * FROM tasks WHERE due_date >= now() AND status IN ('Pending', 'In Progress') "
+                "ORDER BY due_date ASC LIMIT 5"),
+        "index": "ix_tasks_status_due_date",
+    },
+    {
+        "name": "dashboard_unread_notifications",
+        "sql": "SELECT * FROM notifications WHERE is_read = false ORDER BY created_at DESC LIMIT 5",
+        "index": "ix_notifications_is_read_created_at",
+    },
+    {
+        "name": "dashboard_recent_activity",
+        "sql": "SELECT * FROM activities ORDER BY performed_at DESC LIMIT 5",
+        "index": "ix_activities_performed_at",
+    },
+]
+
+
+def _indexes_in_plan(node: Dict[str, Any]) -> Set[str]:
+    found = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        found |= _indexes_in_plan(child)
+    return found
+
+
+async def check_query_plans() -> List[Dict[str, Any]]:
+    """
+    EXPLAINs every hot query and reports whether its expected index is usable.
+
+    Sequential scans are disabled for the check: on small development tables
+    the planner rightly prefers a seq scan, which says nothing about whether
+    the index would be picked once the table grows. A query that still does
+    not use its index with seq scans off is missing index support.
+    """
+    results = []
+    async with database.transaction(force_rollback=True):
+        await database.execute("SET LOCAL enable_seqscan = off")
+        for query in HOT_QUERIES:
+            plan = await database.fetch_val(f"EXPLAIN (FORMAT JSON) {query['sql']}")
+            if isinstance(plan, str): # asyncpg returns json as text
+                plan = json.loads(plan)
+            used = sorted(_indexes_in_plan(plan[0]["Plan"]))
+            results.append({
+                "name": query["name"],
+                "expected_index": query["index"],
+                "indexes_used": used,
+                "ok": query["index"] in used,
+            })
+    return results
@@ -69,6 +69,7 @@ class DashboardData(BaseModel):
     recent_activity: List[RecentActivity]
     upcoming_deadlines: List[UpcomingDeadline]
     notifications: List[Notification]
+    events_cursor: Optional[str] = None # Open /api/events/stream from here (?last_event_id=)
 
     # --- NEW CLIENTS-RELATED SCHEMAS ---
 class Client(BaseModel):
@@ -84,7 +85,7 @@ class Client(BaseModel):
     # Optional: Add a field for the count of cases,
     # as this is displayed on the frontend.
     # This won't be directly from the 'clients' table, but from a join/subquery.
-    num_cases: int = 0 # Default to 0, will be populated by API logic
+    num_cases: int = 0 # Maintained by a trigger on cases (migration 0006)
 
     # --- NEW CASES-RELATED SCHEMAS ---
 class Case(BaseModel):
@@ -102,7 +103,7 @@ class Case(BaseModel):
     structured_intake: Dict[str, Any] # This is the parsed JSON
     call_summary: Optional[str] = None
     full_transcript: Optional[str] = None
-    follow_up_notes: List[Dict[str, Any]] = [] # This is the parsed JSONB list
+    # Follow-up notes are no longer inlined; see /api/cases/{case_id}/notes
     created_at: datetime
     vapi_call_id: Optional[str] = None
         # This configuration tells Pydantic how to handle aliases for input data
@@ -111,4 +112,69 @@ class Case(BaseModel):
         # For Pydantic v2, `from_attributes = True` is used for ORM models,
         # but for dict input, aliases should work directly.
         # Let's add it anyway as it can help with mappings
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CaseNote(BaseModel):
+    id: int
+    vapi_call_id: Optional[str] = None
+    summary: Optional[str] = None
+    transcript: Optional[str] = None # Only returned with include_transcripts=true
+    created_at: datetime
+
+class CaseNotesPage(BaseModel):
+    items: List[CaseNote]
+    next_cursor: Optional[str] = None # Pass back as ?cursor= for the next (older) page
+
+# --- BULK IMPORT (see bulk_import.py) ---
+# One model per importable entity; each CSV / NDJSON row is validated against it.
+# Missing public ids (client_id, case_id, contract_id) are generated on import.
+# Import rows: string lengths are the widths of the columns they load into
+# (database.py), so an oversized value is reported for its line instead of
+# failing the database insert.
+class ClientImportRow(BaseModel):
+    client_id: Optional[str] = Field(default=None, max_length=50)
+    name: str = Field(max_length=255)
+    contact_email: str = Field(max_length=255)
+    phone_number: Optional[str] = Field(default=None, max_length=50)
+    status: str = Field(default="Active", max_length=50)
+    last_activity_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    notes: Optional[str] = None
+
+class CaseImportRow(BaseModel):
+    case_id: Optional[str] = Field(default=None, max_length=50)
+    caller_phone_number: Optional[str] = Field(default=None, max_length=50)
+    client_email: Optional[str] = None # Links the case to a client when the phone number does not
+    status: str = Field(default="Pending Review", max_length=50)
+    structured_intake: Optional[CaseIntake] = None # Its list columns are truncated to fit (case_fields.py)
+    call_summary: Optional[str] = None
+    full_transcript: Optional[str] = None
+    assigned_to: Optional[str] = Field(default=None, max_length=255)
+    created_at: Optional[datetime] = None
+    last_updated_at: Optional[datetime] = None
+
+class ContractImportRow(BaseModel):
+    contract_id: Optional[str] = Field(default=None, max_length=50)
+    name: str = Field(max_length=255)
+    client_phone_number: Optional[str] = None # Client link, by phone number ...
+    client_email: Optional[str] = None # ... or by contact email
+    status: str = Field(default="Active", max_length=50)
+    signed_date: Optional[datetime] = None
+    expiration_date: Optional[datetime] = None
+    last_reviewed_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportReport(BaseModel):
+    entity: str
+    rows_read: int
+    inserted: int
+    duplicates: int # Rows skipped because the client / case / contract already exists
+    failed: int # Rows that did not validate, could not be parsed or were rejected by the database
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: List[ImportRowError] # Capped at BULK_IMPORT_MAX_REPORTED_ERRORS
+    errors_truncated: bool = False
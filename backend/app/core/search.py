@@ -0,0 +1,105 @@
+# backend/app/core/search.py
+
+import html
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from .database import database
+from .pagination import decode_cursor, encode_cursor
+
+MAX_SEARCH_PAGE_SIZE = 100
+
+# ts_headline does not escape the document text, so matches are marked with
+# placeholders and the snippet is HTML-escaped before they become <mark> tags.
+_MARK_START = "[[[mark]]]"
+_MARK_END = "[[[/mark]]]"
+_HEADLINE_OPTIONS = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxFragments=2, MaxWords=25, MinWords=10"
+
+# Cases match on their own search_vector or through any of their notes; each
+# case is ranked by its best match. Snippets (and the transcripts they are
+# cut from) are only built for the page.
+_SEARCH_SQL = """
+WITH q AS (SELECT websearch_to_tsquery('english', :q) AS query),
+hits AS (
+    SELECT c.id AS case_pk, ts_rank_cd(c.search_vector, q.query) AS rank, NULL::integer AS note_id
+    FROM cases c, q
+    WHERE c.search_vector @@ q.query
+    UNION ALL
+    SELECT n.case_id, ts_rank_cd(n.search_vector, q.query), n.id
+    FROM case_notes n, q
+    WHERE n.search_vector @@ q.query
+),
+best AS (
+    SELECT DISTINCT ON (case_pk) case_pk, rank, note_id
+    FROM hits
+    ORDER BY case_pk, rank DESC
+),
+page AS (
+    SELECT case_pk, rank, note_id
+    FROM best
+    {after}
+    ORDER BY rank DESC, case_pk DESC
+    LIMIT :limit
+)
+SELECT
+    c.id, c.case_id,
+    coalesce(c.case_name, 'N/A') AS case_name,
+    coalesce(c.client_name, 'Unknown Client') AS client_name,
+    coalesce(c.case_type, 'N/A') AS type,
+    c.status, c.assigned_to, c.last_updated_at AS last_updated, c.created_at,
+    page.rank, page.note_id,
+    ts_headline(
+        'english',
+        CASE WHEN page.note_id IS NULL THEN concat_ws(' ... ', c.call_summary, t.body)
+             ELSE concat_ws(' ... ', n.summary, t.body) END,
+        q.query,
+        :headline_options
+    ) AS snippet
+FROM page
+JOIN cases c ON c.id = page.case_pk
+LEFT JOIN case_notes n ON n.id = page.note_id
+LEFT JOIN transcripts t ON t.id = CASE WHEN page.note_id IS NULL THEN c.transcript_id ELSE n.transcript_id END
+CROSS JOIN q
+ORDER BY page.rank DESC, page.case_pk DESC
+"""
+
+
+def _safe_snippet(snippet: Optional[str]) -> str:
+    escaped = html.escape(snippet or "")
+    return escaped.replace(html.escape(_MARK_START), "<mark>").replace(html.escape(_MARK_END), "</mark>")
+
+
+async def search_cases(q: str, limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Cases matching a web-search style query (quoted phrases, OR, -exclusion)
+    in their names, intake, summary or transcript, or in any follow-up note.
+    Best match first, keyset-paginated on (rank, id). Each item carries the
+    case list fields plus rank, matched_in ("case" or "note") and an
+    HTML-safe snippet with the matches wrapped in <mark>.
+    """
+    if not q or not q.strip():
+        raise HTTPException(status_code=400, detail="Query parameter q is required")
+
+    values = {"q": q, "limit": limit + 1, "headline_options": _HEADLINE_OPTIONS}
+    after = decode_cursor(cursor, 2)
+    if after:
+        if not all(isinstance(v, (int, float)) for v in after):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        values["after_rank"], values["after_id"] = float(after[0]), int(after[1])
+    sql = _SEARCH_SQL.format(after="WHERE (rank, case_pk) < (:after_rank, :after_id)" if after else "")
+
+    rows = await database.fetch_all(query=sql, values=values)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = []
+    for row in rows:
+        item = dict(row)
+        note_id = item.pop("note_id")
+        item["matched_in"] = "note" if note_id is not None else "case"
+        item["snippet"] = _safe_snippet(item["snippet"])
+        items.append(item)
+
+    next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["id"]) if has_more else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,200 @@
+# backend/app/core/summarization.py
+
+import asyncio
+import json
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from . import config
+from .llm_factory import get_llm
+from .metrics import register_metrics_source
+from .tools import case_intake_extractor_async
+
+_stats = {"single_shot": 0, "map_reduce": 0, "chunks": 0, "reduce_rounds": 0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); good enough for budgeting chunks."""
+    return len(text) // 4 + 1
+
+
+def split_transcript(transcript: str, max_tokens: int) -> List[str]:
+    """
+    Splits a formatted transcript ("Role: content" per line) into chunks of
+    whole turns, each within max_tokens. A single turn longer than the budget
+    is cut into pieces on its own.
+    """
+    max_chars = max_tokens * 4
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for turn in transcript.splitlines(keepends=True):
+        pieces = [turn[i:i + max_chars] for i in range(0, len(turn), max_chars)] or [turn]
+        for piece in pieces:
+            if current and current_len + len(piece) > max_chars:
+                chunks.append("".join(current))
+                current, current_len = [], 0
+            current.append(piece)
+            current_len += len(piece)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+async def _map_chunks(fn: Callable[[Any], Awaitable[Any]], items: List[Any]) -> List[Any]:
+    """Runs fn over every item concurrently, at most SUMMARY_MAX_PARALLEL_CHUNKS at a time."""
+    semaphore = asyncio.Semaphore(config.SUMMARY_MAX_PARALLEL_CHUNKS)
+
+    async def _run(item: Any) -> Any:
+        async with semaphore:
+            return await fn(item)
+
+    _stats["chunks"] += len(items)
+    return await asyncio.gather(*(_run(item) for item in items))
+
+
+# --- Summary ---
+_MAX_INTERMEDIATE_REDUCE_ROUNDS = 3
+
+_summary_llm = None
+
+def _get_summary_llm():
+    # Built once and reused; constructing a provider client per call is wasted work.
+    global _summary_llm
+    if _summary_llm is None:
+        _summary_llm = get_llm(temperature=0.2)
+    return _summary_llm
+
+
+async def _summarise(full_transcript_string: str) -> str:
+    prompt = f"""
+    You are a highly skilled paralegal. Based on the following call transcript, please provide a concise, neutral summary of the conversation.
+    Focus on the key issues discussed and the main purpose of the call.
+
+    Transcript:
+    ---
+    {full_transcript_string}
+    ---
+
+    Summary:
+    """
+    response = await _get_summary_llm().ainvoke(prompt)
+    return response.content
+
+
+async def _summarise_part(part: str, index: int, total: int) -> str:
+    prompt = f"""
+    You are a highly skilled paralegal. The following is part {index} of {total} of a long call transcript.
+    Summarise this part concisely and neutrally. Keep every name, date, amount and commitment that is mentioned.
+
+    Transcript (part {index} of {total}):
+    ---
+    {part}
+    ---
+
+    Summary of this part:
+    """
+    response = await _get_summary_llm().ainvoke(prompt)
+    return response.content
+
+
+async def _combine_summaries(partial_summaries: List[str]) -> str:
+    joined = "\n\n".join(f"Part {i + 1}:\n{summary}" for i, summary in enumerate(partial_summaries))
+    prompt = f"""
+    You are a highly skilled paralegal. Below are summaries of consecutive parts of one call, in order.
+    Combine them into a single concise, neutral summary of the whole conversation.
+    Focus on the key issues discussed and the main purpose of the call.
+
+    {joined}
+
+    Summary:
+    """
+    response = await _get_summary_llm().ainvoke(prompt)
+    return response.content
+
+
+async def generate_summary_and_notes(full_transcript_string: str) -> str:
+    """
+    Uses an LLM to generate a concise summary of the call.
+    Long transcripts are summarised part by part in parallel and the partial
+    summaries are then combined (repeatedly, if they are still too long).
+    """
+    if estimate_tokens(full_transcript_string) <= config.SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS:
+        print("--- Generating call summary ---")
+        _stats["single_shot"] += 1
+        return await _summarise(full_transcript_string)
+
+    _stats["map_reduce"] += 1
+    chunks = split_transcript(full_transcript_string, config.SUMMARY_CHUNK_TOKENS)
+    print(f"--- Generating call summary (map-reduce over {len(chunks)} parts) ---")
+    summaries = await _map_chunks(
+        lambda item: _summarise_part(item[1], item[0] + 1, len(chunks)), list(enumerate(chunks))
+    )
+
+    # Reduce until the partial summaries fit into one prompt (bounded, in case
+    # the model does not shorten them).
+    for _ in range(_MAX_INTERMEDIATE_REDUCE_ROUNDS):
+        if len(summaries) <= 1 or estimate_tokens("\n\n".join(summaries)) <= config.SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS:
+            break
+        _stats["reduce_rounds"] += 1
+        groups = split_transcript("\n".join(s.replace("\n", " ") for s in summaries), config.SUMMARY_CHUNK_TOKENS)
+        summaries = await _map_chunks(lambda group: _combine_summaries(group.splitlines()), groups)
+    _stats["reduce_rounds"] += 1
+    return await _combine_summaries(summaries)
+
+
+# --- Case intake ---
+def _most_common(values: List[Optional[str]], unknown: str = "Unknown") -> Optional[str]:
+    known = [v for v in values if v and v.strip() and v != unknown]
+    return Counter(known).most_common(1)[0][0] if known else None
+
+
+def merge_case_intakes(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Deterministically merges per-chunk CaseIntake extractions into one."""
+    usable = [p for p in partials if "error" not in p]
+    failed = bool(partials) and not usable
+    usable = usable or partials
+    key_dates: List[str] = []
+    for partial in usable:
+        for date in partial.get("key_dates") or []:
+            if date not in key_dates:
+                key_dates.append(date)
+    facts = [p.get("summary_of_facts") or p.get("summary") for p in usable]
+    merged = {
+        "client_name": _most_common([p.get("client_name") for p in usable]) or "Unknown",
+        "opposing_party": _most_common([p.get("opposing_party") for p in usable]),
+        "case_type": _most_common([p.get("case_type") for p in usable]) or "Unknown",
+        "summary_of_facts": "\n\n".join(f for f in facts if f),
+        "key_dates": key_dates,
+    }
+    if failed: # Every part failed: keep the error so callers can tell this is a placeholder
+        merged["error"] = partials[0]["error"]
+    return merged
+
+
+async def extract_case_intake(transcript: str) -> Dict[str, Any]:
+    """
+    Extracts a CaseIntake dict from a transcript or free text.
+    Long inputs are extracted chunk by chunk in parallel; the partial
+    extractions are then consolidated by one more structured LLM call, with a
+    deterministic merge as the fallback.
+    """
+    if estimate_tokens(transcript) <= config.SUMMARY_MAP_REDUCE_THRESHOLD_TOKENS:
+        return await case_intake_extractor_async(transcript)
+
+    chunks = split_transcript(transcript, config.SUMMARY_CHUNK_TOKENS)
+    print(f"--- Running Case Intake Extractor (map-reduce over {len(chunks)} parts) ---")
+    partials = await _map_chunks(case_intake_extractor_async, chunks)
+    merged = merge_case_intakes(partials)
+    if "error" in merged:
+        return merged # Nothing was extracted; there is nothing to consolidate
+
+    consolidated = await case_intake_extractor_async(
+        "The following are case details extracted from consecutive parts of one long conversation. "
+        "Consolidate them into the details of the single case being discussed:\n\n"
+        + json.dumps(merged, indent=2)
+    )
+    return merged if "error" in consolidated else consolidated
+
+
+register_metrics_source("summarization", lambda: dict(_stats))
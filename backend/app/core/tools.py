@@ -7,6 +7,9 @@ from .schemas import CaseIntake
 from .llm_factory import get_llm
 from .rag_pipeline import create_rag_chain
 from .database import database, cases
+from .coalescing import get_single_flight, text_key
+from .fakes import FakeWebSearchTool
+from . import config
 from sqlalchemy import select
 import json
 import asyncio
@@ -69,34 +72,57 @@ def legal_document_retriever_sync(query: str) -> str:
         traceback.print_exc()
         return f"An error occurred while retrieving internal legal documents: {e}"
 
+async def legal_document_retriever_async(query: str) -> str:
+    """
+    Async version of the RAG retriever. Identical questions that arrive while
+    an answer is already being generated share that single retrieval + generation.
+    """
+    print(f"DEBUG: LegalDocumentRetriever (async) called with query: '{query}'")
+    if rag_chain is None:
+        return "Error: Internal RAG system not initialized. Please check server logs."
+
+    try:
+        result = await get_single_flight("rag_chain").do(text_key(query), lambda: rag_chain.ainvoke(query))
+        if isinstance(result, dict) and "answer" in result:
+            return result["answer"]
+        return result if isinstance(result, str) else str(result)
+    except Exception as e:
+        print(f"ERROR: Exception in LegalDocumentRetriever for query '{query}': {e}")
+        return f"An error occurred while retrieving internal legal documents: {e}"
+
 LegalDocumentRetrieverTool = Tool(
     name="Internal_Legal_Document_Retriever",
     func=legal_document_retriever_sync,
+    coroutine=legal_document_retriever_async,
     description="""Use this tool to answer questions about internal legal documents, 
     case files, contracts, and other documents stored within the firm's private knowledge base. 
     This is your primary tool for retrieving specific information from the firm's data like 'What is the termination policy in the Innovate Corp agreement?'."""
 )
 
 # --- Tool 2: Web Search ---
-try:
-    WebSearchTool = TavilySearch(
-        name="Live_Web_Search",
-        k=5,  # Number of results to return
-        description="""Use this tool to search the live internet for recent information,
-        current events, breaking news, or information about new case law or regulations
-        that may not be in the internal knowledge base. For example, use it to answer 'What were the results of the latest Supreme Court ruling on AI copyright?'."""
-    )
-except Exception as e:
-    print(f"WARNING: Failed to initialize Tavily search tool: {e}")
-    # Create a dummy tool as fallback
-    def dummy_search(query: str) -> str:
-        return "Web search is currently unavailable. Please check your Tavily API key configuration."
-    
-    WebSearchTool = Tool(
-        name="Live_Web_Search",
-        func=dummy_search,
-        description="Web search tool (currently unavailable)"
-    )
+if config.WEB_SEARCH_PROVIDER == "fake":
+    print("--- Using fake offline web search ---")
+    WebSearchTool = FakeWebSearchTool
+else:
+    try:
+        WebSearchTool = TavilySearch(
+            name="Live_Web_Search",
+            k=5,  # Number of results to return
+            description="""Use this tool to search the live internet for recent information,
+            current events, breaking news, or information about new case law or regulations
+            that may not be in the internal knowledge base. For example, use it to answer 'What were the results of the latest Supreme Court ruling on AI copyright?'."""
+        )
+    except Exception as e:
+        print(f"WARNING: Failed to initialize Tavily search tool: {e}")
+        # Create a dummy tool as fallback
+        def dummy_search(query: str) -> str:
+            return "Web search is currently unavailable. Please check your Tavily API key configuration."
+        
+        WebSearchTool = Tool(
+            name="Live_Web_Search",
+            func=dummy_search,
+            description="Web search tool (currently unavailable)"
+        )
 
 # --- Tool 3: Case Intake Information Extractor ---
 class CaseIntakeInput(BaseModel):
@@ -109,6 +135,21 @@ except Exception as e:
     print(f"WARNING: Failed to create structured LLM: {e}")
     structured_llm = None
 
+# The fallback's error when no structured LLM is configured: retrying cannot help.
+INTAKE_UNAVAILABLE_ERROR = "Case intake extractor not available. Please check LLM configuration."
+
+def _intake_fallback(interview_summary: str, error: str) -> dict:
+    """Placeholder intake returned when extraction is unavailable or fails."""
+    return {
+        "error": error,
+        "client_name": "Unknown",
+        "case_type": "Unknown",
+        "summary": interview_summary[:200] + "..." if len(interview_summary) > 200 else interview_summary
+    }
+
+def _intake_prompt(interview_summary: str) -> str:
+    return f"Please extract the case details from the following text: \n\n{interview_summary}"
+
 def case_intake_extractor(interview_summary: str) -> dict:
     """
     Processes an unstructured interview summary and extracts structured case data.
@@ -116,28 +157,41 @@ def case_intake_extractor(interview_summary: str) -> dict:
     print("--- Running Case Intake Extractor ---")
     
     if structured_llm is None:
-        return {
-            "error": "Case intake extractor not available. Please check LLM configuration.",
-            "client_name": "Unknown",
-            "case_type": "Unknown",
-            "summary": interview_summary[:200] + "..." if len(interview_summary) > 200 else interview_summary
-        }
+        return _intake_fallback(interview_summary, INTAKE_UNAVAILABLE_ERROR)
     
     try:
-        result = structured_llm.invoke(f"Please extract the case details from the following text: \n\n{interview_summary}")
+        result = structured_llm.invoke(_intake_prompt(interview_summary))
         return result.dict() if hasattr(result, 'dict') else result
     except Exception as e:
         print(f"ERROR in case_intake_extractor: {e}")
-        return {
-            "error": f"Extraction failed: {str(e)}",
-            "client_name": "Unknown",
-            "case_type": "Unknown", 
-            "summary": interview_summary[:200] + "..." if len(interview_summary) > 200 else interview_summary
-        }
+        return _intake_fallback(interview_summary, f"Extraction failed: {str(e)}")
+
+async def case_intake_extractor_async(interview_summary: str) -> dict:
+    """
+    Async version of the case intake extractor. Concurrent requests for the
+    same text (e.g. a retried webhook or a double-submitted form) share one LLM call.
+    """
+    print("--- Running Case Intake Extractor (async) ---")
+
+    if structured_llm is None:
+        return _intake_fallback(interview_summary, INTAKE_UNAVAILABLE_ERROR)
+
+    async def _extract() -> dict:
+        result = await structured_llm.ainvoke(_intake_prompt(interview_summary))
+        return result.dict() if hasattr(result, 'dict') else result
+
+    try:
+        result = await get_single_flight("case_intake").do(text_key(interview_summary), _extract)
+        # Every waiter gets its own copy so callers can mutate the dict freely.
+        return dict(result)
+    except Exception as e:
+        print(f"ERROR in case_intake_extractor_async: {e}")
+        return _intake_fallback(interview_summary, f"Extraction failed: {str(e)}")
 
 CaseIntakeExtractorTool = Tool(
     name="Case_Intake_Information_Extractor",
     func=case_intake_extractor,
+    coroutine=case_intake_extractor_async,
     args_schema=CaseIntakeInput,
     description="""Use this tool to process a new client interview summary or an unstructured block of text about a new case.
     It will extract key details like client name, opposing party, case type, and a summary of facts into a structured format.
@@ -163,24 +217,28 @@ def database_case_reader_sync(phone_number: str) -> str:
         print(f"Database tool error: {e}")
         return "An error occurred while trying to access the database."
 
+async def _read_cases_for_phone(phone_number: str) -> str:
+    query = select(cases.c.case_id, cases.c.status, cases.c.call_summary).where(cases.c.caller_phone_number == phone_number)
+    results = await database.fetch_all(query)
+
+    if not results:
+        return f"No existing cases found for the phone number {phone_number}."
+
+    formatted_results = "Found the following cases for this caller:\n"
+    for row in results:
+        case_data = dict(row)
+        formatted_results += f"- Case ID: {case_data['case_id']}, Status: {case_data['status']}, Summary: {case_data['call_summary']}\n"
+
+    return formatted_results
+
 async def database_case_reader_async(phone_number: str) -> str:
     """
     Async version of database case reader.
+    Concurrent lookups for the same caller share a single database query.
     """
     print(f"--- Running Database Case Reader Tool for: {phone_number} ---")
     try:
-        query = select(cases.c.case_id, cases.c.status, cases.c.call_summary, cases.c.full_transcript).where(cases.c.caller_phone_number == phone_number)
-        results = await database.fetch_all(query)
-        
-        if not results:
-            return f"No existing cases found for the phone number {phone_number}."
-        
-        formatted_results = "Found the following cases for this caller:\n"
-        for row in results:
-            case_data = dict(row)
-            formatted_results += f"- Case ID: {case_data['case_id']}, Status: {case_data['status']}, Summary: {case_data['call_summary']}\n"
-        
-        return formatted_results
+        return await get_single_flight("caller_context").do(phone_number, lambda: _read_cases_for_phone(phone_number))
     except Exception as e:
         print(f"Database tool error: {e}")
         return "An error occurred while trying to access the database."
@@ -1,46 +1,172 @@
 # backend/app/core/transcription.py
 
-import whisper
+import wave
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Union
 
-# Initialize the Whisper model. This will download the model weights
-# the first time it's run. We'll use the 'small.en' model.
-# The 'load_model' function handles everything.
-print("--- Initializing Whisper STT model (openai-whisper) ---")
-try:
-    # The model is downloaded to ~/.cache/whisper
-    whisper_model = whisper.load_model("small.en")
-    print("--- Whisper STT model initialized ---")
-except Exception as e:
-    print(f"Error loading Whisper model: {e}")
-    whisper_model = None
+from . import config
+from .fakes import fake_transcribe_audio, fake_transcribe_audio_file
 
+# The engine is created by load_stt_model(), which transcription_pool.py calls
+# once in each worker process. The API process never loads a model.
+stt_engine: Optional["STTEngine"] = None
 
-def transcribe_audio_file(file_path: str) -> str:
+# Audio is either a file path, or raw PCM already decoded by ffmpeg: 16 kHz
+# mono signed 16-bit little-endian (audio_upload.py, long_audio.py).
+Audio = Union[str, bytes]
+PCM_SAMPLE_RATE = 16000
+
+
+def _model_input(audio: Audio):
+    """A path as is; PCM as the float32 array in [-1, 1] both Whisper engines accept."""
+    if isinstance(audio, str):
+        return audio
+    import numpy as np
+
+    return np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+class STTEngine(ABC):
+    """A speech-to-text model: turns audio into timed segments."""
+
+    name = "base"
+
+    @abstractmethod
+    def segments(self, audio: Audio) -> List[Dict[str, Any]]:
+        """Timed segments ({"start", "end", "text"}, seconds from the start of the audio)."""
+
+
+class WhisperEngine(STTEngine):
+    """openai-whisper in float32 on the CPU (PyTorch)."""
+
+    name = "whisper"
+
+    def __init__(self, model_name: str):
+        import whisper
+
+        # Initialize the Whisper model. This will download the model weights
+        # the first time it's run (to ~/.cache/whisper).
+        self.model = whisper.load_model(model_name)
+
+    def segments(self, audio: Audio) -> List[Dict[str, Any]]:
+        result = self.model.transcribe(_model_input(audio), fp16=False)
+        return [
+            {"start": float(segment["start"]), "end": float(segment["end"]), "text": segment["text"].strip()}
+            for segment in result.get("segments", [])
+        ]
+
+
+class FasterWhisperEngine(STTEngine):
+    """
+    The same Whisper weights converted to CTranslate2 (faster-whisper) and
+    quantized to FASTER_WHISPER_COMPUTE_TYPE ("int8" by default): a fraction
+    of the memory of WhisperEngine and several times faster on CPUs.
+    """
+
+    name = "faster-whisper"
+
+    def __init__(self, model_name: str, threads: int):
+        from faster_whisper import WhisperModel
+
+        # Converted weights are downloaded from the Hugging Face hub the first time.
+        self.model = WhisperModel(
+            model_name, device="cpu", compute_type=config.FASTER_WHISPER_COMPUTE_TYPE, cpu_threads=threads,
+        )
+
+    def segments(self, audio: Audio) -> List[Dict[str, Any]]:
+        # Greedy decoding, as openai-whisper does by default; segments is a lazy generator.
+        segments, _info = self.model.transcribe(_model_input(audio), beam_size=config.FASTER_WHISPER_BEAM_SIZE)
+        return [
+            {"start": float(segment.start), "end": float(segment.end), "text": segment.text.strip()}
+            for segment in segments
+        ]
+
+
+class FakeEngine(STTEngine):
+    """Deterministic offline stand-in (fakes.py)."""
+
+    name = "fake"
+
+    def segments(self, audio: Audio) -> List[Dict[str, Any]]:
+        if isinstance(audio, bytes):
+            return [{"start": 0.0, "end": len(audio) / 2 / PCM_SAMPLE_RATE, "text": fake_transcribe_audio(audio)}]
+        try:
+            with wave.open(audio, "rb") as wav:
+                duration = wav.getnframes() / wav.getframerate()
+        except (wave.Error, EOFError):
+            duration = 0.0 # Only WAV files have a length we can read without ffmpeg
+        return [{"start": 0.0, "end": duration, "text": fake_transcribe_audio_file(audio)}]
+
+
+def create_stt_engine(provider: str) -> STTEngine:
+    """Factory for the engine named by STT_PROVIDER ("whisper", "faster-whisper" or "fake")."""
+    if provider == "whisper":
+        print(f"--- Loading Whisper STT model {config.WHISPER_MODEL} (openai-whisper) ---")
+        return WhisperEngine(config.WHISPER_MODEL)
+    elif provider == "faster-whisper":
+        print(f"--- Loading Whisper STT model {config.WHISPER_MODEL} "
+              f"(faster-whisper, {config.FASTER_WHISPER_COMPUTE_TYPE}) ---")
+        return FasterWhisperEngine(config.WHISPER_MODEL, config.TRANSCRIPTION_CORES_PER_WORKER)
+    elif provider == "fake":
+        print("--- Using fake STT provider, skipping model load ---")
+        return FakeEngine()
+    else:
+        raise ValueError(f"Unsupported STT provider: {provider}")
+
+
+def load_stt_model() -> None:
+    """
+    Creates the STT_PROVIDER engine. Raises if it cannot be loaded (missing
+    model, out of memory): the worker process then exits before reporting
+    ready, and the pool restarts it after a delay.
+    """
+    global stt_engine
+    try:
+        stt_engine = create_stt_engine(config.STT_PROVIDER)
+        print(f"--- STT engine {stt_engine.name} initialized ---")
+    except Exception as e:
+        print(f"Error loading STT model: {e}")
+        stt_engine = None
+        raise
+
+
+def transcribe_audio_file(audio: Audio) -> str:
     """
-    Transcribes the audio file at the given path using the Whisper model.
-    
+    Transcribes an audio file (or decoded PCM) with the configured engine.
+    Blocking and CPU-heavy: call it through transcription_pool, never on
+    the event loop.
+
     Args:
-        file_path: The path to the audio file.
-    
+        audio: The path to the audio file, or 16 kHz mono s16le PCM.
+
     Returns:
         The transcribed text.
     """
-    if not whisper_model:
-        print("ERROR (transcription.py): Whisper model not loaded.")
+    if not stt_engine:
+        print("ERROR (transcription.py): STT model not loaded.")
         return "Whisper model not loaded. Cannot transcribe."
-        
-    print(f"--- Transcribing audio file: {file_path} ---")
-    
-    try:
-        result = whisper_model.transcribe(file_path, fp16=False)
-        text = result.get("text", "").strip() # Ensure strip() is applied right away
 
-        print(f"DEBUG (transcription.py): Raw Whisper result keys: {result.keys()}")
-        print(f"DEBUG (transcription.py): Extracted text from Whisper: '{text[:100]}...'")
-        
+    source = audio if isinstance(audio, str) else f"{len(audio) / 2 / PCM_SAMPLE_RATE:.1f}s of PCM"
+    print(f"--- Transcribing audio: {source} ({stt_engine.name}) ---")
+
+    try:
+        text = " ".join(segment["text"] for segment in stt_engine.segments(audio) if segment["text"])
+        print(f"DEBUG (transcription.py): Extracted text: '{text[:100]}...'")
         return text
     except Exception as e:
-        print(f"ERROR (transcription.py): Exception during Whisper transcription: {e}")
+        print(f"ERROR (transcription.py): Exception during transcription: {e}")
         import traceback
         traceback.print_exc()
-        return f"Transcription failed due to internal Whisper error: {e}"
\ No newline at end of file
+        return f"Transcription failed due to internal Whisper error: {e}"
+
+
+def transcribe_audio_segments(audio: Audio) -> List[Dict[str, Any]]:
+    """
+    Like transcribe_audio_file, but returns the engine's timed segments
+    ({"start", "end", "text"}, seconds from the start of the audio) and
+    raises on failure. Used by /transcribe-audio and for the chunks of long
+    recordings (long_audio.py).
+    """
+    if not stt_engine:
+        raise RuntimeError("STT model not loaded")
+    return stt_engine.segments(audio)
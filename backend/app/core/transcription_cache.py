@@ -0,0 +1,114 @@
+# backend/app/core/transcription_cache.py
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+from . import config
+from .database import database
+from .metrics import register_metrics_source
+
+# Earlier /transcribe-audio and transcription job results (migration 0011),
+# keyed by the SHA-256 of the uploaded bytes, the engine and the mode, so a
+# retried upload of the same recording is answered from the database instead
+# of the transcription pool.
+# The cache is best effort: a database error is logged and counted, and the
+# request transcribes as if nothing were cached.
+
+_PRUNE_INTERVAL_SECONDS = 3600.0
+
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "pruned": 0, "errors": 0}
+_last_prune = 0.0
+
+
+def engine_key() -> str:
+    """What produced a transcript: a different model or precision must not reuse it."""
+    if config.STT_PROVIDER == "faster-whisper":
+        return f"faster-whisper:{config.WHISPER_MODEL}:{config.FASTER_WHISPER_COMPUTE_TYPE}:beam{config.FASTER_WHISPER_BEAM_SIZE}"
+    if config.STT_PROVIDER == "whisper":
+        return f"whisper:{config.WHISPER_MODEL}"
+    return config.STT_PROVIDER
+
+
+def chunked_mode(chunk_seconds: float) -> str:
+    """The stored mode of a chunked result: chunk boundaries, and so its segments, depend on the chunk length."""
+    return f"chunked:{chunk_seconds:g}"
+
+
+def resolve_mode(mode: str, audio_seconds: float) -> str:
+    """
+    The stored mode a /transcribe-audio mode stands for at this recording
+    length: "single", or chunked_mode() at LONG_AUDIO_CHUNK_SECONDS. Stored
+    modes (e.g. a transcription job's chunked_mode()) pass through.
+    """
+    if mode == "auto":
+        mode = "chunked" if audio_seconds >= config.LONG_AUDIO_THRESHOLD_SECONDS else "single"
+    return chunked_mode(config.LONG_AUDIO_CHUNK_SECONDS) if mode == "chunked" else mode
+
+
+async def get_cached_transcription(audio_sha256: bytes, mode: str) -> Optional[Dict[str, Any]]:
+    """The stored result for this audio, engine and mode ("auto" included), or None."""
+    if config.TRANSCRIPTION_CACHE_TTL_DAYS <= 0:
+        return None
+    try:
+        # At most one row per mode; the stored length tells which one "auto" means.
+        rows = await database.fetch_all(
+            "SELECT mode, audio_seconds, result FROM transcription_cache WHERE audio_sha256 = :audio_sha256 AND engine = :engine",
+            values={"audio_sha256": audio_sha256, "engine": engine_key()},
+        )
+        row = next((r for r in rows if r["mode"] == resolve_mode(mode, r["audio_seconds"])), None)
+        if row is None:
+            _stats["misses"] += 1
+            return None
+        await database.execute(
+            """
+            UPDATE transcription_cache SET hits = hits + 1, last_used_at = now()
+            WHERE audio_sha256 = :audio_sha256 AND engine = :engine AND mode = :mode
+            """,
+            values={"audio_sha256": audio_sha256, "engine": engine_key(), "mode": row["mode"]},
+        )
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"⚠️ Transcription cache lookup failed: {e}")
+        return None
+    _stats["hits"] += 1
+    result = row["result"]
+    return json.loads(result) if isinstance(result, str) else result # asyncpg returns JSONB as text
+
+
+async def store_cached_transcription(audio_sha256: bytes, mode: str, audio_seconds: float, result: Dict[str, Any]) -> None:
+    """Stores a result under its resolved mode (resolve_mode())."""
+    global _last_prune
+    if config.TRANSCRIPTION_CACHE_TTL_DAYS <= 0:
+        return
+    try:
+        await database.execute(
+            """
+            INSERT INTO transcription_cache (audio_sha256, engine, mode, audio_seconds, result)
+            VALUES (:audio_sha256, :engine, :mode, :audio_seconds, CAST(:result AS JSONB))
+            ON CONFLICT (audio_sha256, engine, mode) DO UPDATE
+                SET audio_seconds = EXCLUDED.audio_seconds, result = EXCLUDED.result, last_used_at = now()
+            """,
+            values={
+                "audio_sha256": audio_sha256, "engine": engine_key(), "mode": mode,
+                "audio_seconds": audio_seconds, "result": json.dumps(result),
+            },
+        )
+        _stats["stores"] += 1
+        if time.monotonic() - _last_prune > _PRUNE_INTERVAL_SECONDS:
+            _last_prune = time.monotonic()
+            rows = await database.fetch_all(
+                """
+                DELETE FROM transcription_cache
+                WHERE last_used_at < now() - make_interval(days => :days)
+                RETURNING 1
+                """,
+                values={"days": config.TRANSCRIPTION_CACHE_TTL_DAYS},
+            )
+            _stats["pruned"] += len(rows)
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"⚠️ Transcription cache store failed: {e}")
+
+
+register_metrics_source("transcription_cache", lambda: {**_stats, "engine": engine_key()})
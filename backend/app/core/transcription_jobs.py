@@ -0,0 +1,203 @@
+# backend/app/core/transcription_jobs.py
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from . import config
+from .long_audio import SAMPLE_RATE, transcribe_long_audio
+from .metrics import register_metrics_source
+from .summarization import extract_case_intake
+from .transcription_cache import chunked_mode, get_cached_transcription, store_cached_transcription
+
+# Background transcriptions for the intake UI. POST /api/transcriptions starts
+# one and returns its id at once; GET /api/transcriptions/{id}/events streams
+# its progress as server-sent events:
+#   status      {"status": "transcribing", "audio_seconds"} / {"status": "extracting"}
+#   partial     {"chunk", "segments", "text"}: one chunk, as soon as it is transcribed
+#               (chunks finish out of order; segment times are from the start of the recording)
+#   transcript  {"text", "segments", "cached"}: the whole recording, in order
+#   intake      the extract_case_intake() result, when intake extraction was asked for
+#   job_error   {"stage": "transcription" | "intake", "detail"} (not "error", which
+#               browsers' EventSource also fires for connection problems)
+#   done        {"status": "done" | "failed"}: always last
+# Recordings are cut into TRANSCRIPTION_JOB_CHUNK_SECONDS chunks (long_audio.py)
+# so the first text arrives within seconds. Jobs live in this process only and
+# are forgotten TRANSCRIPTION_JOB_RETENTION_SECONDS after they finish.
+
+
+class TranscriptionJob:
+    def __init__(self, filename: Optional[str], extract_intake: bool):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.extract_intake = extract_intake
+        self.status = "transcribing"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def emit(self, kind: str, data: Dict[str, Any]) -> None:
+        self.events.append({"id": len(self.events) + 1, "kind": kind, "data": data})
+        # Wake every stream waiting on this job, then arm a fresh event for the next change.
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "extract_intake": self.extract_intake,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class TranscriptionJobs:
+    def __init__(self):
+        self._jobs: Dict[str, TranscriptionJob] = {}
+        self._stats: Dict[str, Any] = {
+            "started": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "cache_hits": 0,
+            "first_partial_seconds_total": 0.0,
+            "first_partials": 0,
+        }
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        self._forget_expired()
+        return self._jobs.get(job_id)
+
+    async def get_cached(self, audio_sha256: bytes) -> Optional[Dict[str, Any]]:
+        """An earlier job's result for this audio, checked before the upload is decoded."""
+        return await get_cached_transcription(audio_sha256, chunked_mode(config.TRANSCRIPTION_JOB_CHUNK_SECONDS))
+
+    def start(self, samples, audio_sha256: bytes, filename: Optional[str], extract_intake: bool,
+              cached: Optional[Dict[str, Any]] = None) -> TranscriptionJob:
+        """
+        Starts transcribing already decoded samples (audio_upload.decode_upload())
+        in the background, or replays a cached result (get_cached(); samples
+        is then None). The caller has checked the transcription pool's
+        capacity for a job that transcribes.
+        """
+        self._forget_expired()
+        job = TranscriptionJob(filename, extract_intake)
+        self._jobs[job.id] = job
+        self._stats["started"] += 1
+        job.task = asyncio.create_task(self._run(job, samples, audio_sha256, cached))
+        return job
+
+    async def _run(self, job: TranscriptionJob, samples, audio_sha256: bytes, cached_result: Optional[Dict[str, Any]]) -> None:
+        started = time.monotonic()
+        try:
+            result = cached_result
+            cached = result is not None
+            if cached:
+                self._stats["cache_hits"] += 1
+            else:
+                audio_seconds = len(samples) / SAMPLE_RATE
+                job.emit("status", {
+                    "status": "transcribing",
+                    "audio_seconds": round(audio_seconds, 2),
+                })
+
+                def on_chunk(index: int, segments: List[Dict[str, Any]]) -> None:
+                    if not any(e["kind"] == "partial" for e in job.events):
+                        self._stats["first_partial_seconds_total"] += time.monotonic() - started
+                        self._stats["first_partials"] += 1
+                    job.emit("partial", {
+                        "chunk": index,
+                        "segments": segments,
+                        "text": " ".join(s["text"] for s in segments if s["text"]),
+                    })
+
+                result = await transcribe_long_audio(samples, config.TRANSCRIPTION_JOB_CHUNK_SECONDS, on_chunk=on_chunk)
+                if result["text"].strip():
+                    await store_cached_transcription(
+                        audio_sha256, chunked_mode(config.TRANSCRIPTION_JOB_CHUNK_SECONDS), audio_seconds, result,
+                    )
+            del samples
+            job.emit("transcript", {"text": result["text"], "segments": result["segments"], "cached": cached})
+        except Exception as e:
+            print(f"ERROR (transcription_jobs.py): Transcription job {job.id} failed: {e}")
+            job.emit("job_error", {"stage": "transcription", "detail": str(e)})
+            job.emit("done", {"status": "failed"})
+            self._finish(job, "failed")
+            return
+
+        if job.extract_intake and result["text"].strip():
+            job.status = "extracting"
+            job.emit("status", {"status": "extracting"})
+            try:
+                # Same extraction as /case-intake, so the UI needs no second round trip.
+                job.emit("intake", await extract_case_intake(result["text"]))
+            except Exception as e:
+                print(f"ERROR (transcription_jobs.py): Intake extraction for job {job.id} failed: {e}")
+                job.emit("job_error", {"stage": "intake", "detail": str(e)})
+        job.emit("done", {"status": "done"})
+        self._finish(job, "done")
+
+    def _finish(self, job: TranscriptionJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        self._stats["succeeded" if status == "done" else "failed"] += 1
+
+    def _forget_expired(self) -> None:
+        cutoff = time.time() - config.TRANSCRIPTION_JOB_RETENTION_SECONDS
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    async def stop(self) -> None:
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        first_partials = self._stats["first_partials"]
+        return {
+            **{k: v for k, v in self._stats.items() if k != "first_partial_seconds_total"},
+            "mean_first_partial_seconds": (
+                round(self._stats["first_partial_seconds_total"] / first_partials, 3) if first_partials else None
+            ),
+            "running": sum(1 for job in self._jobs.values() if not job.finished),
+            "retained": len(self._jobs),
+        }
+
+
+async def job_event_stream(job: TranscriptionJob, last_event_id: Optional[int]) -> AsyncIterator[str]:
+    """
+    A job's events as SSE, from after last_event_id (a reconnecting browser
+    sends it as Last-Event-ID), until its "done" event.
+    """
+    sent = last_event_id or 0
+    yield f"retry: {config.EVENTS_CLIENT_RETRY_MS}\n\n"
+    while True:
+        for event in job.events[sent:]:
+            yield f"id: {event['id']}\nevent: {event['kind']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+            sent = event["id"]
+        if job.finished and sent >= len(job.events):
+            return
+        before = len(job.events)
+        await job.wait_for_change(config.EVENTS_HEARTBEAT_SECONDS)
+        if len(job.events) == before:
+            yield ": keep-alive\n\n"
+
+
+transcription_jobs = TranscriptionJobs()
+register_metrics_source("transcription_jobs", transcription_jobs.snapshot)
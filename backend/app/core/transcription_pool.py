@@ -0,0 +1,336 @@
+# backend/app/core/transcription_pool.py
+
+import asyncio
+import multiprocessing
+import signal
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from . import config
+from .metrics import register_metrics_source
+
+# A worker that dies before its model is loaded (missing model, out of
+# memory) is restarted after this delay rather than in a tight loop.
+_STARTUP_FAILURE_RETRY_SECONDS = 10.0
+
+
+class TranscriptionError(RuntimeError):
+    """A transcription job failed (worker crash, pool not running, ...)."""
+
+
+class TranscriptionOverloadedError(TranscriptionError):
+    """Raised when the job queue is full; the request should be retried later."""
+
+
+class TranscriptionTimeoutError(TranscriptionError):
+    """Raised when a job ran longer than TRANSCRIPTION_TIMEOUT_SECONDS."""
+
+
+def _worker_main(conn, threads: int) -> None:
+    """
+    Worker process: loads the model once, then transcribes one file at a
+    time. Jobs in: (job_id, audio, timestamps). Messages out: ("ready", None)
+    once, then (job_id, ok, result_or_error); the result is the text, or the
+    timed segments when timestamps were asked for.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # The parent decides when workers stop
+    if config.STT_PROVIDER == "whisper":
+        # Other engines take their thread count directly and do not need torch loaded.
+        import torch
+        torch.set_num_threads(threads)
+    from .transcription import load_stt_model, transcribe_audio_file, transcribe_audio_segments
+
+    load_stt_model() # A failed load ends the process with an error; "ready" is never sent
+    conn.send(("ready", None))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        job_id, audio, timestamps = job
+        try:
+            conn.send((job_id, True, transcribe_audio_segments(audio) if timestamps else transcribe_audio_file(audio)))
+        except Exception as e:
+            conn.send((job_id, False, f"{type(e).__name__}: {e}"))
+
+
+class _Job:
+    def __init__(self, job_id: int, audio: Union[str, bytes], timestamps: bool, future: asyncio.Future):
+        self.id = job_id
+        self.audio = audio
+        self.timestamps = timestamps
+        self.future = future
+        self.submitted_at = time.monotonic()
+        self.started_at = 0.0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class _Worker:
+    def __init__(self, index: int, process, conn):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.ready = False # Model loaded
+        self.job: Optional[_Job] = None
+        self.send_lock = threading.Lock() # Sends happen in executor threads; one message at a time
+
+
+class TranscriptionPool:
+    """
+    Speech-to-text off the event loop: TRANSCRIPTION_WORKERS processes, each
+    holding its own model, fed from a bounded FIFO queue.
+
+    A job that runs past TRANSCRIPTION_TIMEOUT_SECONDS fails with
+    TranscriptionTimeoutError and its worker is killed and replaced (a
+    running transcription cannot be interrupted otherwise). A crashed worker
+    fails its job and is replaced the same way. A full queue rejects new
+    jobs with TranscriptionOverloadedError instead of letting waits grow.
+    """
+
+    def __init__(self):
+        self._workers: List[_Worker] = []
+        self._queue: Deque[_Job] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._next_id = 0
+        self._stopping = False
+        self._stats: Dict[str, Any] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "rejected": 0,
+            "worker_restarts": 0,
+            "wait_seconds_total": 0.0,
+            "max_wait_seconds": 0.0,
+            "run_seconds_total": 0.0,
+            "max_queue_depth": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers) and not self._stopping
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def check_capacity(self) -> None:
+        """Raises like transcribe() would if a new job arrived now."""
+        if not self.running:
+            raise TranscriptionError("Transcription pool is not running")
+        if len(self._queue) >= config.TRANSCRIPTION_MAX_QUEUE:
+            self._stats["rejected"] += 1
+            raise TranscriptionOverloadedError(
+                f"Transcription queue is full ({len(self._queue)} jobs waiting), retry later"
+            )
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+        self._workers = [None] * config.TRANSCRIPTION_WORKERS
+        for index in range(config.TRANSCRIPTION_WORKERS):
+            self._spawn(index)
+        # Workers load their models in the background; jobs queue until one is ready.
+        print(f"--- Transcription pool: {config.TRANSCRIPTION_WORKERS} worker(s), "
+              f"{config.TRANSCRIPTION_CORES_PER_WORKER} thread(s) each ---")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for worker in self._workers:
+            try:
+                await self._loop.run_in_executor(None, self._send, worker, None)
+            except (OSError, ValueError):
+                pass
+        stopped = TranscriptionError("Transcription pool stopped")
+        for worker in self._workers:
+            self._fail_running(worker, stopped)
+        while self._queue:
+            job = self._queue.popleft()
+            if not job.future.done():
+                job.future.set_exception(stopped)
+
+        def join_all():
+            for worker in self._workers:
+                worker.process.join(timeout=5)
+                if worker.process.is_alive():
+                    worker.process.kill()
+
+        await self._loop.run_in_executor(None, join_all)
+        self._workers = []
+
+    async def transcribe(self, audio: Union[str, bytes], timestamps: bool = False, admitted: bool = False) -> Any:
+        """
+        Transcribes `audio` (a file path, or 16 kHz mono s16le PCM, see
+        transcription.py) in a worker process. Returns the text, or with
+        timestamps=True the list of timed segments.
+        admitted: the caller already passed check_capacity() for the request
+        this job belongs to (the chunks of one long recording), so it is
+        queued even when the queue is full.
+        """
+        if not self.running:
+            raise TranscriptionError("Transcription pool is not running")
+        if not admitted:
+            self.check_capacity()
+        self._next_id += 1
+        job = _Job(self._next_id, audio, timestamps, self._loop.create_future())
+        self._queue.append(job)
+        self._stats["submitted"] += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._queue))
+        self._dispatch()
+        # If the caller goes away, a queued job is skipped and a running one's result dropped.
+        return await job.future
+
+    # --- Worker management (event loop side) ---
+
+    def _spawn(self, index: int) -> None:
+        context = multiprocessing.get_context("spawn") # Model libraries are not fork-safe
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_main, args=(child_conn, config.TRANSCRIPTION_CORES_PER_WORKER),
+            name=f"transcription-worker-{index}", daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(index, process, parent_conn)
+        self._workers[index] = worker
+        threading.Thread(target=self._read, args=(worker,), name=f"transcription-reader-{index}", daemon=True).start()
+
+    def _read(self, worker: _Worker) -> None:
+        # One blocking reader thread per worker hands messages to the event loop.
+        while True:
+            try:
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                message = None
+            try:
+                if message is None:
+                    self._loop.call_soon_threadsafe(self._on_exit, worker)
+                    return
+                self._loop.call_soon_threadsafe(self._on_message, worker, message)
+            except RuntimeError: # Event loop closed (shutdown)
+                return
+
+    def _current(self, worker: _Worker) -> bool:
+        return not self._stopping and bool(self._workers) and self._workers[worker.index] is worker
+
+    def _on_message(self, worker: _Worker, message) -> None:
+        if not self._current(worker):
+            return
+        if message[0] == "ready":
+            worker.ready = True
+            self._dispatch()
+            return
+        job_id, ok, result = message
+        job = worker.job
+        if job is None or job.id != job_id:
+            return
+        worker.job = None
+        job.timer.cancel()
+        self._stats["completed" if ok else "failed"] += 1
+        self._stats["run_seconds_total"] += time.monotonic() - job.started_at
+        if not job.future.done():
+            if ok:
+                job.future.set_result(result)
+            else:
+                job.future.set_exception(TranscriptionError(result))
+        self._dispatch()
+
+    def _on_exit(self, worker: _Worker) -> None:
+        if not self._current(worker):
+            return # Already replaced (timeout) or shutting down
+        print(f"⚠️ Transcription worker {worker.index} exited (code {worker.process.exitcode}), restarting")
+        self._fail_running(worker, TranscriptionError("Transcription worker exited unexpectedly"))
+        self._restart(worker, delay=0.0 if worker.ready else _STARTUP_FAILURE_RETRY_SECONDS)
+
+    def _expire(self, worker: _Worker, job: _Job) -> None:
+        if worker.job is not job or not self._current(worker):
+            return
+        self._stats["timed_out"] += 1
+        print(f"⚠️ Transcription job {job.id} exceeded {config.TRANSCRIPTION_TIMEOUT_SECONDS}s, restarting worker {worker.index}")
+        self._fail_running(worker, TranscriptionTimeoutError(
+            f"Transcription took longer than {config.TRANSCRIPTION_TIMEOUT_SECONDS:g}s"
+        ))
+        self._restart(worker)
+
+    def _fail_running(self, worker: _Worker, error: Exception) -> None:
+        job, worker.job = worker.job, None
+        if job is None:
+            return
+        job.timer.cancel()
+        self._stats["failed"] += 1
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    def _restart(self, worker: _Worker, delay: float = 0.0) -> None:
+        self._stats["worker_restarts"] += 1
+        worker.process.kill()
+        worker.conn.close()
+        if delay:
+            self._loop.call_later(delay, self._respawn, worker)
+        else:
+            self._respawn(worker)
+
+    def _respawn(self, worker: _Worker) -> None:
+        if self._current(worker): # Not stopped or replaced meanwhile
+            self._spawn(worker.index)
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        for worker in self._workers:
+            if not worker.ready or worker.job is not None:
+                continue
+            job = self._next_job()
+            if job is None:
+                return
+            now = time.monotonic()
+            wait = now - job.submitted_at
+            self._stats["wait_seconds_total"] += wait
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], wait)
+            job.started_at = now
+            job.timer = self._loop.call_later(config.TRANSCRIPTION_TIMEOUT_SECONDS, self._expire, worker, job)
+            worker.job = job
+            sent = self._loop.run_in_executor(None, self._send, worker, (job.id, job.audio, job.timestamps))
+            sent.add_done_callback(lambda sent, worker=worker, job=job: self._on_sent(worker, job, sent))
+
+    @staticmethod
+    def _send(worker: _Worker, message) -> None:
+        # In an executor thread: pickling and writing the PCM of a long
+        # recording (tens of MB) would otherwise stall the event loop.
+        with worker.send_lock:
+            worker.conn.send(message)
+
+    def _on_sent(self, worker: _Worker, job: _Job, sent: asyncio.Future) -> None:
+        error = None if sent.cancelled() else sent.exception()
+        if error is None or isinstance(error, (OSError, ValueError)):
+            return # Sent, or the worker just died: its reader reports the exit and the job fails there
+        if worker.job is not job or not self._current(worker):
+            return
+        # A half-written message leaves the pipe unusable, so the worker is replaced too.
+        print(f"⚠️ Could not send transcription job {job.id} to worker {worker.index}: {error}")
+        self._fail_running(worker, TranscriptionError(f"Could not send the job to a worker: {error}"))
+        self._restart(worker)
+
+    def _next_job(self) -> Optional[_Job]:
+        while self._queue:
+            job = self._queue.popleft()
+            if not job.future.done(): # Skip jobs whose caller gave up
+                return job
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "workers": len(self._workers),
+            "workers_ready": sum(1 for w in self._workers if w.ready),
+            "running": sum(1 for w in self._workers if w.job is not None),
+            "queue_depth": len(self._queue),
+            "max_queue": config.TRANSCRIPTION_MAX_QUEUE,
+        }
+
+
+transcription_pool = TranscriptionPool()
+register_metrics_source("transcription_pool", transcription_pool.snapshot)
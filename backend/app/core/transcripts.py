@@ -0,0 +1,146 @@
+# backend/app/core/transcripts.py
+
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence
+
+from .database import database
+
+# Call transcripts live in the transcripts table, addressed by the SHA-256 of
+# their text, and are referenced by cases.transcript_id and
+# case_notes.transcript_id (migration 0010). Only the case detail view, the
+# notes endpoint with include_transcripts and search snippets read them;
+# everything else scans narrow case rows.
+
+# The SELECT branch finds a transcript stored before this statement; the
+# INSERT branch one stored by it. Exactly one of them returns a row, unless
+# a concurrent transaction commits the same text in between (retried).
+_STORE_SQL = """
+WITH stored AS (
+    INSERT INTO transcripts (sha256, body, raw_bytes)
+    VALUES (:sha256, :body, :raw_bytes)
+    ON CONFLICT (sha256) DO NOTHING
+    RETURNING id
+)
+SELECT id FROM stored
+UNION ALL
+SELECT id FROM transcripts WHERE sha256 = :sha256
+"""
+
+# Batch form of _STORE_SQL for asyncpg connections (imports, synthetic data).
+_STORE_MANY_SQL = """
+WITH input AS (
+    SELECT DISTINCT ON (sha256) sha256, body, raw_bytes
+    FROM unnest($1::bytea[], $2::text[], $3::integer[]) AS u(sha256, body, raw_bytes)
+),
+stored AS (
+    INSERT INTO transcripts (sha256, body, raw_bytes)
+    SELECT sha256, body, raw_bytes FROM input
+    ON CONFLICT (sha256) DO NOTHING
+    RETURNING id, sha256
+)
+SELECT id, sha256 FROM stored
+UNION ALL
+SELECT t.id, t.sha256 FROM transcripts t JOIN input USING (sha256)
+"""
+
+_PRUNE_SQL = """
+DELETE FROM transcripts t
+WHERE NOT EXISTS (SELECT 1 FROM cases WHERE transcript_id = t.id)
+  AND NOT EXISTS (SELECT 1 FROM case_notes WHERE transcript_id = t.id)
+"""
+
+
+def transcript_hash(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+async def store_transcript(text: Optional[str]) -> Optional[int]:
+    """Stores a transcript (once per distinct text) and returns its id for transcript_id."""
+    if text is None:
+        return None
+    values = {"sha256": transcript_hash(text), "body": text, "raw_bytes": len(text.encode("utf-8"))}
+    for _ in range(2):
+        transcript_id = await database.fetch_val(_STORE_SQL, values=values)
+        if transcript_id is not None:
+            return transcript_id
+    raise RuntimeError("Could not store transcript")
+
+
+async def store_transcripts_raw(raw, texts: Sequence[Optional[str]]) -> List[Optional[int]]:
+    """
+    store_transcript() for many texts in one statement, on an asyncpg
+    connection (typically inside the caller's transaction). Returns the ids
+    in the order of `texts`; None for None.
+    """
+    hashes = [transcript_hash(text) if text is not None else None for text in texts]
+    present = [(h, text) for h, text in zip(hashes, texts) if text is not None]
+    if not present:
+        return [None] * len(texts)
+    ids: Dict[bytes, int] = {}
+    for _ in range(2):
+        rows = await raw.fetch(
+            _STORE_MANY_SQL,
+            [h for h, _ in present], [text for _, text in present], [len(text.encode("utf-8")) for _, text in present],
+        )
+        ids.update((bytes(row["sha256"]), row["id"]) for row in rows)
+        # Texts committed concurrently between the INSERT and the SELECT come
+        # back from neither branch; the retry sees them (see _STORE_SQL).
+        present = [(h, text) for h, text in present if h not in ids]
+        if not present:
+            return [ids[h] if h is not None else None for h in hashes]
+    raise RuntimeError(f"Could not store {len(present)} transcript(s)")
+
+
+async def prune_orphan_transcripts() -> int:
+    """Deletes transcripts no case or note references any more; returns how many."""
+    rows = await database.fetch_all(_PRUNE_SQL + " RETURNING t.id")
+    return len(rows)
+
+
+async def transcript_storage_report() -> Dict[str, Any]:
+    """
+    On-disk size of the case tables and the transcript store, plus how much
+    compression and de-duplication save. Uses size functions and stored
+    lengths only, so no transcript is read or decompressed.
+    """
+    tables = []
+    for table in ("cases", "case_notes", "transcripts"):
+        row = await database.fetch_one(
+            """
+            SELECT c.reltuples::bigint AS estimated_rows,
+                   pg_relation_size(c.oid) AS heap_bytes,
+                   coalesce(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0) AS toast_bytes,
+                   pg_indexes_size(c.oid) AS index_bytes
+            FROM pg_class c WHERE c.oid = CAST(:table AS regclass)
+            """,
+            values={"table": table},
+        )
+        tables.append({"table": table, **dict(row)})
+
+    store = await database.fetch_one(
+        """
+        SELECT count(*) AS transcripts,
+               coalesce(sum(raw_bytes), 0) AS raw_bytes,
+               coalesce(sum(pg_column_size(body)), 0) AS stored_bytes
+        FROM transcripts
+        """
+    )
+    referenced_raw_bytes = await database.fetch_val(
+        """
+        SELECT coalesce(sum(t.raw_bytes), 0)
+        FROM (SELECT transcript_id FROM cases UNION ALL SELECT transcript_id FROM case_notes) refs
+        JOIN transcripts t ON t.id = refs.transcript_id
+        """
+    )
+    raw_bytes, stored_bytes = int(store["raw_bytes"]), int(store["stored_bytes"])
+    return {
+        "tables": tables,
+        "transcripts": {
+            "count": store["transcripts"],
+            "referenced_bytes": int(referenced_raw_bytes), # What inline columns would hold
+            "unique_bytes": raw_bytes, # After de-duplication
+            "stored_bytes": stored_bytes, # After compression
+            "dedupe_saved_bytes": int(referenced_raw_bytes) - raw_bytes,
+            "compression_ratio": round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+        },
+    }
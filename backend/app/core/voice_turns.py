@@ -0,0 +1,233 @@
+# backend/app/core/voice_turns.py
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage, SystemMessage
+
+from . import config
+from .llm_scheduler import Priority, llm_priority
+from .metrics import register_metrics_source
+
+
+class TurnBudget:
+    """Time budget for one live voice turn."""
+
+    def __init__(self, seconds: float, started_at: Optional[float] = None):
+        self.deadline = (started_at or time.monotonic()) + seconds
+        # Set once the turn has replied; work that is still running from then on
+        # is background work and is no longer constrained by the deadline.
+        self.detached = False
+        self.replied = asyncio.Event()
+        # Set when the agent wants to start a tool call that will not fit.
+        self.tool_deferred = asyncio.Event()
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def detach(self) -> None:
+        self.detached = True
+        self.replied.set()
+
+    def llm_priority(self) -> Priority:
+        # Live until the reply is sent; after that the caller is on hold, not waiting on this turn.
+        return Priority.INTERACTIVE if self.detached else Priority.REALTIME
+
+
+# Exponentially weighted average of observed tool durations, per tool name.
+_tool_durations: Dict[str, float] = {}
+_TOOL_DURATION_ALPHA = 0.3
+
+
+def estimate_tool_seconds(tool_name: Optional[str]) -> float:
+    return _tool_durations.get(tool_name or "", config.VOICE_TOOL_ESTIMATE_SECONDS)
+
+
+def _record_tool_duration(tool_name: str, seconds: float) -> None:
+    previous = _tool_durations.get(tool_name)
+    _tool_durations[tool_name] = seconds if previous is None else (
+        _TOOL_DURATION_ALPHA * seconds + (1 - _TOOL_DURATION_ALPHA) * previous
+    )
+
+
+class TurnBudgetCallback(AsyncCallbackHandler):
+    """
+    Checks the remaining turn budget every time the agent is about to start a
+    tool. If the tool is not expected to finish in time, the turn is told to
+    reply now and the tool is held back until that reply has been sent; it
+    then runs as background work and its result is kept for the next turn.
+    """
+
+    # Awaited before the tool starts (not scheduled alongside it), so holding
+    # the tool back in on_tool_start actually delays it.
+    run_inline = True
+
+    def __init__(self, budget: TurnBudget):
+        self.budget = budget
+        self._started: Dict[Any, tuple] = {}
+
+    async def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id, **kwargs: Any) -> None:
+        tool_name = (serialized or {}).get("name") or kwargs.get("name") or "unknown"
+        self._started[run_id] = (tool_name, time.monotonic())
+        if self.budget.detached:
+            return
+        remaining = self.budget.remaining()
+        if remaining < estimate_tool_seconds(tool_name):
+            print(f"⏱️ Deferring tool {tool_name}: {remaining:.2f}s left, needs ~{estimate_tool_seconds(tool_name):.2f}s")
+            _stats["tool_deferrals"] += 1
+            self.budget.tool_deferred.set()
+            await self.budget.replied.wait()
+            self._started[run_id] = (tool_name, time.monotonic()) # Measure the tool, not the wait
+
+    async def on_tool_end(self, output: Any, *, run_id, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        if started:
+            _record_tool_duration(started[0], time.monotonic() - started[1])
+
+    async def on_tool_error(self, error: BaseException, *, run_id, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+
+
+@dataclass
+class PendingTurn:
+    """Agent work that overran its turn and keeps running in the background."""
+    task: asyncio.Task
+    question: str
+    created_at: float = field(default_factory=time.monotonic)
+
+
+_pending_turns: Dict[str, PendingTurn] = {}
+
+_stats = {
+    "turns": 0,
+    "answered_in_time": 0,
+    "held": 0,
+    "resumed_from_background": 0,
+    "chained": 0,
+    "tool_deferrals": 0,
+    "background_failures": 0,
+}
+
+
+def voice_session_key(call: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Identifies the live call a turn belongs to (Vapi call id, else caller number)."""
+    if not call:
+        return None
+    if call.get("id"):
+        return call["id"]
+    customer = call.get("customer") or {}
+    return customer.get("number")
+
+
+def discard_pending_turn(session_key: Optional[str]) -> None:
+    """Drops (and cancels) unfinished work for a call, e.g. once the call has ended."""
+    pending = _pending_turns.pop(session_key, None) if session_key else None
+    if pending and not pending.task.done():
+        pending.task.cancel()
+
+
+def _purge_expired() -> None:
+    now = time.monotonic()
+    for key in [k for k, p in _pending_turns.items() if now - p.created_at > config.VOICE_PENDING_TURN_TTL_SECONDS]:
+        discard_pending_turn(key)
+
+
+def _task_output(task: asyncio.Task) -> Optional[str]:
+    if task.cancelled() or task.exception() is not None: # Failures are logged by _log_background_failure
+        return None
+    result = task.result()
+    return result.get("output") if isinstance(result, dict) else str(result)
+
+
+def _log_background_failure(task: asyncio.Task) -> None:
+    # Also marks the exception as retrieved when no later turn picks the task up.
+    if not task.cancelled() and task.exception() is not None:
+        _stats["background_failures"] += 1
+        print(f"⚠️ Background voice turn failed: {task.exception()!r}")
+
+
+async def _run_agent(agent_executor, agent_input: str, chat_history: List[BaseMessage],
+                     budget: TurnBudget, previous: Optional[PendingTurn]) -> Any:
+    """
+    One turn's agent run. With previous (a turn still running in the
+    background), it first waits for that turn and hands its answer to the
+    agent, so a new utterance is answered after the earlier one instead of
+    being dropped.
+    """
+    if previous is not None:
+        try:
+            await asyncio.wait({previous.task})
+        except asyncio.CancelledError:
+            previous.task.cancel() # This turn was discarded (call ended, expired)
+            raise
+        answer = _task_output(previous.task)
+        if answer:
+            _stats["resumed_from_background"] += 1
+            chat_history = chat_history + [SystemMessage(content=(
+                f"While the caller was waiting you finished working on their earlier question "
+                f"\"{previous.question}\". Your answer was:\n{answer}\n"
+                f"Deliver this answer now if it is still relevant, together with your reply to their latest message."
+            ))]
+    return await agent_executor.ainvoke(
+        {"input": agent_input, "chat_history": chat_history},
+        config={"callbacks": [TurnBudgetCallback(budget)]},
+    )
+
+
+async def run_voice_turn(agent_executor, agent_input: str, chat_history: List[BaseMessage],
+                         session_key: Optional[str], started_at: Optional[float] = None) -> str:
+    """
+    Runs one conversation-update turn within VOICE_TURN_DEADLINE_SECONDS.
+
+    Returns the agent's answer if it finishes in time. Otherwise returns the
+    best answer available (an earlier answer that finished in the background)
+    or the holding response, and leaves the agent running so the next turn
+    can pick up its result. If the previous turn is still running, this
+    turn's agent run is chained behind it rather than started in parallel.
+    """
+    _stats["turns"] += 1
+    _purge_expired()
+    budget = TurnBudget(config.VOICE_TURN_DEADLINE_SECONDS - config.VOICE_TURN_REPLY_RESERVE_SECONDS, started_at)
+
+    previous = _pending_turns.pop(session_key, None) if session_key else None
+    if previous and not previous.task.done():
+        _stats["chained"] += 1
+        print(f"⏳ Previous turn for {session_key} is still running; chaining this one behind it.")
+
+    # The LLM priority is re-read on every call: REALTIME while the caller
+    # waits for this turn, INTERACTIVE once it has replied and runs detached.
+    with llm_priority(budget.llm_priority):
+        task = asyncio.create_task(_run_agent(agent_executor, agent_input, chat_history, budget, previous))
+    deferred = asyncio.create_task(budget.tool_deferred.wait())
+    try:
+        await asyncio.wait({task, deferred}, timeout=max(budget.remaining(), 0), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        deferred.cancel()
+
+    if task.done():
+        _stats["answered_in_time"] += 1
+        result = task.result()  # Agent errors propagate to the webhook handler
+        return result.get("output", "I'm sorry, something went wrong.") if isinstance(result, dict) else str(result)
+
+    # --- Out of time: reply now, keep working in the background ---
+    budget.detach()
+    task.add_done_callback(_log_background_failure)
+    best_answer = _task_output(previous.task) if previous and previous.task.done() else None
+    if session_key:
+        _pending_turns[session_key] = PendingTurn(task=task, question=agent_input)
+    else:
+        # Nowhere to deliver the result on a later turn.
+        task.cancel()
+    _stats["held"] += 1
+    print(f"⏱️ Turn budget exhausted for {session_key}; continuing in background.")
+    return best_answer or config.VOICE_HOLDING_RESPONSE
+
+
+register_metrics_source("voice_turns", lambda: {
+    **_stats,
+    "pending": len(_pending_turns),
+    "tool_duration_estimates": {name: round(seconds, 3) for name, seconds in _tool_durations.items()},
+})
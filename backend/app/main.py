@@ -3,32 +3,70 @@
 from dotenv import load_dotenv
 load_dotenv()
 import os
-from fastapi import FastAPI, Request, UploadFile, File, HTTPException
+import io
+from fastapi import FastAPI, Request, Response, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage # Added SystemMessage
 from .core.agent import create_agent_executor
-from .core.tools import case_intake_extractor
+from .core.summarization import extract_case_intake
+from .core.metrics import collect_metrics
+from .core.llm_scheduler import Priority, LLMOverloadedError, llm_priority
+from .core.voice_turns import run_voice_turn, voice_session_key, discard_pending_turn
 import shutil
 import uuid
 import json
-from .core.transcription import transcribe_audio_file
-from .core.post_call_processor import process_call_transcript
+import time
+from .core.transcription_pool import transcription_pool, TranscriptionError, TranscriptionOverloadedError, TranscriptionTimeoutError
+from .core.long_audio import SAMPLE_RATE as AUDIO_SAMPLE_RATE, transcribe_long_audio
+from .core.audio_upload import hash_upload, decode_upload
+from .core.transcription_cache import engine_key, get_cached_transcription, resolve_mode, store_cached_transcription
+from .core.coalescing import get_single_flight
+from .core.transcription_jobs import transcription_jobs, job_event_stream
+from .core.post_call_processor import enqueue_call_transcript
+from .core.case_notes import fetch_case_notes
+from .core.case_queries import list_cases, get_case_detail, MAX_PAGE_SIZE
+from .core.search import search_cases, MAX_SEARCH_PAGE_SIZE
+from .core.bulk_import import IMPORT_ENTITIES, detect_format, import_rows
+from .core.case_fields import case_link_fields
+from .core.transcripts import store_transcript, transcript_storage_report
+from .core.dashboard import (
+    get_dashboard,
+    invalidate_dashboard,
+    fetch_overview_counts,
+    fetch_recent_activity,
+    fetch_upcoming_deadlines,
+    fetch_unread_notifications,
+    OVERVIEW_TABLES,
+    RECENT_ACTIVITY_TABLES,
+    UPCOMING_DEADLINES_TABLES,
+    NOTIFICATIONS_TABLES,
+    DASHBOARD_TABLES,
+    DASHBOARD_CLOCK_SECONDS,
+)
+from .core.conditional_get import conditional_get
+from .core.events import event_hub, parse_cursor, sse_event_stream
+from .core.job_queue import job_workers, job_counts
+from .core.migrations import migrate
+from .core.db_pool import instrument_pool, DatabasePoolTimeoutError
+from .core.query_plans import check_query_plans
+from .core import config
 
 # Import ALL database objects needed from your updated database.py
 from .core.database import (
     database,
     cases,
+    case_notes,
     indexed_rag_documents,
     clients,        # NEW
     contracts,      # NEW
     activities,     # NEW
     tasks,          # NEW
     notifications,  # NEW
-    create_db_and_tables
 )
-from sqlalchemy import select, func, and_, cast, Text # Import cast and Text for JSON column handling
+from sqlalchemy import select, func, and_
 from sqlalchemy.dialects.postgresql import JSONB # Ensure JSONB is imported if you use it for JSON columns in SELECT
 from .core.rag_pipeline import get_vector_store
 from langchain_community.document_loaders import TextLoader, PyPDFLoader
@@ -45,19 +83,17 @@ from .core.schemas import (
     RecentActivity,     # NEW
     UpcomingDeadline,   # NEW
     Notification,       # NEW
-    DashboardData,      # NEW (though not used directly as a response model for one endpoint yet)
+    DashboardData,
     Client, # NEW: Import Client schema
-    Case  # NEW: Import Case schema
+    Case,  # NEW: Import Case schema
+    CaseNotesPage,
+    ImportReport,
 )
 
 from datetime import datetime, timezone, timedelta # Added timedelta
 from .core.tools import database_case_reader_async # Import the async tool
 
 
-# --- Call this function once at the top level ---
-# This will create all defined tables if they don't exist
-create_db_and_tables()
-
 app = FastAPI(
     title="Legal Agent AI API",
     description="API for a legal agentic AI app using Ollama and RAG.",
@@ -75,20 +111,54 @@ class Query(BaseModel):
 class IntakeRequest(BaseModel):
     text: str
 
+# --- LLM scheduler: shed requests surface as 503 so clients can retry ---
+@app.exception_handler(LLMOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: LLMOverloadedError):
+    print(f"⚠️ LLM overloaded, rejecting {request.url.path}: {exc}")
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+# --- Database pool exhausted: fail fast with 503 instead of queueing forever ---
+@app.exception_handler(DatabasePoolTimeoutError)
+async def database_pool_timeout_handler(request: Request, exc: DatabasePoolTimeoutError):
+    print(f"⚠️ Database pool exhausted, rejecting {request.url.path}: {exc}")
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+# --- Transcription queue full: 503 so clients retry later ---
+@app.exception_handler(TranscriptionOverloadedError)
+async def transcription_overloaded_handler(request: Request, exc: TranscriptionOverloadedError):
+    print(f"⚠️ Transcription overloaded, rejecting {request.url.path}: {exc}")
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 # --- Add database connection event handlers ---
 @app.on_event("startup")
 async def startup():
     try:
         await database.connect()
+        instrument_pool()
         print("✅ Database connected successfully")
+        # --- Create / bring the schema up to date (backend/app/migrations) ---
+        await migrate()
         # --- Add initial sample data if DB is empty for dashboard testing ---
         await insert_sample_dashboard_data()
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         raise
+    try:
+        await event_hub.start()
+    except Exception as e:
+        # The rest of the app works without it; /api/events/stream answers 503.
+        print(f"⚠️ Event hub could not start, push updates disabled: {e}")
+    if config.RUN_JOB_WORKERS_IN_PROCESS:
+        job_workers.start(config.JOB_WORKER_CONCURRENCY)
+    # Speech-to-text worker processes; each loads its model in the background.
+    await transcription_pool.start()
 
 @app.on_event("shutdown")
 async def shutdown():
+    await transcription_jobs.stop()
+    await transcription_pool.stop()
+    await job_workers.stop()
+    await event_hub.stop()
     await database.disconnect()
 
 # --- NEW: Function to insert sample data for dashboard ---
@@ -172,7 +242,7 @@ async def insert_sample_dashboard_data():
             key_dates=["05/01/2024", "08/30/2024"]
         ).dict())
 
-        await database.execute_many(cases.insert(), [
+        sample_cases = [
             {
                 "case_id": f"CASE-{uuid.uuid4().hex[:8].upper()}",
                 "caller_phone_number": "+15551234567", # Matches Acme Corp
@@ -191,7 +261,7 @@ async def insert_sample_dashboard_data():
                 "structured_intake": structured_intake_tech,
                 "call_summary": "Discussion about patent infringement defense strategy.",
                 "full_transcript": "User: We're being sued for patent infringement. AI: I understand. Let's discuss your defense.",
-                "follow_up_notes": json.dumps([{"timestamp": datetime.utcnow().isoformat(), "summary": "Discussed strategy for patent case."}]),
+                "follow_up_notes": json.dumps([]),
                 "assigned_to": "David Lee",
                 "last_updated_at": datetime.utcnow() - timedelta(days=1)
             },
@@ -228,7 +298,23 @@ async def insert_sample_dashboard_data():
                 "assigned_to": "Jessica White",
                 "last_updated_at": datetime.utcnow() - timedelta(days=4)
             }
-        ])
+        ]
+        # Client link and list columns are stored with the case (see case_fields.py),
+        # the transcript in the transcript store (see transcripts.py)
+        for sample_case in sample_cases:
+            sample_case.update(await case_link_fields(sample_case["structured_intake"], sample_case["caller_phone_number"]))
+            sample_case["transcript_id"] = await store_transcript(sample_case.pop("full_transcript"))
+        await database.execute_many(cases.insert(), sample_cases)
+
+        tech_case_record = await database.fetch_one(
+            select(cases.c.id).where(cases.c.caller_phone_number == "+15559876543").limit(1)
+        )
+        if tech_case_record:
+            await database.execute(case_notes.insert().values(
+                case_id=tech_case_record.id,
+                summary="Discussed strategy for patent case.",
+                created_at=datetime.utcnow()
+            ))
 
         print("--- Inserting sample contract data ---")
         await database.execute_many(contracts.insert(), [
@@ -271,10 +357,9 @@ async def insert_sample_dashboard_data():
 
         print("--- Inserting sample task/deadline data ---")
         # Get a sample case_id to link tasks (fetch from cases just inserted)
-        # Fix: Cast structured_intake to Text before using .contains() / LIKE
         sample_case_record = await database.fetch_one(
             select(cases.c.id)
-            .where(cast(cases.c.structured_intake, Text).contains("Acme Corp"))
+            .where(cases.c.client_name == "Acme Corp")
             .limit(1)
         ) # Link to Acme's case
         sample_case_id = sample_case_record.id if sample_case_record else None
@@ -321,6 +406,7 @@ async def insert_sample_dashboard_data():
                 "created_at": datetime.utcnow() - timedelta(days=1)
             },
         ])
+        invalidate_dashboard()
         print("--- Sample dashboard data inserted successfully ---")
     else:
         print("--- Sample data already exists, skipping insertion ---")
@@ -409,6 +495,27 @@ async def test_tools():
     
     return results
 
+@app.get("/debug/metrics")
+async def get_metrics():
+    """Counters from in-process subsystems (request coalescing, ...)"""
+    return collect_metrics()
+
+@app.get("/debug/query-plans")
+async def get_query_plans():
+    """EXPLAINs the hot-path queries and reports whether each one uses its index."""
+    results = await check_query_plans()
+    return {"ok": all(r["ok"] for r in results), "queries": results}
+
+@app.get("/debug/storage")
+async def get_storage_report():
+    """Sizes of the case tables and the transcript store, with compression and de-duplication savings."""
+    return await transcript_storage_report()
+
+@app.get("/debug/jobs")
+async def get_job_counts():
+    """Background job queue depth by status"""
+    return await job_counts()
+
 # --- Vapi Webhook Endpoint (Existing) ---
 @app.post("/api/vapi/agent-interaction")
 async def handle_vapi_interaction(request: VapiWebhookRequest):
@@ -428,6 +535,7 @@ async def handle_vapi_interaction(request: VapiWebhookRequest):
         # --- ROUTE 1: Handle a live conversation turn ---
         if message_payload.type == "conversation-update":
             print("📞 Processing conversation-update...")
+            turn_started_at = time.monotonic() # The voice turn deadline counts from here
             
             if not message_payload.conversation:
                 print("❌ No conversation data in payload")
@@ -509,22 +617,17 @@ async def handle_vapi_interaction(request: VapiWebhookRequest):
                     print(f"🚀 Agent executor type: {type(agent_executor)}")
                     print(f"🚀 Agent executor verbose: {agent_executor.verbose}")
                     
-                    # Use async version consistently
-                    agent_response = await agent_executor.ainvoke({
-                        "input": agent_input,
-                        "chat_history": langchain_history
-                    })
-                    
-                    print(f"✅ Agent response received!")
-                    print(f"📤 Response type: {type(agent_response)}")
-                    print(f"📤 Response keys: {list(agent_response.keys()) if isinstance(agent_response, dict) else 'Not a dict'}")
-                    
-                    if isinstance(agent_response, dict):
-                        agent_text_output = agent_response.get("output", "I'm sorry, something went wrong.")
-                        print(f"💬 Extracted output: '{agent_text_output}'")
-                    else:
-                        agent_text_output = str(agent_response)
-                        print(f"💬 Converted to string: '{agent_text_output}'")
+                    # Live voice turns get the highest LLM priority and a hard time
+                    # budget; work that overruns it continues for the next turn.
+                    with llm_priority(Priority.REALTIME):
+                        agent_text_output = await run_voice_turn(
+                            agent_executor,
+                            agent_input,
+                            langchain_history,
+                            voice_session_key(message_payload.call),
+                            started_at=turn_started_at,
+                        )
+                    print(f"✅ Agent response received in {time.monotonic() - turn_started_at:.2f}s")
                     
                     print(f"📤 Returning to Vapi: '{agent_text_output}'")
                     print("DEBUG: Returning from conversation-update (agent response)")#PointC
@@ -546,6 +649,7 @@ async def handle_vapi_interaction(request: VapiWebhookRequest):
         # --- ROUTE 2: Handle the end-of-call summary ---
         elif message_payload.type == "status-update" and message_payload.status == "ended":
             print(f"📞 Call ended. Reason: {message_payload.endedReason}")
+            discard_pending_turn(voice_session_key(message_payload.call))
             
             if message_payload.artifact and message_payload.artifact.messagesOpenAIFormatted:
                 final_transcript = message_payload.artifact.messagesOpenAIFormatted
@@ -559,7 +663,9 @@ async def handle_vapi_interaction(request: VapiWebhookRequest):
                         caller_phone_number = message_payload.call.get("customer").get("number", "Unknown")
 
                 print(f"📋 Processing end-of-call for {caller_phone_number}, call ID: {vapi_call_id}")
-                await process_call_transcript(final_transcript, caller_phone_number, vapi_call_id)
+                # Summarisation and intake extraction run on the job queue, so
+                # Vapi gets its response as soon as the job is durably stored.
+                await enqueue_call_transcript(final_transcript, caller_phone_number, vapi_call_id)
                 print("DEBUG: Returning from status-update") #PointF
             else:
                 print("❌ No final transcript artifact found in end-of-call payload")
@@ -620,8 +726,9 @@ async def process_case_intake(request: IntakeRequest):
     """
     print(f"Received case intake request with text: {request.text[:100]}...")
     
-    # We call the function directly, bypassing the agent for this specific task
-    extracted_data = case_intake_extractor(request.text)
+    # We call the extractor directly, bypassing the agent for this specific task.
+    # Long texts are extracted in parallel chunks and merged (see summarization.py).
+    extracted_data = await extract_case_intake(request.text)
     
     # In a real app, you would now save this 'extracted_data' to your database.
     # For now, we'll just return it.
@@ -631,168 +738,178 @@ async def process_case_intake(request: IntakeRequest):
 
 # --- Audio Transcription Endpoint ---
 @app.post("/transcribe-audio")
-async def handle_audio_transcription(audio_file: UploadFile = File(...)):
+async def handle_audio_transcription(audio_file: UploadFile = File(...), mode: str = "auto"):
     """
-    Accepts an audio file, saves it temporarily, transcribes it,
-    and returns the text.
+    Accepts an audio file, decodes it in memory (ffmpeg via a pipe),
+    transcribes it and returns the text. Transcription runs in the worker
+    pool (transcription_pool.py): 503 when its queue is full, 504 on timeout.
+    - mode: "single" transcribes in one pass; "chunked" cuts the recording
+      at silences and transcribes the chunks in parallel, also returning
+      timed segments (long_audio.py); "auto" chunks recordings of at least
+      LONG_AUDIO_THRESHOLD_SECONDS.
+    Results are cached by the audio's SHA-256 and the engine
+    (transcription_cache.py); "cached" tells whether this one was.
     """
-    # Create a temporary path to save the uploaded file
-    temp_file_path = f"temp_{audio_file.filename}"
-    
+    if mode not in ("auto", "single", "chunked"):
+        raise HTTPException(status_code=400, detail="mode must be one of auto, single, chunked")
+
     try:
-        # Save the uploaded file to the temporary path
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
-        print(f"DEBUG (main.py): Calling transcribe_audio_file for {temp_file_path}")
-        # Call our transcription service
-        transcribed_text = transcribe_audio_file(temp_file_path)
-        print(f"DEBUG (main.py): Transcribed text received: '{transcribed_text[:100]}...' (Type: {type(transcribed_text)})")
-        
-        # Ensure that transcribed_text is indeed a string. If it's empty, send an appropriate message.
-        if not isinstance(transcribed_text, str):
-            print(f"ERROR (main.py): transcribe_audio_file returned non-string: {transcribed_text}")
-            return {"error": "Transcription failed: Invalid output format from transcriber."}
-        if not transcribed_text.strip(): # Check if it's empty or just whitespace
+        audio_sha256 = await hash_upload(audio_file)
+        cached = await get_cached_transcription(audio_sha256, mode)
+        if cached is not None:
+            print(f"--- Transcription cache hit for {audio_file.filename} ---")
+            return {**cached, "cached": True}
+
+        transcription_pool.check_capacity() # Before decoding, which is wasted work if we must refuse
+        samples = await decode_upload(audio_file)
+        audio_seconds = len(samples) / AUDIO_SAMPLE_RATE
+        resolved_mode = resolve_mode(mode, audio_seconds)
+
+        async def transcribe() -> Dict[str, Any]:
+            if resolved_mode != "single":
+                result = await transcribe_long_audio(samples)
+                print(f"--- Transcribed {result['audio_seconds']}s of audio in {len(result['chunks'])} chunks ---")
+            else:
+                # Awaited, not run here: the event loop keeps serving other requests meanwhile
+                segments = await transcription_pool.transcribe(samples.tobytes(), timestamps=True)
+                result = {"text": " ".join(segment["text"] for segment in segments if segment["text"])}
+            if result["text"].strip():
+                await store_cached_transcription(audio_sha256, resolved_mode, audio_seconds, result)
+            return result
+
+        # Simultaneous uploads of the same recording (client retries) share one transcription.
+        result = await get_single_flight("transcription").do(
+            (audio_sha256, engine_key(), resolved_mode), transcribe,
+        )
+        print(f"DEBUG (main.py): Transcribed text received: '{result['text'][:100]}...'")
+        if not result["text"].strip(): # Check if it's empty or just whitespace
             print(f"WARNING (main.py): Transcribed text is empty for {audio_file.filename}")
-            # You might want to return an error, or a default message
-            return {"text": "No speech detected or transcription failed for the provided audio."}
+            return {"text": "No speech detected or transcription failed for the provided audio.", "cached": False}
+        return {**result, "cached": False}
 
-        return {"text": transcribed_text}
-        
+    except TranscriptionOverloadedError:
+        raise
+    except TranscriptionTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         print(f"ERROR (main.py): Exception during transcription: {e}")
         import traceback
         traceback.print_exc()
         return {"error": f"An error occurred during transcription: {str(e)}"}
-        
-    finally:
-        # Clean up the temporary file
-        import os
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-
-# --- MODIFIED /api/cases endpoint ---
-@app.get("/api/cases", response_model=List[Case])
-async def get_all_cases():
+
+# --- Transcription jobs: partial transcripts streamed as they finish ---
+@app.post("/api/transcriptions", status_code=202)
+async def create_transcription_job(audio_file: UploadFile = File(...), extract_intake: bool = False):
     """
-    Fetches all case records from the database, formatted for the UI.
+    Starts transcribing an uploaded recording in the background and returns
+    its job id straight away. Progress, partial transcripts, the final
+    transcript and (with extract_intake=true) the structured case intake
+    arrive on events_url as server-sent events (transcription_jobs.py).
+    503 when the transcription queue is full.
     """
-    print("--- Fetching all cases from the database ---")
-    try:
-        # Explicitly select all columns needed by the Case Pydantic model
-        # This makes it robust against internal caching issues or implicit column selection.
-        query = select(
-            cases.c.id,
-            cases.c.case_id,
-            cases.c.caller_phone_number,
-            cases.c.status,
-            cases.c.structured_intake,
-            cases.c.call_summary,
-            cases.c.full_transcript,
-            cases.c.follow_up_notes,
-            cases.c.created_at,
-            cases.c.vapi_call_id,
-            cases.c.assigned_to,
-            cases.c.last_updated_at, # Explicitly selected here
-            clients.c.name.label("client_actual_name") # From the join
-        ).outerjoin(clients, cases.c.caller_phone_number == clients.c.phone_number)
-        
-        all_case_records = await database.fetch_all(query)
-        
-        result_cases = []
-        for record in all_case_records:
-            # Convert SQLAlchemy Row to a mutable dictionary
-            case_dict = dict(record)
-            
-            print(f"DEBUG (get_all_cases): Raw record dict keys: {case_dict.keys()}")
-            print(f"DEBUG (get_all_cases): Value of last_updated_at from DB: {case_dict.get('last_updated_at')}")
-            # Ensure 'last_updated_at' key is always present, even if its value is None from DB for old records
-            db_last_updated_at = case_dict.get('last_updated_at')
-            if db_last_updated_at is None:
-                # Fallback to created_at if last_updated_at is null or not found
-                case_dict['last_updated_at'] = case_dict['created_at'] 
-                print(f"DEBUG (get_all_cases): last_updated_at was None/Missing, defaulting to created_at: {case_dict['last_updated_at']}")
-            else:
-                # Ensure it's a datetime object. databases/asyncpg usually does this, but being explicit.
-                if not isinstance(db_last_updated_at, datetime):
-                    try:
-                        case_dict['last_updated_at'] = datetime.fromisoformat(str(db_last_updated_at))
-                        print(f"DEBUG (get_all_cases): Converted last_updated_at string to datetime: {case_dict['last_updated_at']}")
-                    except ValueError:
-                        print(f"WARNING (get_all_cases): Could not convert last_updated_at '{db_last_updated_at}' to datetime, defaulting to created_at.")
-                        case_dict['last_updated_at'] = case_dict['created_at']
+    audio_sha256 = await hash_upload(audio_file)
+    cached = await transcription_jobs.get_cached(audio_sha256)
+    samples = None
+    if cached is None: # A cached recording needs neither a worker nor decoding
+        try:
+            transcription_pool.check_capacity()
+        except TranscriptionOverloadedError:
+            raise
+        except TranscriptionError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        try:
+            # Decoded now: the upload is gone once this request returns.
+            samples = await decode_upload(audio_file)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Could not decode audio: {e}")
+    job = transcription_jobs.start(samples, audio_sha256, audio_file.filename, extract_intake, cached=cached)
+    return {**job.summary(), "events_url": f"/api/transcriptions/{job.id}/events"}
+
+
+@app.get("/api/transcriptions/{job_id}")
+async def get_transcription_job(job_id: str):
+    """A job's status and every event so far (for clients that cannot use SSE)."""
+    job = transcription_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Transcription job not found or expired")
+    return {**job.summary(), "events": job.events}
+
+
+@app.get("/api/transcriptions/{job_id}/events")
+async def stream_transcription_job(request: Request, job_id: str, last_event_id: Optional[int] = None):
+    """
+    A job's events as server-sent events, ending after "done". Reconnecting
+    browsers resume from the Last-Event-ID header; a finished job replays
+    everything until it expires.
+    """
+    job = transcription_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Transcription job not found or expired")
+    header_id = request.headers.get("last-event-id")
+    if header_id and header_id.isdigit():
+        last_event_id = int(header_id)
+    return StreamingResponse(
+        job_event_stream(job, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
+# --- /api/cases: paginated, projected case list ---
+@app.get("/api/cases")
+async def get_all_cases(request: Request, response: Response,
+                        limit: int = 50, cursor: Optional[str] = None, fields: Optional[str] = None,
+                        status: Optional[str] = None, assigned_to: Optional[str] = None,
+                        unassigned: bool = False, type: Optional[str] = None):
+    """
+    Fetches one page of cases for the UI, most recently updated first.
+    - cursor: the next_cursor of the previous page.
+    - fields: comma-separated projection (see case_queries.LIST_FIELDS); the
+      default is what the list view shows. Transcripts are only returned by
+      /api/cases/{case_id}.
+    - status, assigned_to, unassigned, type: filters.
+    Supports conditional GET (ETag / If-None-Match): 304 until cases change.
+    """
+    not_modified = await conditional_get(request, response, ["cases"])
+    if not_modified:
+        return not_modified
+    return await list_cases(
+        limit=max(1, min(limit, MAX_PAGE_SIZE)), cursor=cursor, fields=fields,
+        status=status, assigned_to=assigned_to, unassigned=unassigned, case_type=type,
+    )
 
-            # Parse structured_intake JSON
-            structured_intake_data = {}
-            if case_dict.get('structured_intake'): # Use .get() for safety
-                try:
-                    if isinstance(case_dict['structured_intake'], str):
-                         structured_intake_data = json.loads(case_dict['structured_intake'])
-                    else:
-                         structured_intake_data = case_dict['structured_intake']
-                except (json.JSONDecodeError, TypeError):
-                    print(f"Warning: Could not parse structured_intake for case {case_dict.get('case_id')}")
-                    structured_intake_data = {}
-            
-            # Derive 'case_name', 'client_name', 'type'
-            case_name = structured_intake_data.get('summary_of_facts', 'N/A')
-            if len(case_name) > 50:
-                case_name = case_name[:50] + '...'
-
-            client_name = case_dict.get('client_actual_name')
-            if not client_name and structured_intake_data:
-                client_name = structured_intake_data.get('client_name', 'N/A')
-            if not client_name:
-                client_name = 'Unknown Client'
-
-            case_type = structured_intake_data.get('case_type', 'N/A')
-
-            # Handle follow_up_notes and ensure it's a list
-            follow_up_notes_parsed = []
-            if case_dict.get('follow_up_notes'):
-                try:
-                    if isinstance(case_dict['follow_up_notes'], str):
-                        follow_up_notes_parsed = json.loads(case_dict['follow_up_notes'])
-                    else:
-                        follow_up_notes_parsed = case_dict['follow_up_notes']
-                except (json.JSONDecodeError, TypeError):
-                    print(f"Warning: Could not parse follow_up_notes for case {case_dict.get('case_id')}")
-                    follow_up_notes_parsed = []
-            
-            if not isinstance(follow_up_notes_parsed, list):
-                print(f"Warning: follow_up_notes for case {case_dict.get('case_id')} not a list after parsing, resetting to empty.")
-                follow_up_notes_parsed = []
-# Ensure all keys Pydantic expects are present, even if their value is None
-            final_case_data_for_pydantic = {
-                "id": case_dict['id'],
-                "case_id": case_dict['case_id'],
-                "case_name": case_name,
-                "client_name": client_name,
-                "type": case_type,
-                "status": case_dict['status'],
-                "assigned_to": case_dict.get('assigned_to'),
-                "last_updated_at": case_dict['last_updated_at'], # This is the key Pydantic's alias looks for
-                "caller_phone_number": case_dict.get('caller_phone_number'),
-                "structured_intake": structured_intake_data,
-                "call_summary": case_dict.get('call_summary'),
-                "full_transcript": case_dict.get('full_transcript'),
-                "follow_up_notes": follow_up_notes_parsed,
-                "created_at": case_dict['created_at'],
-                "vapi_call_id": case_dict.get('vapi_call_id')
-            }
-            print(f"DEBUG (get_all_cases): Final dict for Pydantic (partial): id={final_case_data_for_pydantic['id']}, case_id={final_case_data_for_pydantic['case_id']}, last_updated_at={final_case_data_for_pydantic.get('last_updated_at')}, follow_up_notes_type={type(final_case_data_for_pydantic['follow_up_notes'])}")
+@app.get("/api/search")
+async def search(q: str, limit: int = 20, cursor: Optional[str] = None):
+    """
+    Full-text search over cases (names, intake, summary, transcript) and their
+    follow-up notes. Best match first; each item has the case list fields, a
+    rank, matched_in ("case" / "note") and a snippet with <mark>ed matches.
+    - q: web-search syntax ("exact phrase", or, -excluded).
+    - cursor: the next_cursor of the previous page.
+    """
+    return await search_cases(q, limit=max(1, min(limit, MAX_SEARCH_PAGE_SIZE)), cursor=cursor)
 
-            # Use model_validate for robust Pydantic v2 validation
-            case_model = Case.model_validate(final_case_data_for_pydantic)
-            result_cases.append(case_model)
+@app.get("/api/cases/{case_id}", response_model=Case)
+async def get_case(case_id: str):
+    """
+    Full detail of one case, including structured intake and the first call's transcript.
+    """
+    case = await get_case_detail(case_id)
+    if case is None:
+        raise HTTPException(status_code=404, detail=f"Case {case_id} not found")
+    return case
+
+@app.get("/api/cases/{case_id}/notes", response_model=CaseNotesPage)
+async def get_case_notes(case_id: str, limit: int = 20, cursor: Optional[str] = None,
+                         include_transcripts: bool = False):
+    """
+    Follow-up call notes for one case, newest first, one page at a time.
+    Pass the returned next_cursor to get the next (older) page.
+    """
+    page = await fetch_case_notes(case_id, limit=max(1, min(limit, 100)), cursor=cursor, include_transcripts=include_transcripts)
+    if page is None:
+        raise HTTPException(status_code=404, detail=f"Case {case_id} not found")
+    return page
 
-        return result_cases
-    except Exception as e:
-        print(f"Error fetching cases: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail="Could not fetch cases")
 # --- RAG Document Endpoints (Existing) ---
 @app.post("/process-rag-documents")
 async def process_rag_documents(documents: List[UploadFile] = File(...)):
@@ -878,10 +995,14 @@ async def process_rag_documents(documents: List[UploadFile] = File(...)):
                 os.remove(fpath)
 
 @app.get("/api/rag-documents")
-async def get_rag_documents():
+async def get_rag_documents(request: Request, response: Response):
     """
     Fetches a list of documents currently indexed in the RAG system (from DB metadata).
+    Supports conditional GET (ETag / If-None-Match).
     """
+    not_modified = await conditional_get(request, response, ["indexed_rag_documents"])
+    if not_modified:
+        return not_modified
     print("--- Fetching indexed RAG documents from the database ---")
     try:
         query = select(indexed_rag_documents.c.id, indexed_rag_documents.c.filename,
@@ -928,93 +1049,128 @@ async def delete_rag_document(filename: str):
 
 # --- NEW DASHBOARD API ENDPOINTS ---
 
-@app.get("/api/dashboard/overview", response_model=OverviewCounts)
-async def get_dashboard_overview():
+# All dashboard endpoints support conditional GET (ETag / If-None-Match), see conditional_get.py.
+@app.get("/api/dashboard", response_model=DashboardData)
+async def get_dashboard_data(request: Request, response: Response):
     """
-    Fetches overview counts for the dashboard.
+    Everything the dashboard page shows in one response: the overview counts
+    (one aggregate query) and the three lists, fetched concurrently. Cached
+    for DASHBOARD_CACHE_TTL_SECONDS.
     """
-    # Assuming 'Active Contracts' means contracts with status 'Active'
-    active_contracts_count_query = select(func.count()).select_from(contracts).where(contracts.c.status == "Active")
-    
-    # Assuming 'Upcoming Deadlines' are tasks due in the future and not completed
-    upcoming_deadlines_count_query = select(func.count()).select_from(tasks).where(
-        (tasks.c.due_date >= datetime.utcnow()) & (tasks.c.status.in_(["Pending", "In Progress"]))
+    not_modified = await conditional_get(request, response, DASHBOARD_TABLES, clock_seconds=DASHBOARD_CLOCK_SECONDS)
+    if not_modified:
+        return not_modified
+    # Never serve a cached payload under a newer ETag: the browser would keep it.
+    return await get_dashboard(
+        version=response.headers["etag"], events_cursor=event_hub.cursor if event_hub.running else None,
     )
-    
-    # Assuming 'New Notifications' are unread notifications
-    new_notifications_count_query = select(func.count()).select_from(notifications).where(notifications.c.is_read == False)
 
-    active_contracts = await database.fetch_val(active_contracts_count_query) or 0
-    upcoming_deadlines = await database.fetch_val(upcoming_deadlines_count_query) or 0
-    new_notifications = await database.fetch_val(new_notifications_count_query) or 0
-
-    return OverviewCounts(
-        active_contracts=active_contracts,
-        upcoming_deadlines=upcoming_deadlines,
-        new_notifications=new_notifications
-    )
+@app.get("/api/dashboard/overview", response_model=OverviewCounts)
+async def get_dashboard_overview(request: Request, response: Response):
+    """
+    Fetches overview counts for the dashboard.
+    """
+    not_modified = await conditional_get(request, response, OVERVIEW_TABLES, clock_seconds=DASHBOARD_CLOCK_SECONDS)
+    if not_modified:
+        return not_modified
+    return OverviewCounts(**await fetch_overview_counts())
 
 @app.get("/api/dashboard/recent-activity", response_model=List[RecentActivity])
-async def get_recent_activity():
+async def get_recent_activity(request: Request, response: Response):
     """
     Fetches a list of recent activities for the dashboard.
     """
-    query = select(activities).order_by(activities.c.performed_at.desc()).limit(5) # Top 5 recent activities
-    activity_records = await database.fetch_all(query)
-    return [RecentActivity(**dict(record)) for record in activity_records]
+    not_modified = await conditional_get(request, response, RECENT_ACTIVITY_TABLES)
+    if not_modified:
+        return not_modified
+    return [RecentActivity(**record) for record in await fetch_recent_activity()]
 
 @app.get("/api/dashboard/upcoming-deadlines", response_model=List[UpcomingDeadline])
-async def get_upcoming_deadlines():
+async def get_upcoming_deadlines(request: Request, response: Response):
     """
     Fetches a list of upcoming deadlines for the dashboard.
     """
-    query = select(tasks).where(
-        (tasks.c.due_date >= datetime.utcnow()) & (tasks.c.status.in_(["Pending", "In Progress"]))
-    ).order_by(tasks.c.due_date.asc()).limit(5) # Top 5 upcoming
-    deadline_records = await database.fetch_all(query)
-    return [UpcomingDeadline(**dict(record)) for record in deadline_records]
+    not_modified = await conditional_get(request, response, UPCOMING_DEADLINES_TABLES, clock_seconds=DASHBOARD_CLOCK_SECONDS)
+    if not_modified:
+        return not_modified
+    return [UpcomingDeadline(**record) for record in await fetch_upcoming_deadlines()]
 
 @app.get("/api/dashboard/notifications", response_model=List[Notification])
-async def get_notifications():
+async def get_notifications(request: Request, response: Response):
     """
     Fetches a list of unread notifications for the dashboard.
     """
-    query = select(notifications).where(notifications.c.is_read == False).order_by(notifications.c.created_at.desc()).limit(5) # Top 5 unread
-    notification_records = await database.fetch_all(query)
-    return [Notification(**dict(record)) for record in notification_records]
+    not_modified = await conditional_get(request, response, NOTIFICATIONS_TABLES)
+    if not_modified:
+        return not_modified
+    return [Notification(**record) for record in await fetch_unread_notifications()]
+
+
+# --- BULK IMPORT ---
+@app.post("/api/import/{entity}", response_model=ImportReport)
+async def bulk_import(entity: str, file: UploadFile = File(...), format: Optional[str] = None):
+    """
+    Bulk-loads clients, cases or contracts from an uploaded CSV (header row)
+    or NDJSON file. Rows are validated and loaded in batches with COPY;
+    invalid or already existing rows are reported by line number and skipped.
+    Import clients first: cases and contracts link to them by phone or email.
+    For very large files prefer `python -m backend.app.manage import`.
+    """
+    if entity not in IMPORT_ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown import entity '{entity}', expected one of {', '.join(IMPORT_ENTITIES)}")
+    try:
+        fmt = detect_format(file.filename, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # The upload is already spooled to a temporary file; read it line by line.
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await import_rows(entity, lines, fmt)
+    finally:
+        lines.detach()
+    print(f"--- Imported {report['inserted']}/{report['rows_read']} {entity} "
+          f"({report['rows_per_second']} rows/s, {report['failed']} failed, {report['duplicates']} duplicates) ---")
+    return report
+
+
+# --- PUSH UPDATES (server-sent events) ---
+@app.get("/api/events/stream")
+async def stream_events(request: Request, last_event_id: Optional[str] = None, kinds: Optional[str] = None):
+    """
+    Live feed of new notifications, new activities and case changes as
+    server-sent events. Browsers resume with the Last-Event-ID header after a
+    reconnect (or pass ?last_event_id=, e.g. the events_cursor of
+    /api/dashboard, to start where a page load left off); `kinds` is a comma-separated filter
+    (notification, activity, case_created, case_updated, cases_imported:
+    one per bulk import batch, with its "count").
+    """
+    header_id = request.headers.get("last-event-id")
+    resume_from = header_id if parse_cursor(header_id) else (last_event_id if parse_cursor(last_event_id) else None)
+    kind_filter = {k.strip() for k in kinds.split(",") if k.strip()} if kinds else None
+    stream = await sse_event_stream(request, resume_from, kind_filter)
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # --- NEW CLIENTS API ENDPOINT ---
 @app.get("/api/clients", response_model=List[Client])
-async def get_all_clients():
+async def get_all_clients(request: Request, response: Response):
     """
     Fetches all client records from the database, including their case count.
+    Supports conditional GET (ETag / If-None-Match).
     """
+    # num_cases changes update clients too (trigger), so its version covers them.
+    not_modified = await conditional_get(request, response, ["clients"])
+    if not_modified:
+        return not_modified
     print("--- Fetching all clients from the database ---")
     try:
-        # Subquery to count cases per client (linked by phone_number for now,
-        # ideally by a client_id foreign key in the cases table)
-        case_counts_subquery = (
-            select(
-                cases.c.caller_phone_number,
-                func.count().label("num_cases")
-            )
-            .group_by(cases.c.caller_phone_number)
-            .alias("case_counts")
-        )
-
-        # Main query to select clients and join with case counts
-        query = (
-            select(
-                clients, # Select all columns from clients table
-                case_counts_subquery.c.num_cases # Select num_cases from subquery
-            )
-            .outerjoin(
-                case_counts_subquery,
-                clients.c.phone_number == case_counts_subquery.c.caller_phone_number
-            )
-            .order_by(clients.c.name.asc())
-        )
+        # num_cases is kept up to date by a trigger on cases (migration 0006),
+        # so this reads the clients table only.
+        query = select(clients).order_by(clients.c.name.asc())
 
         client_records = await database.fetch_all(query)
         
@@ -1022,11 +1178,6 @@ async def get_all_clients():
         result_clients = []
         for record in client_records:
             client_dict = dict(record)
-            # Ensure 'num_cases' is an integer, default to 0 if NULL (no cases)
-            client_dict['num_cases'] = client_dict['num_cases'] if client_dict['num_cases'] is not None else 0
-            
-            # Remove any extra fields from the raw record that are not in the Client schema
-            # This is important if you select 'clients' and the join adds more.
             # Convert datetime objects to ISO format if Pydantic doesn't handle it implicitly
             client_dict['last_activity_at'] = client_dict['last_activity_at'].isoformat() if isinstance(client_dict['last_activity_at'], datetime) else client_dict['last_activity_at']
             client_dict['created_at'] = client_dict['created_at'].isoformat() if isinstance(client_dict['created_at'], datetime) else client_dict['created_at']
@@ -0,0 +1,109 @@
+# backend/app/manage.py
+#
+# Database maintenance commands:
+#
+#     python -m backend.app.manage migrate [--target 0003]
+#     python -m backend.app.manage status
+#     python -m backend.app.manage check-plans
+#     python -m backend.app.manage backfill-case-fields [--all]
+#     python -m backend.app.manage import clients|cases|contracts FILE [--format csv|ndjson] [--errors-out FILE]
+
+from dotenv import load_dotenv
+load_dotenv()
+import argparse
+import asyncio
+import json
+import sys
+
+from .core.bulk_import import IMPORT_ENTITIES, detect_format, import_rows
+from .core.case_fields import backfill_case_fields
+from .core.database import database
+from .core.migrations import applied_versions, discover_migrations, migrate
+from .core.query_plans import check_query_plans
+
+
+async def cmd_migrate(args) -> int:
+    applied = await migrate(target=args.target)
+    print(f"Applied: {', '.join(applied) if applied else 'nothing (up to date)'}")
+    return 0
+
+
+async def cmd_status(args) -> int:
+    applied = await applied_versions()
+    for migration in discover_migrations():
+        state = "applied" if migration.version in applied else "pending"
+        print(f"{migration.version}_{migration.name}: {state}")
+    return 0
+
+
+async def cmd_check_plans(args) -> int:
+    results = await check_query_plans()
+    for result in results:
+        mark = "OK  " if result["ok"] else "FAIL"
+        print(f"{mark} {result['name']}: expected {result['expected_index']}, used {result['indexes_used'] or 'no index'}")
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+async def cmd_backfill_case_fields(args) -> int:
+    updated = await backfill_case_fields(only_missing=not args.all)
+    print(f"Updated list columns of {updated} case(s)")
+    return 0
+
+
+async def cmd_import(args) -> int:
+    if args.entity not in IMPORT_ENTITIES or not args.path:
+        print(f"usage: import {{{','.join(IMPORT_ENTITIES)}}} FILE", file=sys.stderr)
+        return 2
+    fmt = detect_format(args.path, args.format)
+
+    def progress(report):
+        print(f"  {report['rows_read']} rows read, {report['inserted']} inserted, "
+              f"{report['failed'] + report['duplicates']} skipped ({report['rows_per_second']} rows/s)")
+
+    with open(args.path, encoding="utf-8-sig", newline="") as lines:
+        report = await import_rows(args.entity, lines, fmt, on_progress=progress)
+
+    print(f"Imported {report['inserted']} of {report['rows_read']} {args.entity} in {report['elapsed_seconds']}s "
+          f"({report['rows_per_second']} rows/s): {report['failed']} failed, {report['duplicates']} duplicates")
+    if args.errors_out:
+        with open(args.errors_out, "w", encoding="utf-8") as out:
+            for error in report["errors"]:
+                out.write(json.dumps(error) + "\n")
+        print(f"Row errors written to {args.errors_out}")
+    else:
+        for error in report["errors"]:
+            print(f"  line {error['line']}: {error['error']}", file=sys.stderr)
+    if report["errors_truncated"]:
+        print("  (more errors not shown, see BULK_IMPORT_MAX_REPORTED_ERRORS)", file=sys.stderr)
+    return 0 if report["failed"] == 0 else 1
+
+
+COMMANDS = {
+    "migrate": cmd_migrate,
+    "status": cmd_status,
+    "check-plans": cmd_check_plans,
+    "backfill-case-fields": cmd_backfill_case_fields,
+    "import": cmd_import,
+}
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.manage")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("entity", nargs="?", help="import: clients, cases or contracts")
+    parser.add_argument("path", nargs="?", help="import: CSV or NDJSON file")
+    parser.add_argument("--target", help="migrate: stop after this version (e.g. 0003)")
+    parser.add_argument("--all", action="store_true", help="backfill-case-fields: recompute every case, not only missing ones")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="import: file format (default: from the extension)")
+    parser.add_argument("--errors-out", help="import: write per-row errors to this file as NDJSON")
+    args = parser.parse_args(argv)
+
+    await database.connect()
+    try:
+        return await COMMANDS[args.command](args)
+    finally:
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,125 @@
+# backend/app/migrations/0001_baseline.py
+#
+# The schema as previously created by metadata.create_all(). IF NOT EXISTS
+# lets this run as a no-op against databases created before migrations.
+
+UPGRADE = [
+    """
+    CREATE TABLE IF NOT EXISTS cases (
+        id SERIAL PRIMARY KEY,
+        case_id VARCHAR(50) NOT NULL UNIQUE,
+        caller_phone_number VARCHAR(50),
+        status VARCHAR(50),
+        structured_intake JSON,
+        call_summary TEXT,
+        full_transcript TEXT,
+        follow_up_notes JSONB,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        vapi_call_id VARCHAR(100),
+        assigned_to VARCHAR(255),
+        last_updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS case_notes (
+        id SERIAL PRIMARY KEY,
+        case_id INTEGER NOT NULL REFERENCES cases (id) ON DELETE CASCADE,
+        vapi_call_id VARCHAR(100),
+        summary TEXT,
+        transcript TEXT,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_case_notes_case_id_created_at ON case_notes (case_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_case_notes_created_at ON case_notes (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_case_notes_vapi_call_id ON case_notes (vapi_call_id)",
+    """
+    CREATE TABLE IF NOT EXISTS indexed_rag_documents (
+        id SERIAL PRIMARY KEY,
+        filename VARCHAR(255) NOT NULL,
+        num_chunks INTEGER,
+        indexed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        source_path VARCHAR(512)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS clients (
+        id SERIAL PRIMARY KEY,
+        client_id VARCHAR(50) NOT NULL UNIQUE,
+        name VARCHAR(255) NOT NULL,
+        contact_email VARCHAR(255) NOT NULL UNIQUE,
+        phone_number VARCHAR(50) UNIQUE,
+        status VARCHAR(50),
+        last_activity_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        notes TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS contracts (
+        id SERIAL PRIMARY KEY,
+        contract_id VARCHAR(50) NOT NULL UNIQUE,
+        client_id INTEGER REFERENCES clients (id),
+        name VARCHAR(255) NOT NULL,
+        status VARCHAR(50),
+        signed_date TIMESTAMP WITHOUT TIME ZONE,
+        expiration_date TIMESTAMP WITHOUT TIME ZONE,
+        last_reviewed_at TIMESTAMP WITHOUT TIME ZONE,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS activities (
+        id SERIAL PRIMARY KEY,
+        description VARCHAR(512) NOT NULL,
+        activity_type VARCHAR(50) NOT NULL,
+        related_id INTEGER,
+        related_type VARCHAR(50),
+        performed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id SERIAL PRIMARY KEY,
+        task_id VARCHAR(50) NOT NULL UNIQUE,
+        title VARCHAR(255) NOT NULL,
+        description TEXT,
+        due_date TIMESTAMP WITHOUT TIME ZONE,
+        status VARCHAR(50),
+        task_type VARCHAR(50) NOT NULL,
+        assigned_to VARCHAR(255),
+        related_case_id INTEGER REFERENCES cases (id),
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        completed_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS notifications (
+        id SERIAL PRIMARY KEY,
+        message VARCHAR(512) NOT NULL,
+        notification_type VARCHAR(50) NOT NULL,
+        is_read BOOLEAN NOT NULL,
+        related_url VARCHAR(512),
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id SERIAL PRIMARY KEY,
+        job_type VARCHAR(50) NOT NULL,
+        dedupe_key VARCHAR(255),
+        payload JSONB NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        attempts INTEGER NOT NULL,
+        max_attempts INTEGER NOT NULL,
+        available_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        locked_until TIMESTAMP WITHOUT TIME ZONE,
+        locked_by VARCHAR(100),
+        last_error TEXT,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+        finished_at TIMESTAMP WITHOUT TIME ZONE,
+        CONSTRAINT uq_jobs_job_type_dedupe_key UNIQUE (job_type, dedupe_key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_status_available_at ON jobs (status, available_at)",
+]
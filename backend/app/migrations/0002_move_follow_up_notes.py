@@ -0,0 +1,44 @@
+# backend/app/migrations/0002_move_follow_up_notes.py
+#
+# Moves notes still stored in the legacy cases.follow_up_notes array into
+# case_notes (one row per call). Older rows may hold the array double-encoded
+# as a JSON string. Rows whose notes are not an array once decoded are left
+# untouched for manual review, and listed when the migration runs.
+
+UPGRADE = [
+    """
+        WITH legacy AS (
+            SELECT id,
+                   CASE WHEN jsonb_typeof(follow_up_notes) = 'string'
+                        THEN CAST(follow_up_notes #>> '{}' AS jsonb)
+                        ELSE follow_up_notes END AS notes,
+                   last_updated_at
+            FROM cases
+            WHERE follow_up_notes IS NOT NULL AND follow_up_notes NOT IN ('[]', '"[]"', 'null')
+        ),
+        moved AS (
+            INSERT INTO case_notes (case_id, vapi_call_id, summary, transcript, created_at)
+            SELECT legacy.id, note->>'vapi_call_id', note->>'summary', note->>'transcript',
+                   COALESCE(CAST(note->>'timestamp' AS timestamp), legacy.last_updated_at)
+            FROM legacy, jsonb_array_elements(legacy.notes) WITH ORDINALITY AS n(note, position)
+            WHERE jsonb_typeof(legacy.notes) = 'array'
+            ORDER BY legacy.id, n.position
+            RETURNING case_id
+        )
+        UPDATE cases SET follow_up_notes = '[]'
+        WHERE id IN (SELECT id FROM legacy WHERE jsonb_typeof(notes) = 'array')
+    """,
+]
+
+
+async def upgrade(db):
+    rows = await db.fetch_all(
+        """
+        SELECT case_id FROM cases
+        WHERE follow_up_notes IS NOT NULL AND follow_up_notes NOT IN ('[]', '"[]"', 'null')
+        ORDER BY id
+        """
+    )
+    if rows:
+        print(f"⚠️ {len(rows)} case(s) have follow_up_notes that are not a list and were left in place "
+              f"for manual review: {', '.join(row['case_id'] for row in rows)}")
@@ -0,0 +1,62 @@
+# backend/app/migrations/0003_hot_path_indexes.py
+#
+# Indexes for the queries we run on every webhook and dashboard load.
+# core/query_plans.py checks that the planner actually uses them.
+# Making vapi_call_id unique clears it on all but the first case of each call;
+# the cleared ids are kept in migration_0003_cleared_vapi_call_ids (a record
+# for manual review, not used by the application) and listed when it runs.
+
+UPGRADE = [
+    # Caller context, existing-case lookup (newest first) and the clients join.
+    "CREATE INDEX IF NOT EXISTS ix_cases_caller_phone_number_created_at ON cases (caller_phone_number, created_at)",
+
+    # Duplicate-webhook check. Keep the first case per call id before making it unique.
+    """
+    CREATE TABLE IF NOT EXISTS migration_0003_cleared_vapi_call_ids (
+        case_row_id INTEGER PRIMARY KEY,
+        case_id VARCHAR(50) NOT NULL,
+        vapi_call_id VARCHAR(100) NOT NULL,
+        kept_case_row_id INTEGER NOT NULL,
+        cleared_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+    )
+    """,
+    """
+    INSERT INTO migration_0003_cleared_vapi_call_ids (case_row_id, case_id, vapi_call_id, kept_case_row_id)
+    SELECT id, case_id, vapi_call_id, first_id FROM (
+        SELECT id, case_id, vapi_call_id,
+               row_number() OVER (PARTITION BY vapi_call_id ORDER BY id) AS position,
+               min(id) OVER (PARTITION BY vapi_call_id) AS first_id
+        FROM cases
+        WHERE vapi_call_id IS NOT NULL
+    ) ranked
+    WHERE position > 1
+    ON CONFLICT (case_row_id) DO NOTHING
+    """,
+    """
+    UPDATE cases SET vapi_call_id = NULL
+    WHERE id IN (SELECT case_row_id FROM migration_0003_cleared_vapi_call_ids)
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_cases_vapi_call_id ON cases (vapi_call_id)",
+
+    # Upcoming deadlines: status IN (...) AND due_date >= now() ORDER BY due_date.
+    "CREATE INDEX IF NOT EXISTS ix_tasks_status_due_date ON tasks (status, due_date)",
+
+    # Unread notifications, newest first.
+    "CREATE INDEX IF NOT EXISTS ix_notifications_is_read_created_at ON notifications (is_read, created_at)",
+
+    # Recent activity feed.
+    "CREATE INDEX IF NOT EXISTS ix_activities_performed_at ON activities (performed_at)",
+
+    # Active contracts count.
+    "CREATE INDEX IF NOT EXISTS ix_contracts_status ON contracts (status)",
+]
+
+
+async def upgrade(db):
+    rows = await db.fetch_all(
+        "SELECT case_id, vapi_call_id FROM migration_0003_cleared_vapi_call_ids ORDER BY case_row_id"
+    )
+    if rows:
+        print(f"⚠️ Cleared the duplicate vapi_call_id of {len(rows)} case(s), kept on the first case of each call "
+              f"(see migration_0003_cleared_vapi_call_ids): "
+              + ", ".join(f"{row['case_id']} ({row['vapi_call_id']})" for row in rows))
@@ -0,0 +1,7 @@
+# backend/app/migrations/0004_cases_keyset_index.py
+#
+# /api/cases pages through cases ordered by (last_updated_at, id), newest first.
+
+UPGRADE = [
+    "CREATE INDEX IF NOT EXISTS ix_cases_last_updated_at_id ON cases (last_updated_at DESC, id DESC)",
+]
@@ -0,0 +1,71 @@
+# backend/app/migrations/0005_case_list_columns.py
+#
+# Case list columns computed when a case is written (see core/case_fields.py),
+# so listing cases is a plain indexed scan. Existing rows are filled in here;
+# `python -m backend.app.manage backfill-case-fields` recomputes them later.
+# The derivation below is a frozen copy of compute_case_fields() as of this
+# migration, in raw SQL against the schema as it is here, so later changes
+# to the application code or Table objects cannot change what it does.
+
+import json
+
+UPGRADE = [
+    "ALTER TABLE cases ADD COLUMN IF NOT EXISTS case_name VARCHAR(100)",
+    "ALTER TABLE cases ADD COLUMN IF NOT EXISTS client_name VARCHAR(255)",
+    "ALTER TABLE cases ADD COLUMN IF NOT EXISTS case_type VARCHAR(100)",
+    "CREATE INDEX IF NOT EXISTS ix_cases_case_type_last_updated_at_id ON cases (case_type, last_updated_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_cases_status_last_updated_at_id ON cases (status, last_updated_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_cases_client_name ON cases (client_name)",
+]
+
+_BATCH_SIZE = 500
+
+
+def _parse_intake(value):
+    # Up to two decodes: older rows hold a JSON-encoded string inside the JSON column.
+    for _ in range(2):
+        if not isinstance(value, str):
+            break
+        try:
+            value = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _case_fields(structured_intake, client_record_name):
+    intake = _parse_intake(structured_intake)
+    case_name = str(intake.get("summary_of_facts") or "N/A")
+    if len(case_name) > 50:
+        case_name = case_name[:50] + "..."
+    return {
+        "case_name": case_name,
+        "client_name": str(client_record_name or intake.get("client_name") or "Unknown Client")[:255],
+        "case_type": str(intake.get("case_type") or "N/A")[:100],
+    }
+
+
+async def upgrade(db):
+    updated = 0
+    last_id = 0
+    while True:
+        rows = await db.fetch_all(
+            """
+            SELECT c.id, c.structured_intake, cl.name AS client_record_name
+            FROM cases c
+            LEFT JOIN clients cl ON cl.phone_number = c.caller_phone_number
+            WHERE c.id > :last_id AND c.case_type IS NULL
+            ORDER BY c.id
+            LIMIT :limit
+            """,
+            values={"last_id": last_id, "limit": _BATCH_SIZE},
+        )
+        if not rows:
+            break
+        await db.execute_many(
+            "UPDATE cases SET case_name = :case_name, client_name = :client_name, case_type = :case_type WHERE id = :id",
+            [{"id": row["id"], **_case_fields(row["structured_intake"], row["client_record_name"])} for row in rows],
+        )
+        updated += len(rows)
+        last_id = rows[-1]["id"]
+    print(f"--- Computed list columns for {updated} existing case(s) ---")
@@ -0,0 +1,44 @@
+# backend/app/migrations/0006_cases_client_fk.py
+#
+# Links cases to clients by a real foreign key (resolved when the case is
+# created) and keeps clients.num_cases up to date with a trigger, so listing
+# clients no longer aggregates the whole cases table.
+
+UPGRADE = [
+    "ALTER TABLE cases ADD COLUMN IF NOT EXISTS client_id INTEGER REFERENCES clients (id) ON DELETE SET NULL",
+    "CREATE INDEX IF NOT EXISTS ix_cases_client_id ON cases (client_id)",
+    "ALTER TABLE clients ADD COLUMN IF NOT EXISTS num_cases INTEGER NOT NULL DEFAULT 0",
+
+    # Existing cases were only linked by phone number.
+    """
+    UPDATE cases SET client_id = clients.id
+    FROM clients
+    WHERE cases.client_id IS NULL AND clients.phone_number = cases.caller_phone_number
+    """,
+    """
+    UPDATE clients SET num_cases = counts.n
+    FROM (SELECT client_id, count(*) AS n FROM cases WHERE client_id IS NOT NULL GROUP BY client_id) counts
+    WHERE clients.id = counts.client_id
+    """,
+
+    """
+    CREATE OR REPLACE FUNCTION cases_maintain_client_num_cases() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.client_id IS NOT NULL THEN
+            UPDATE clients SET num_cases = num_cases - 1 WHERE id = OLD.client_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.client_id IS NOT NULL THEN
+            UPDATE clients SET num_cases = num_cases + 1 WHERE id = NEW.client_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS cases_client_num_cases ON cases",
+    """
+    CREATE TRIGGER cases_client_num_cases
+    AFTER INSERT OR DELETE OR UPDATE OF client_id ON cases
+    FOR EACH ROW
+    EXECUTE FUNCTION cases_maintain_client_num_cases()
+    """,
+]
@@ -0,0 +1,92 @@
+# backend/app/migrations/0007_app_events.py
+#
+# Change feed for the UI push channel (see core/events.py). Triggers append a
+# row to app_events for every new notification, new activity and case update,
+# and NOTIFY the app_events channel with its id in the same transaction, so
+# listeners hear about a change only once it has committed. The table is what
+# reconnecting clients replay from (SSE Last-Event-ID).
+
+UPGRADE = [
+    """
+    CREATE TABLE IF NOT EXISTS app_events (
+        id BIGSERIAL PRIMARY KEY,
+        kind VARCHAR(50) NOT NULL,
+        payload JSONB NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_app_events_created_at ON app_events (created_at)",
+
+    """
+    CREATE OR REPLACE FUNCTION app_events_publish(event_kind TEXT, event_payload JSONB) RETURNS void AS $$
+    DECLARE
+        event_id BIGINT;
+    BEGIN
+        INSERT INTO app_events (kind, payload) VALUES (event_kind, event_payload) RETURNING id INTO event_id;
+        PERFORM pg_notify('app_events', event_id::text);
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+
+    """
+    CREATE OR REPLACE FUNCTION notifications_publish_event() RETURNS trigger AS $$
+    BEGIN
+        PERFORM app_events_publish('notification', to_jsonb(NEW));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS notifications_app_event ON notifications",
+    """
+    CREATE TRIGGER notifications_app_event
+    AFTER INSERT ON notifications
+    FOR EACH ROW
+    EXECUTE FUNCTION notifications_publish_event()
+    """,
+
+    """
+    CREATE OR REPLACE FUNCTION activities_publish_event() RETURNS trigger AS $$
+    BEGIN
+        PERFORM app_events_publish('activity', to_jsonb(NEW));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS activities_app_event ON activities",
+    """
+    CREATE TRIGGER activities_app_event
+    AFTER INSERT ON activities
+    FOR EACH ROW
+    EXECUTE FUNCTION activities_publish_event()
+    """,
+
+    # Case events carry the list columns only, never transcripts or intake.
+    # Recomputing list columns (backfill) is not a case update.
+    """
+    CREATE OR REPLACE FUNCTION cases_publish_event() RETURNS trigger AS $$
+    BEGIN
+        PERFORM app_events_publish(
+            CASE WHEN TG_OP = 'INSERT' THEN 'case_created' ELSE 'case_updated' END,
+            jsonb_build_object(
+                'id', NEW.id,
+                'case_id', NEW.case_id,
+                'case_name', NEW.case_name,
+                'client_name', NEW.client_name,
+                'type', NEW.case_type,
+                'status', NEW.status,
+                'assigned_to', NEW.assigned_to,
+                'last_updated', NEW.last_updated_at
+            )
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS cases_app_event ON cases",
+    """
+    CREATE TRIGGER cases_app_event
+    AFTER INSERT OR UPDATE OF status, assigned_to, last_updated_at ON cases
+    FOR EACH ROW
+    EXECUTE FUNCTION cases_publish_event()
+    """,
+]
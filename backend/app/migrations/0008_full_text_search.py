@@ -0,0 +1,75 @@
+# backend/app/migrations/0008_full_text_search.py
+#
+# Full-text search over cases and follow-up notes (see core/search.py).
+# search_vector columns are maintained by BEFORE triggers whenever a searched
+# column is written, and indexed with GIN. Weights: names and case type (A),
+# summaries (B), transcripts (C).
+
+# Long transcripts are cut before indexing so to_tsvector stays well inside
+# the 1MB tsvector limit; the text itself is stored in full.
+_TRANSCRIPT_INDEX_CHARS = 200000
+
+UPGRADE = [
+    "ALTER TABLE cases ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "ALTER TABLE case_notes ADD COLUMN IF NOT EXISTS search_vector tsvector",
+
+    f"""
+    CREATE OR REPLACE FUNCTION cases_search_vector_update() RETURNS trigger AS $$
+    DECLARE
+        intake jsonb;
+    BEGIN
+        -- structured_intake may hold an object or a JSON-encoded string of one.
+        BEGIN
+            intake := CAST(NEW.structured_intake #>> '{{}}' AS jsonb);
+            IF jsonb_typeof(intake) <> 'object' THEN
+                intake := NULL;
+            END IF;
+        EXCEPTION WHEN others THEN
+            intake := NULL;
+        END;
+        NEW.search_vector :=
+            setweight(to_tsvector('english', concat_ws(' ',
+                NEW.case_id, NEW.case_name, NEW.client_name, NEW.case_type,
+                intake->>'client_name', intake->>'opposing_party', intake->>'case_type')), 'A') ||
+            setweight(to_tsvector('english', concat_ws(' ',
+                intake->>'summary_of_facts', NEW.call_summary)), 'B') ||
+            setweight(to_tsvector('english', left(coalesce(NEW.full_transcript, ''), {_TRANSCRIPT_INDEX_CHARS})), 'C');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS cases_search_vector ON cases",
+    """
+    CREATE TRIGGER cases_search_vector
+    BEFORE INSERT OR UPDATE OF case_id, case_name, client_name, case_type, structured_intake, call_summary, full_transcript
+    ON cases
+    FOR EACH ROW
+    EXECUTE FUNCTION cases_search_vector_update()
+    """,
+
+    f"""
+    CREATE OR REPLACE FUNCTION case_notes_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.summary, '')), 'B') ||
+            setweight(to_tsvector('english', left(coalesce(NEW.transcript, ''), {_TRANSCRIPT_INDEX_CHARS})), 'C');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS case_notes_search_vector ON case_notes",
+    """
+    CREATE TRIGGER case_notes_search_vector
+    BEFORE INSERT OR UPDATE OF summary, transcript
+    ON case_notes
+    FOR EACH ROW
+    EXECUTE FUNCTION case_notes_search_vector_update()
+    """,
+
+    # Existing rows: a no-op write to a watched column fires the triggers.
+    "UPDATE cases SET call_summary = call_summary WHERE search_vector IS NULL",
+    "UPDATE case_notes SET summary = summary WHERE search_vector IS NULL",
+
+    "CREATE INDEX IF NOT EXISTS ix_cases_search_vector ON cases USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_case_notes_search_vector ON case_notes USING GIN (search_vector)",
+]
@@ -0,0 +1,53 @@
+# backend/app/migrations/0009_table_versions.py
+#
+# Per-table change counters for conditional GETs (see core/conditional_get.py).
+# A statement-level trigger bumps table_versions.version once per writing
+# statement, in the writer's transaction, so a reader sees a new version
+# exactly when the change becomes visible. Statement-level keeps bulk writes
+# (imports, backfills) at one bump per statement instead of one per row.
+# Concurrent writers to one table queue briefly on its version row until
+# they commit; acceptable at this app's write rate (calls, imports, UI edits).
+
+VERSIONED_TABLES = [
+    "cases",
+    "clients",
+    "contracts",
+    "tasks",
+    "activities",
+    "notifications",
+    "indexed_rag_documents",
+]
+
+UPGRADE = [
+    """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name VARCHAR(63) PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 1,
+        changed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+    )
+    """,
+    """
+    CREATE OR REPLACE FUNCTION table_versions_bump() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO table_versions AS tv (table_name) VALUES (TG_TABLE_NAME)
+        ON CONFLICT (table_name) DO UPDATE
+        SET version = tv.version + 1, changed_at = now() AT TIME ZONE 'utc';
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "INSERT INTO table_versions (table_name) SELECT unnest(ARRAY['{}']) ON CONFLICT DO NOTHING".format(
+        "','".join(VERSIONED_TABLES)
+    ),
+]
+
+for _table in VERSIONED_TABLES:
+    UPGRADE += [
+        f"DROP TRIGGER IF EXISTS {_table}_table_version ON {_table}",
+        f"""
+        CREATE TRIGGER {_table}_table_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {_table}
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION table_versions_bump()
+        """,
+    ]
@@ -0,0 +1,114 @@
+# backend/app/migrations/0010_transcript_store.py
+#
+# Moves transcripts out of cases and case_notes into a content-addressed side
+# table (see core/transcripts.py). Rows in cases / case_notes keep a
+# transcript_id; short transcripts no longer sit inline in their heap pages,
+# so scans of the case columns read far fewer pages, and identical
+# transcripts are stored once. Bodies are lz4-compressed (Postgres 14+) as
+# soon as a row exceeds toast_tuple_target.
+#
+# Dropped columns keep their space until the tables are rewritten: run
+# VACUUM FULL cases, case_notes in a maintenance window to reclaim it.
+
+# As in 0008.
+_TRANSCRIPT_INDEX_CHARS = 200000
+
+UPGRADE = [
+    """
+    CREATE TABLE IF NOT EXISTS transcripts (
+        id BIGSERIAL PRIMARY KEY,
+        sha256 BYTEA NOT NULL,
+        body TEXT COMPRESSION lz4 NOT NULL,
+        raw_bytes INTEGER NOT NULL,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+    ) WITH (toast_tuple_target = 128)
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_transcripts_sha256 ON transcripts (sha256)",
+
+    "ALTER TABLE cases ADD COLUMN IF NOT EXISTS transcript_id BIGINT REFERENCES transcripts (id)",
+    "ALTER TABLE case_notes ADD COLUMN IF NOT EXISTS transcript_id BIGINT REFERENCES transcripts (id)",
+    # For the foreign key checks when unreferenced transcripts are pruned.
+    "CREATE INDEX IF NOT EXISTS ix_cases_transcript_id ON cases (transcript_id)",
+    "CREATE INDEX IF NOT EXISTS ix_case_notes_transcript_id ON case_notes (transcript_id)",
+
+    """
+    INSERT INTO transcripts (sha256, body, raw_bytes)
+    SELECT sha256(convert_to(body, 'UTF8')), body, octet_length(body)
+    FROM (
+        SELECT full_transcript AS body FROM cases WHERE full_transcript IS NOT NULL
+        UNION
+        SELECT transcript FROM case_notes WHERE transcript IS NOT NULL
+    ) AS existing
+    ON CONFLICT (sha256) DO NOTHING
+    """,
+    # Neither update touches a column the existing triggers watch.
+    """
+    UPDATE cases SET transcript_id = t.id
+    FROM transcripts t
+    WHERE cases.full_transcript IS NOT NULL AND t.sha256 = sha256(convert_to(cases.full_transcript, 'UTF8'))
+    """,
+    """
+    UPDATE case_notes SET transcript_id = t.id
+    FROM transcripts t
+    WHERE case_notes.transcript IS NOT NULL AND t.sha256 = sha256(convert_to(case_notes.transcript, 'UTF8'))
+    """,
+
+    # Search vectors now read the transcript through transcript_id (0008 read the columns).
+    f"""
+    CREATE OR REPLACE FUNCTION cases_search_vector_update() RETURNS trigger AS $$
+    DECLARE
+        intake jsonb;
+    BEGIN
+        -- structured_intake may hold an object or a JSON-encoded string of one.
+        BEGIN
+            intake := CAST(NEW.structured_intake #>> '{{}}' AS jsonb);
+            IF jsonb_typeof(intake) <> 'object' THEN
+                intake := NULL;
+            END IF;
+        EXCEPTION WHEN others THEN
+            intake := NULL;
+        END;
+        NEW.search_vector :=
+            setweight(to_tsvector('english', concat_ws(' ',
+                NEW.case_id, NEW.case_name, NEW.client_name, NEW.case_type,
+                intake->>'client_name', intake->>'opposing_party', intake->>'case_type')), 'A') ||
+            setweight(to_tsvector('english', concat_ws(' ',
+                intake->>'summary_of_facts', NEW.call_summary)), 'B') ||
+            setweight(to_tsvector('english', left(coalesce(
+                (SELECT body FROM transcripts WHERE id = NEW.transcript_id), ''), {_TRANSCRIPT_INDEX_CHARS})), 'C');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS cases_search_vector ON cases",
+    """
+    CREATE TRIGGER cases_search_vector
+    BEFORE INSERT OR UPDATE OF case_id, case_name, client_name, case_type, structured_intake, call_summary, transcript_id
+    ON cases
+    FOR EACH ROW
+    EXECUTE FUNCTION cases_search_vector_update()
+    """,
+
+    f"""
+    CREATE OR REPLACE FUNCTION case_notes_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.summary, '')), 'B') ||
+            setweight(to_tsvector('english', left(coalesce(
+                (SELECT body FROM transcripts WHERE id = NEW.transcript_id), ''), {_TRANSCRIPT_INDEX_CHARS})), 'C');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS case_notes_search_vector ON case_notes",
+    """
+    CREATE TRIGGER case_notes_search_vector
+    BEFORE INSERT OR UPDATE OF summary, transcript_id
+    ON case_notes
+    FOR EACH ROW
+    EXECUTE FUNCTION case_notes_search_vector_update()
+    """,
+
+    "ALTER TABLE cases DROP COLUMN IF EXISTS full_transcript",
+    "ALTER TABLE case_notes DROP COLUMN IF EXISTS transcript",
+]
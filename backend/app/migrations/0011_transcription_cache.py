@@ -0,0 +1,24 @@
+# backend/app/migrations/0011_transcription_cache.py
+#
+# Results of /transcribe-audio keyed by the SHA-256 of the uploaded bytes and
+# the engine that produced them (see core/transcription_cache.py), so a
+# retried or re-uploaded recording is answered without transcribing it again.
+# One row per mode: a chunked result also carries timed segments. Rows not
+# read for TRANSCRIPTION_CACHE_TTL_DAYS are deleted by the cache itself.
+
+UPGRADE = [
+    """
+    CREATE TABLE IF NOT EXISTS transcription_cache (
+        audio_sha256 BYTEA NOT NULL,
+        engine TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        audio_seconds REAL NOT NULL,
+        result JSONB COMPRESSION lz4 NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+        last_used_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+        PRIMARY KEY (audio_sha256, engine, mode)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_transcription_cache_last_used_at ON transcription_cache (last_used_at)",
+]
@@ -0,0 +1,31 @@
+# backend/app/migrations/0012_case_client_name_refresh.py
+#
+# cases.client_name is copied from the client record when a case is written
+# (see core/case_fields.py). Renaming a client now rewrites it on that
+# client's cases, in the same transaction, so the case list never shows a
+# stale name. Names that already went stale are corrected here.
+
+UPGRADE = [
+    """
+    UPDATE cases SET client_name = clients.name
+    FROM clients
+    WHERE cases.client_id = clients.id AND cases.client_name IS DISTINCT FROM clients.name
+    """,
+    """
+    CREATE OR REPLACE FUNCTION clients_refresh_case_client_name() RETURNS trigger AS $$
+    BEGIN
+        UPDATE cases SET client_name = NEW.name
+        WHERE client_id = NEW.id AND client_name IS DISTINCT FROM NEW.name;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS clients_case_client_name ON clients",
+    """
+    CREATE TRIGGER clients_case_client_name
+    AFTER UPDATE OF name ON clients
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION clients_refresh_case_client_name()
+    """,
+]
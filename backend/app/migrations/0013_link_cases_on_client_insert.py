@@ -0,0 +1,34 @@
+# backend/app/migrations/0013_link_cases_on_client_insert.py
+#
+# cases.client_id is resolved by phone number when a case is created (see
+# core/case_fields.py), so a case created before its client record stayed
+# unlinked. A clients trigger now links a client's unlinked cases when the
+# client is created or its phone number is set, together with the stored
+# client_name (migration 0012 keeps it current afterwards). The
+# cases_client_num_cases trigger (0006) counts the newly linked cases.
+# Cases left unlinked so far are linked here.
+
+UPGRADE = [
+    """
+    UPDATE cases SET client_id = clients.id, client_name = clients.name
+    FROM clients
+    WHERE cases.client_id IS NULL AND clients.phone_number = cases.caller_phone_number
+    """,
+    """
+    CREATE OR REPLACE FUNCTION clients_link_cases() RETURNS trigger AS $$
+    BEGIN
+        UPDATE cases SET client_id = NEW.id, client_name = NEW.name
+        WHERE client_id IS NULL AND caller_phone_number = NEW.phone_number;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS clients_link_cases ON clients",
+    """
+    CREATE TRIGGER clients_link_cases
+    AFTER INSERT OR UPDATE OF phone_number ON clients
+    FOR EACH ROW
+    WHEN (NEW.phone_number IS NOT NULL)
+    EXECUTE FUNCTION clients_link_cases()
+    """,
+]
@@ -0,0 +1,33 @@
+# backend/app/migrations/0014_import_case_events.py
+#
+# Bulk imports (see core/bulk_import.py) load cases in batches of thousands;
+# a case_created event per row would NOTIFY every listener thousands of
+# times. A batch transaction that sets app.suppress_row_events = 'on' skips
+# the per-row case events and publishes one cases_imported event instead.
+# Otherwise cases_publish_event() is unchanged from migration 0007.
+
+UPGRADE = [
+    """
+    CREATE OR REPLACE FUNCTION cases_publish_event() RETURNS trigger AS $$
+    BEGIN
+        IF current_setting('app.suppress_row_events', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        PERFORM app_events_publish(
+            CASE WHEN TG_OP = 'INSERT' THEN 'case_created' ELSE 'case_updated' END,
+            jsonb_build_object(
+                'id', NEW.id,
+                'case_id', NEW.case_id,
+                'case_name', NEW.case_name,
+                'client_name', NEW.client_name,
+                'type', NEW.case_type,
+                'status', NEW.status,
+                'assigned_to', NEW.assigned_to,
+                'last_updated', NEW.last_updated_at
+            )
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
@@ -0,0 +1,32 @@
+# backend/app/migrations/0015_suppress_row_events.py
+#
+# Extends app.suppress_row_events (migration 0014) to the notification and
+# activity event triggers, so bulk loaders (synthetic data seeding) can skip
+# every per-row UI event for one transaction with SET LOCAL, instead of
+# ALTER TABLE ... DISABLE TRIGGER, which locks the tables against readers.
+# Otherwise the functions are unchanged from migration 0007.
+
+UPGRADE = [
+    """
+    CREATE OR REPLACE FUNCTION notifications_publish_event() RETURNS trigger AS $$
+    BEGIN
+        IF current_setting('app.suppress_row_events', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        PERFORM app_events_publish('notification', to_jsonb(NEW));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION activities_publish_event() RETURNS trigger AS $$
+    BEGIN
+        IF current_setting('app.suppress_row_events', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        PERFORM app_events_publish('activity', to_jsonb(NEW));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
@@ -0,0 +1,8 @@
+# backend/app/migrations
+#
+# Versioned schema migrations, applied in filename order by core/migrations.py.
+# Each module is named NNNN_description.py and defines:
+#   UPGRADE: List[str]              -- SQL statements, run in one transaction
+#   async def upgrade(db) (optional) -- for data changes that need Python
+# Applied versions are recorded in the schema_migrations table.
+# Never edit a migration that has shipped; add a new one instead.
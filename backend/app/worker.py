@@ -0,0 +1,41 @@
+# backend/app/worker.py
+#
+# Standalone background job worker, for running end-of-call processing outside
+# the API processes:
+#
+#     RUN_JOB_WORKERS_IN_PROCESS=false uvicorn backend.app.main:app ...
+#     python -m backend.app.worker
+
+from dotenv import load_dotenv
+load_dotenv()
+import asyncio
+import signal
+
+from .core import config
+from .core.database import database
+from .core.db_pool import instrument_pool
+from .core.job_queue import job_workers
+from .core.migrations import migrate
+from .core import post_call_processor # noqa: F401 -- registers the post_call job handler
+
+
+async def main():
+    await database.connect()
+    instrument_pool()
+    print("✅ Worker connected to database")
+    await migrate()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    job_workers.start(config.JOB_WORKER_CONCURRENCY)
+    await stop.wait()
+
+    await job_workers.stop()
+    await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -7,6 +7,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const audioUploadInput = document.getElementById('audio-upload-input');
     const transcribeButton = document.getElementById('transcribe-button');
     const transcriptionStatus = document.getElementById('transcription-status');
+    const transcriptPreview = document.getElementById('transcript-preview');
 
     // --- IMPORTANT: Null check for elements ---
     if (!transcribeButton || !audioUploadInput || !fileUploadZone) {
@@ -117,6 +118,66 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 
+    // Shows the transcript so far below the upload zone.
+    function renderTranscript(text) {
+        if (!transcriptPreview) return;
+        transcriptPreview.textContent = text;
+        transcriptPreview.hidden = !text;
+    }
+
+    // Follows a transcription job's server-sent events until its "done" event.
+    // Resolves with { transcript, intake, errors }; rejects if transcription failed.
+    function followTranscriptionJob(eventsUrl) {
+        return new Promise((resolve, reject) => {
+            const chunks = {};
+            const outcome = { transcript: null, intake: null, errors: [] };
+            const events = new EventSource(eventsUrl);
+
+            events.addEventListener('status', (e) => {
+                const status = JSON.parse(e.data);
+                transcriptionStatus.textContent = status.status === 'extracting'
+                    ? 'Audio transcribed. Processing for case intake...'
+                    : `Transcribing ${Math.round(status.audio_seconds)}s of audio...`;
+            });
+
+            events.addEventListener('partial', (e) => {
+                // Chunks finish out of order, so they are kept by index.
+                const partial = JSON.parse(e.data);
+                chunks[partial.chunk] = partial.text;
+                renderTranscript(Object.keys(chunks).map(Number).sort((a, b) => a - b).map(i => chunks[i]).join(' '));
+            });
+
+            events.addEventListener('transcript', (e) => {
+                outcome.transcript = JSON.parse(e.data);
+                renderTranscript(outcome.transcript.text);
+            });
+
+            events.addEventListener('intake', (e) => {
+                outcome.intake = JSON.parse(e.data);
+            });
+
+            events.addEventListener('job_error', (e) => {
+                outcome.errors.push(JSON.parse(e.data));
+            });
+
+            events.addEventListener('done', (e) => {
+                events.close();
+                if (JSON.parse(e.data).status === 'done') {
+                    resolve(outcome);
+                } else {
+                    reject(new Error(outcome.errors.map(err => err.detail).join('; ') || 'Transcription failed'));
+                }
+            });
+
+            // EventSource reconnects (and resumes) by itself; it only gives up when the job is gone.
+            events.addEventListener('error', () => {
+                if (events.readyState === EventSource.CLOSED) {
+                    reject(new Error('Lost the connection to the transcription job'));
+                }
+            });
+        });
+    }
+
     transcribeButton.addEventListener('click', async () => {
         const file = audioUploadInput.files[0];
         if (!file) {
@@ -129,39 +190,31 @@ document.addEventListener('DOMContentLoaded', () => {
 
         transcribeButton.textContent = 'Transcribing...';
         transcribeButton.disabled = true;
-        transcriptionStatus.textContent = 'Uploading and transcribing audio...';
+        transcriptionStatus.textContent = 'Uploading audio...';
         transcriptionStatus.style.color = 'var(--text-secondary)';
+        renderTranscript('');
 
         try {
-            const response = await fetch('/transcribe-audio', {
+            // The job transcribes in the background and chains into intake extraction;
+            // partial transcripts are shown as they arrive.
+            const response = await fetch('/api/transcriptions?extract_intake=true', {
                 method: 'POST',
                 body: formData,
             });
 
             if (!response.ok) {
                 const errorData = await response.json();
-                throw new Error(errorData.error || `HTTP error! status: ${response.status}`);
+                throw new Error(errorData.detail || errorData.error || `HTTP error! status: ${response.status}`);
             }
 
-            const data = await response.json();
-            const transcribedText = data.text;
-            console.log('Transcribed Text:', transcribedText);
+            const job = await response.json();
+            transcriptionStatus.textContent = 'Transcribing audio...';
+            const { transcript, intake: intakeData, errors } = await followTranscriptionJob(job.events_url);
+            console.log('Transcribed Text:', transcript && transcript.text);
 
-            transcriptionStatus.textContent = 'Audio transcribed. Processing for case intake...';
-            transcriptionStatus.style.color = 'var(--text-secondary)';
-
-            const intakeResponse = await fetch('/case-intake', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ text: transcribedText })
-            });
-
-            if (!intakeResponse.ok) {
-                const errorData = await intakeResponse.json();
-                throw new Error(errorData.error || `HTTP error! status: ${intakeResponse.status}`);
+            if (!intakeData) {
+                throw new Error(errors.map(err => err.detail).join('; ') || 'No speech detected in the audio.');
             }
-
-            const intakeData = await intakeResponse.json();
             console.log('Case Intake Data:', intakeData);
 
             transcriptionStatus.textContent = 'Case processed successfully!';
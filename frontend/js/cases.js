@@ -3,31 +3,61 @@
 document.addEventListener('DOMContentLoaded', async () => {
     feather.replace(); // Ensure icons are rendered
 
+    const PAGE_SIZE = 50;
     let caseList; // To hold the List.js instance
-    let allCasesData = []; // Store the full fetched data for filtering
+    let serverFilters = {}; // Filters applied by the API (status / assignee)
+    let nextCursor = null; // Cursor for the next page, null when all pages are loaded
+    let searchQuery = ''; // Full-text search (/api/search) replaces the listing while set
+
+    // Adds display-only fields to a case returned by the API
+    function formatCase(c) {
+        return {
+            ...c,
+            last_updated_display: new Date(c.last_updated).toLocaleString(), // Format date for display
+            created_at_display: new Date(c.created_at).toLocaleString(), // Format date for display
+        };
+    }
 
-    async function fetchCases() {
+    // Fetches one page of cases (or of search results); neither endpoint returns transcripts
+    async function fetchCasesPage(cursor) {
+        const params = searchQuery
+            ? new URLSearchParams({ q: searchQuery, limit: PAGE_SIZE })
+            : new URLSearchParams({ limit: PAGE_SIZE, ...serverFilters });
+        if (cursor) params.set('cursor', cursor);
         try {
-            const response = await fetch('/api/cases');
+            const response = await fetch(`${searchQuery ? '/api/search' : '/api/cases'}?${params}`);
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
-            const data = await response.json();
-            // Process data for display and List.js
-            return data.map(c => ({
-                ...c, // Spread all properties from the backend Case schema
-                last_updated_display: new Date(c.last_updated).toLocaleString(), // Format date for display
-                created_at_display: new Date(c.created_at).toLocaleString(), // Format date for display
-                // Note: structured_intake and follow_up_notes are already objects/arrays if parsed correctly by FastAPI
-            }));
+            const page = await response.json();
+            nextCursor = page.next_cursor;
+            return page.items.map(formatCase);
         } catch (error) {
             console.error("Error fetching cases:", error);
             document.getElementById('cases-list-body').innerHTML = `<tr><td colspan="6" class="text-secondary" style="text-align: center;">Error loading cases.</td></tr>`;
+            nextCursor = null;
             return [];
+        } finally {
+            updateLoadMoreButton();
         }
     }
 
-    allCasesData = await fetchCases(); // Fetch data once
+    // "Load more" button below the table
+    const loadMoreButton = document.createElement('button');
+    loadMoreButton.className = 'button secondary-button mt-4';
+    loadMoreButton.textContent = 'Load more cases';
+    loadMoreButton.style.display = 'none';
+    document.querySelector('#cases-section .table-wrapper').after(loadMoreButton);
+
+    function updateLoadMoreButton() {
+        loadMoreButton.style.display = nextCursor ? 'inline-flex' : 'none';
+    }
+
+    loadMoreButton.addEventListener('click', async () => {
+        loadMoreButton.disabled = true;
+        caseList.add(await fetchCasesPage(nextCursor));
+        loadMoreButton.disabled = false;
+    });
 
     var options = {
         valueNames: [
@@ -36,7 +66,8 @@ document.addEventListener('DOMContentLoaded', async () => {
             'type',
             { name: 'status', attr: 'data-status' }, // Use data-status for filtering if needed
             'assigned_to',
-            'last_updated_display'
+            'last_updated_display',
+            { data: ['case_id'] } // Identifies the row for the details view
         ],
         item: `<tr>
                     <td class="case_name"></td>
@@ -48,7 +79,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                </tr>`
     };
 
-    caseList = new List('cases-section', options, allCasesData); // Target the cases-section ID
+    caseList = new List('cases-section', options, await fetchCasesPage(null)); // Target the cases-section ID
 
     // Apply status-badge classes after List.js renders
     caseList.on('updated', function (list) {
@@ -65,85 +96,135 @@ document.addEventListener('DOMContentLoaded', async () => {
     // Initial apply for already rendered items
     caseList.update();
 
-    // Search functionality for List.js
-    document.getElementById('search-cases').addEventListener('keyup', function() {
-        caseList.search(this.value);
+    // Search runs on the server (names, intake, summaries, transcripts and notes), ranked by relevance
+    let searchTimer = null;
+    document.getElementById('search-cases').addEventListener('input', function() {
+        clearTimeout(searchTimer);
+        const term = this.value.trim();
+        searchTimer = setTimeout(async () => {
+            if (term === searchQuery || (term.length < 2 && !searchQuery)) return;
+            searchQuery = term.length >= 2 ? term : '';
+            const cases = await fetchCasesPage(null);
+            caseList.clear();
+            caseList.add(cases);
+            caseList.update();
+        }, 300);
     });
 
-    // Handle filter buttons
-    document.getElementById('case-filters').addEventListener('click', function(event) {
+    // Handle filter buttons: filtering happens on the server, then the list restarts from page one
+    document.getElementById('case-filters').addEventListener('click', async function(event) {
         const button = event.target.closest('button');
         if (button && button.dataset.filter) {
             document.querySelectorAll('#case-filters .button').forEach(btn => btn.classList.remove('active-tab'));
             button.classList.add('active-tab');
 
             const filterType = button.dataset.filter;
-            caseList.filter(function(item) {
-                const values = item.values();
-                if (filterType === 'all') {
-                    return true;
-                } else if (filterType === 'my') {
-                    // Assuming 'Alex' is the current user for 'My Cases'
-                    // In a real app, this would come from user session/authentication
-                    return values.assigned_to === 'Alex';
-                } else if (filterType === 'unassigned') {
-                    return !values.assigned_to || values.assigned_to === 'Unassigned';
-                }
-                return false;
-            });
-            caseList.update(); // Re-apply sorting/filtering
+            if (filterType === 'my') {
+                // Assuming 'Alex' is the current user for 'My Cases'
+                // In a real app, this would come from user session/authentication
+                serverFilters = { assigned_to: 'Alex' };
+            } else if (filterType === 'unassigned') {
+                serverFilters = { unassigned: 'true' };
+            } else {
+                serverFilters = {};
+            }
+            const cases = await fetchCasesPage(null);
+            caseList.clear();
+            caseList.add(cases);
+            caseList.update(); // Re-apply sorting/search
         }
     });
 
-    // Case Details Display Logic
-    document.getElementById('cases-list-body').addEventListener('click', (event) => {
+    // Follow-up notes are loaded per case, one page at a time
+    async function loadCaseNotes(caseId, notesList, cursor) {
+        let page;
+        try {
+            const params = new URLSearchParams({ limit: 20 });
+            if (cursor) params.set('cursor', cursor);
+            const response = await fetch(`/api/cases/${encodeURIComponent(caseId)}/notes?${params}`);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            page = await response.json();
+        } catch (error) {
+            console.error("Error fetching case notes:", error);
+            notesList.innerHTML = `<li class="text-secondary">Error loading follow-up notes.</li>`;
+            return;
+        }
+        // Ignore the response if another case was opened in the meantime
+        if (document.getElementById('details-case-id').textContent !== caseId) return;
+
+        if (!cursor) notesList.innerHTML = '';
+        const loadMore = notesList.querySelector('.load-more-notes');
+        if (loadMore) loadMore.remove();
+
+        if (!cursor && page.items.length === 0) {
+            notesList.innerHTML = `<li class="text-secondary">No follow-up notes.</li>`;
+            return;
+        }
+        page.items.forEach(note => {
+            const li = document.createElement('li');
+            li.className = 'py-2 border-b border-border-color'; // Add some styling
+            const strong = document.createElement('strong');
+            strong.textContent = `${new Date(note.created_at).toLocaleString()}:`;
+            li.appendChild(strong);
+            li.appendChild(document.createTextNode(` ${note.summary || ''}`));
+            notesList.appendChild(li);
+        });
+        if (page.next_cursor) {
+            const li = document.createElement('li');
+            li.className = 'py-2 load-more-notes';
+            const button = document.createElement('button');
+            button.className = 'button';
+            button.textContent = 'Load older notes';
+            button.addEventListener('click', () => loadCaseNotes(caseId, notesList, page.next_cursor));
+            li.appendChild(button);
+            notesList.appendChild(li);
+        }
+    }
+
+    // Case Details Display Logic: the full case (summary, intake, transcript) is fetched on click
+    document.getElementById('cases-list-body').addEventListener('click', async (event) => {
         const row = event.target.closest('tr');
-        if (row) {
-            // Find the original data item for the clicked row
-            // We'll use the unique 'case_id' to find the full data object
-            const caseIdInRow = row.querySelector('.case_name').textContent.replace('...', ''); // Assuming first part matches case_id
-            const fullCase = allCasesData.find(c => c.case_id.startsWith(caseIdInRow)); // Use startsWith to match partial name
-
-            if (fullCase) {
-                document.getElementById('details-case-id').textContent = fullCase.case_id;
-                
-                const statusBadge = document.getElementById('details-status');
-                statusBadge.textContent = fullCase.status;
-                // Ensure the class name is consistent with CSS: status-badge-<status-value-lowercase-hyphenated>
-                statusBadge.className = `status-badge status-badge-${fullCase.status.toLowerCase().replace(' ', '-')}`;
-                
-                document.getElementById('details-assigned-to').textContent = fullCase.assigned_to || 'Unassigned';
-                document.getElementById('details-client-name').textContent = fullCase.client_name;
-                document.getElementById('details-phone').textContent = fullCase.caller_phone_number || 'N/A';
-                document.getElementById('details-case-type').textContent = fullCase.type;
-                document.getElementById('details-created').textContent = fullCase.created_at_display;
-                document.getElementById('details-last-updated').textContent = fullCase.last_updated_display;
-                document.getElementById('details-vapi-call-id').textContent = fullCase.vapi_call_id || 'N/A';
-
-                document.getElementById('details-summary').textContent = fullCase.call_summary || 'No summary available.';
-                document.getElementById('details-structured-intake').textContent = JSON.stringify(fullCase.structured_intake, null, 2);
-                document.getElementById('details-full-transcript').textContent = fullCase.full_transcript || 'No full transcript available.';
-
-                const notesList = document.getElementById('details-follow-up-notes');
-                notesList.innerHTML = ''; // Clear previous notes
-                if (fullCase.follow_up_notes && fullCase.follow_up_notes.length > 0) {
-                    fullCase.follow_up_notes.forEach(note => {
-                        const li = document.createElement('li');
-                        li.className = 'py-2 border-b border-border-color'; // Add some styling
-                        const noteTimestamp = new Date(note.timestamp).toLocaleString();
-                        li.innerHTML = `<strong>${noteTimestamp}:</strong> ${note.summary}`;
-                        notesList.appendChild(li);
-                    });
-                } else {
-                    notesList.innerHTML = `<li class="text-secondary">No follow-up notes.</li>`;
-                }
-
-                document.getElementById('case-details-display').style.display = 'block';
-                feather.replace(); // Re-render icons in details section
+        const caseId = row && row.getAttribute('data-case_id');
+        if (!caseId) return;
+
+        let fullCase;
+        try {
+            const response = await fetch(`/api/cases/${encodeURIComponent(caseId)}`);
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
             }
+            fullCase = formatCase(await response.json());
+        } catch (error) {
+            console.error("Error fetching case details:", error);
+            return;
         }
-    });
 
-    // Initial load and display
-    caseList.update();
-});
\ No newline at end of file
+        document.getElementById('details-case-id').textContent = fullCase.case_id;
+
+        const statusBadge = document.getElementById('details-status');
+        statusBadge.textContent = fullCase.status;
+        // Ensure the class name is consistent with CSS: status-badge-<status-value-lowercase-hyphenated>
+        statusBadge.className = `status-badge status-badge-${fullCase.status.toLowerCase().replace(' ', '-')}`;
+
+        document.getElementById('details-assigned-to').textContent = fullCase.assigned_to || 'Unassigned';
+        document.getElementById('details-client-name').textContent = fullCase.client_name;
+        document.getElementById('details-phone').textContent = fullCase.caller_phone_number || 'N/A';
+        document.getElementById('details-case-type').textContent = fullCase.type;
+        document.getElementById('details-created').textContent = fullCase.created_at_display;
+        document.getElementById('details-last-updated').textContent = fullCase.last_updated_display;
+        document.getElementById('details-vapi-call-id').textContent = fullCase.vapi_call_id || 'N/A';
+
+        document.getElementById('details-summary').textContent = fullCase.call_summary || 'No summary available.';
+        document.getElementById('details-structured-intake').textContent = JSON.stringify(fullCase.structured_intake, null, 2);
+        document.getElementById('details-full-transcript').textContent = fullCase.full_transcript || 'No full transcript available.';
+
+        const notesList = document.getElementById('details-follow-up-notes');
+        notesList.innerHTML = `<li class="text-secondary">Loading follow-up notes...</li>`;
+        loadCaseNotes(fullCase.case_id, notesList, null);
+
+        document.getElementById('case-details-display').style.display = 'block';
+        feather.replace(); // Re-render icons in details section
+    });
+});
@@ -3,13 +3,21 @@
 document.addEventListener('DOMContentLoaded', async () => {
     feather.replace(); // Ensure icons are rendered
 
-    // Function to fetch and render overview counts
-    async function renderOverview() {
+    // Everything on the page comes from one request
+    async function fetchDashboard() {
         try {
-            const response = await fetch('/api/dashboard/overview');
-            if (!response.ok) throw new Error('Failed to fetch overview data');
-            const data = await response.json();
+            const response = await fetch('/api/dashboard');
+            if (!response.ok) throw new Error('Failed to fetch dashboard data');
+            return await response.json();
+        } catch (error) {
+            console.error('Error fetching dashboard:', error);
+            return null;
+        }
+    }
 
+    // Function to render overview counts
+    function renderOverview(data) {
+        try {
             document.getElementById('active-contracts-count').textContent = data.active_contracts;
             document.getElementById('upcoming-deadlines-count').textContent = data.upcoming_deadlines;
             document.getElementById('new-notifications-count').textContent = data.new_notifications;
@@ -27,12 +35,10 @@ document.addEventListener('DOMContentLoaded', async () => {
         }
     }
 
-    // Function to fetch and render lists (recent activity, deadlines, notifications)
-    async function renderList(endpoint, containerId, itemTemplateFunc) {
+    // Function to render lists (recent activity, deadlines, notifications)
+    function renderList(data, containerId, itemTemplateFunc) {
         try {
-            const response = await fetch(endpoint);
-            if (!response.ok) throw new Error(`Failed to fetch data from ${endpoint}`);
-            const data = await response.json();
+            if (!data) throw new Error('No data');
 
             const container = document.getElementById(containerId);
             if (container) {
@@ -47,7 +53,7 @@ document.addEventListener('DOMContentLoaded', async () => {
                 });
             }
         } catch (error) {
-            console.error(`Error rendering list from ${endpoint}:`, error);
+            console.error(`Error rendering list ${containerId}:`, error);
             const container = document.getElementById(containerId);
             if (container) {
                 container.innerHTML = `<p class="text-secondary" style="text-align: center; padding: 20px;">Error loading data.</p>`;
@@ -142,11 +148,53 @@ document.addEventListener('DOMContentLoaded', async () => {
     }
 
     // Initial render calls
-    await renderOverview();
-    await renderList('/api/dashboard/recent-activity', 'recent-activity-container', activityItemTemplate);
-    await renderList('/api/dashboard/upcoming-deadlines', 'upcoming-deadlines-container', deadlineItemTemplate);
-    await renderList('/api/dashboard/notifications', 'notifications-container', notificationItemTemplate);
+    const dashboard = await fetchDashboard();
+    if (dashboard) renderOverview(dashboard.overview);
+    renderList(dashboard && dashboard.recent_activity, 'recent-activity-container', activityItemTemplate);
+    renderList(dashboard && dashboard.upcoming_deadlines, 'upcoming-deadlines-container', deadlineItemTemplate);
+    renderList(dashboard && dashboard.notifications, 'notifications-container', notificationItemTemplate);
 
     // Re-render Feather icons after dynamic content is added
     feather.replace();
+
+    // Live updates: new notifications and activities are pushed by the server,
+    // starting from the position the dashboard data was read at (EventSource
+    // reconnects by itself and resumes from the last event id). Events near
+    // that position can repeat items already on the page; those are skipped.
+    if (dashboard && window.EventSource) {
+        const LIST_LIMIT = 5;
+        const from = dashboard.events_cursor ? `&last_event_id=${encodeURIComponent(dashboard.events_cursor)}` : '';
+        const events = new EventSource(`/api/events/stream?kinds=notification,activity${from}`);
+        const shown = (list, item) => (list || []).some((existing) => existing.id === item.id);
+
+        events.addEventListener('notification', (e) => {
+            const notification = JSON.parse(e.data);
+            if (notification.is_read || shown(dashboard.notifications, notification)) return;
+            dashboard.notifications = [notification, ...dashboard.notifications].slice(0, LIST_LIMIT);
+            dashboard.overview.new_notifications += 1;
+            renderOverview(dashboard.overview);
+            renderList(dashboard.notifications, 'notifications-container', notificationItemTemplate);
+            feather.replace();
+        });
+
+        events.addEventListener('activity', (e) => {
+            const activity = JSON.parse(e.data);
+            if (shown(dashboard.recent_activity, activity)) return;
+            dashboard.recent_activity = [activity, ...dashboard.recent_activity].slice(0, LIST_LIMIT);
+            renderList(dashboard.recent_activity, 'recent-activity-container', activityItemTemplate);
+            feather.replace();
+        });
+
+        // Too far behind to catch up event by event: reload everything once.
+        events.addEventListener('reset', async () => {
+            const fresh = await fetchDashboard();
+            if (!fresh) return;
+            Object.assign(dashboard, fresh);
+            renderOverview(dashboard.overview);
+            renderList(dashboard.recent_activity, 'recent-activity-container', activityItemTemplate);
+            renderList(dashboard.upcoming_deadlines, 'upcoming-deadlines-container', deadlineItemTemplate);
+            renderList(dashboard.notifications, 'notifications-container', notificationItemTemplate);
+            feather.replace();
+        });
+    }
 });
\ No newline at end of file
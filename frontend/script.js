@@ -125,11 +125,12 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function fetchCases() {
         try {
-            const response = await fetch('/api/cases');
+            // Most recent page only, and only the columns this table shows
+            const response = await fetch('/api/cases?limit=50&fields=case_id,status,caller_phone_number,created_at');
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
-            const cases = await response.json();
+            const cases = (await response.json()).items;
             console.log('Fetched cases:', cases);
 
             // Format dates for display
@@ -154,8 +155,9 @@ document.addEventListener('DOMContentLoaded', () => {
                 button.onclick = async (event) => {
                     const row = event.target.closest('tr');
                     const caseId = row.querySelector('.case_id').textContent;
-                    // Find the original case data to get the full transcript
-                    const originalCase = cases.find(c => c.case_id === caseId);
+                    // The list doesn't carry transcripts; fetch the full case
+                    const detailResponse = await fetch(`/api/cases/${encodeURIComponent(caseId)}`);
+                    const originalCase = detailResponse.ok ? await detailResponse.json() : null;
 
                     if (originalCase && originalCase.full_transcript) {
                         const transcriptToSummarize = originalCase.full_transcript;